@@ -133,3 +133,55 @@ class PlaywrightElementActions(BaseElementActions):
     def select_by_text(self, text: str):
         """Select option from dropdown by visible text"""
         self.locator.select_option(text)
+
+
+class AsyncPlaywrightElementActions(BaseElementActions):
+    """Playwright async API element actions implementation"""
+
+    def __init__(self, page, locator):
+        self.page = page
+        self.locator = locator
+
+    @log_action("Clicking element")
+    async def click(
+        self, x_offset: int = 0, y_offset: int = 0, hold_seconds: float = 0
+    ):
+        """Click element with offset and hold duration"""
+        kwargs = {}
+        if x_offset or y_offset:
+            kwargs["position"] = {"x": x_offset, "y": y_offset}
+        if hold_seconds:
+            kwargs["delay"] = int(hold_seconds * 1000)
+
+        await self.locator.click(**kwargs)
+
+    @log_action("Right-clicking element")
+    async def right_click(self, x_offset: int = 0, y_offset: int = 0):
+        """Right-click element"""
+        kwargs = {"button": "right"}
+        if x_offset or y_offset:
+            kwargs["position"] = {"x": x_offset, "y": y_offset}
+
+        await self.locator.click(**kwargs)
+
+    @log_action("Sending keys")
+    async def send_keys(self, text: str, clear_first: bool = True):
+        """Type text into element"""
+        if clear_first:
+            await self.locator.clear()
+        await self.locator.fill(text)
+
+    @log_action("Getting text")
+    async def get_text(self) -> str:
+        """Get element text"""
+        return await self.locator.text_content() or ""
+
+    @log_action("Getting attribute")
+    async def get_attribute(self, attr_name: str) -> Optional[str]:
+        """Get element attribute"""
+        return await self.locator.get_attribute(attr_name)
+
+    @log_action("Selecting by text")
+    async def select_by_text(self, text: str):
+        """Select option from dropdown by visible text"""
+        await self.locator.select_option(text)
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+from urllib.parse import urlparse
+from framework.logger import setup_logger
+
+AUTH_STATE_DIR = os.getenv("AUTH_STATE_DIR", ".auth")
+AUTH_STATE_TTL = int(os.getenv("AUTH_STATE_TTL", "3600"))
+
+
+class AuthStateCache:
+    """Logged-in storage state (cookies and localStorage) per credential set
+
+    States are Playwright storage_state JSON files, valid for ttl seconds
+    after they were written. Selenium drivers use the same files through
+    selenium_state()/apply_selenium_state().
+    """
+
+    def __init__(self, directory: str = AUTH_STATE_DIR, ttl: int = AUTH_STATE_TTL):
+        """
+        Args:
+            directory: Where state files are stored
+            ttl: Seconds a stored state is reused before logging in again
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def path_for(self, username: str, base_url: str) -> Path:
+        """Get state file for user on site, named by a hash of both"""
+        digest = hashlib.sha256(f"{base_url}\n{username}".encode()).hexdigest()
+        return self.directory / f"{digest[:16]}.json"
+
+    def get(self, username: str, base_url: str) -> Optional[Path]:
+        """Get state file if it exists and is younger than ttl"""
+        path = self.path_for(username, base_url)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except OSError:
+            return None
+        return path if age < self.ttl else None
+
+    def save(self, username: str, base_url: str, state: dict) -> Path:
+        """Store storage state for user"""
+        path = self.path_for(username, base_url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Parallel workers may log in at the same time, one temp file each
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state))
+        tmp.replace(path)
+        return path
+
+    def load(self, path: Path) -> dict:
+        """Read storage state file"""
+        return json.loads(Path(path).read_text())
+
+    def invalidate(self, username: str, base_url: str):
+        """Forget stored state, e.g. after the server dropped the session"""
+        self.path_for(username, base_url).unlink(missing_ok=True)
+
+    def ensure(
+        self, username: str, base_url: str, login: Callable[[], dict]
+    ) -> Path:
+        """
+        Get valid state file, logging in once if there is none
+
+        Args:
+            username: Credential set the state belongs to
+            base_url: Site the state belongs to
+            login: Performs the UI login and returns the storage state
+
+        Returns:
+            Path to pass as storage_state to new_context()
+        """
+        path = self.get(username, base_url)
+        if path is not None:
+            self._logger.info(f"Reusing stored login for {username}")
+            return path
+        self._logger.info(f"Logging in {username} to store session state")
+        return self.save(username, base_url, login())
+
+
+def selenium_state(driver) -> dict:
+    """Read cookies and localStorage of a Selenium driver as storage state"""
+    cookies = []
+    for cookie in driver.get_cookies():
+        cookies.append(
+            {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie.get("domain", ""),
+                "path": cookie.get("path", "/"),
+                "expires": cookie.get("expiry", -1),
+                "httpOnly": cookie.get("httpOnly", False),
+                "secure": cookie.get("secure", False),
+                "sameSite": cookie.get("sameSite", "Lax"),
+            }
+        )
+    origin = driver.execute_script(
+        "return {origin: location.origin, localStorage: Object.keys(localStorage)"
+        ".map((name) => ({name: name, value: localStorage.getItem(name)}))};"
+    )
+    return {"cookies": cookies, "origins": [origin]}
+
+
+def _domain_matches(host: str, domain: str) -> bool:
+    domain = domain.lstrip(".")
+    return host == domain or host.endswith("." + domain)
+
+
+def selenium_cookies(state: dict, url: str) -> List[dict]:
+    """Convert storage state cookies for url to Selenium add_cookie() dicts"""
+    host = urlparse(url).hostname or ""
+    cookies = []
+    for cookie in state.get("cookies", []):
+        if not _domain_matches(host, cookie.get("domain", host)):
+            continue
+        converted = {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "path": cookie.get("path", "/"),
+            "secure": cookie.get("secure", False),
+            "httpOnly": cookie.get("httpOnly", False),
+        }
+        if cookie.get("domain"):
+            converted["domain"] = cookie["domain"]
+        if cookie.get("expires", -1) > 0:
+            converted["expiry"] = int(cookie["expires"])
+        if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+            converted["sameSite"] = cookie["sameSite"]
+        cookies.append(converted)
+    return cookies
+
+
+def apply_selenium_state(driver, state: dict, url: str):
+    """
+    Inject stored cookies and localStorage into a Selenium driver
+
+    Cookies can only be set for the loaded domain, so url is opened first and
+    reloaded once the state is in place.
+    """
+    driver.get(url)
+    for cookie in selenium_cookies(state, url):
+        driver.add_cookie(cookie)
+
+    parsed = urlparse(url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    for entry in state.get("origins", []):
+        if entry.get("origin") != origin:
+            continue
+        driver.execute_script(
+            "for (const item of arguments[0]) {"
+            " localStorage.setItem(item.name, item.value); }",
+            entry.get("localStorage", []),
+        )
+    driver.get(url)
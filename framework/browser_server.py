@@ -0,0 +1,300 @@
+"""Keep a Playwright browser server running between pytest invocations
+
+    python -m framework.browser_server start --browser chromium
+    python -m framework.browser_server status
+    python -m framework.browser_server stop
+
+While the server is alive, fixtures connect to it over its websocket endpoint
+instead of launching a browser; when it is not, they launch one locally.
+"""
+
+import argparse
+import json
+import os
+import secrets
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+from urllib.parse import urlparse
+from framework.driver_factory import DriverFactory
+from framework.logger import setup_logger
+
+BROWSER_SERVER_STATE = os.getenv("BROWSER_SERVER_STATE", ".browser_server.json")
+BROWSERS = ("chromium", "firefox", "webkit")
+
+logger = setup_logger("browser_server")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _listening(ws_endpoint: str, timeout: float = 0.2) -> bool:
+    """Check that something accepts connections on the endpoint's port"""
+    parsed = urlparse(ws_endpoint)
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port), timeout):
+            return True
+    except OSError:
+        return False
+
+
+def read_state(path: str = BROWSER_SERVER_STATE) -> Optional[dict]:
+    """Get recorded server state, None if there is none"""
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def running_server(
+    browser_type: str = "chromium", path: str = BROWSER_SERVER_STATE
+) -> Optional[dict]:
+    """Get state of a live server for browser_type, else None"""
+    state = read_state(path)
+    if not state or state.get("browser") != browser_type:
+        return None
+    if not _listening(state["ws_endpoint"]):
+        return None
+    return state
+
+
+def running_endpoint(
+    browser_type: str = "chromium", path: str = BROWSER_SERVER_STATE
+) -> Optional[str]:
+    """Get websocket endpoint of a live server for browser_type, else None"""
+    state = running_server(browser_type, path)
+    return state["ws_endpoint"] if state else None
+
+
+def server_launch_options(state: dict) -> dict:
+    """Get options the recorded server was launched with, headless included"""
+    return {"headless": state.get("headless", True), **state.get("launch_options", {})}
+
+
+def start(
+    browser_type: str = "chromium",
+    headless: bool = True,
+    path: str = BROWSER_SERVER_STATE,
+    timeout: float = 30.0,
+    launch_options: Optional[dict] = None,
+) -> dict:
+    """
+    Launch a detached browser server and record it in the state file
+
+    launch_options are extra launch-server config keys (e.g. args, channel).
+
+    Returns:
+        State with pid, browser and ws_endpoint; the running server's state if
+        one for browser_type is already alive
+    """
+    state = read_state(path)
+    if state and running_endpoint(browser_type, path):
+        logger.info(f"Browser server already running: {state['ws_endpoint']}")
+        return state
+    if state:
+        stop(path)
+
+    port = _free_port()
+    ws_path = secrets.token_hex(8)
+    config = Path(tempfile.gettempdir()) / f"browser-server-{port}.json"
+    launch_options = dict(launch_options or {})
+    config.write_text(
+        json.dumps(
+            {**launch_options, "headless": headless, "port": port, "wsPath": ws_path}
+        )
+    )
+    log_path = Path(path).with_suffix(".log")
+    if os.name == "nt":
+        detach = {
+            "creationflags": subprocess.CREATE_NEW_PROCESS_GROUP
+            | subprocess.DETACHED_PROCESS
+        }
+    else:
+        detach = {"start_new_session": True}
+    with open(log_path, "w") as log_file:
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "playwright",
+                "launch-server",
+                "--browser",
+                browser_type,
+                "--config",
+                str(config),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            **detach,
+        )
+
+    state = {
+        "pid": process.pid,
+        "browser": browser_type,
+        "headless": headless,
+        "launch_options": launch_options,
+        "ws_endpoint": f"ws://127.0.0.1:{port}/{ws_path}",
+    }
+    deadline = time.monotonic() + timeout
+    try:
+        while not _listening(state["ws_endpoint"]):
+            if process.poll() is not None or time.monotonic() >= deadline:
+                _kill(process.pid)
+                process.wait()
+                raise RuntimeError(
+                    f"Browser server did not start, see {log_path}:\n"
+                    f"{log_path.read_text()}"
+                )
+            time.sleep(0.1)
+    finally:
+        # Read once at startup, the listening server no longer needs it
+        config.unlink(missing_ok=True)
+
+    Path(path).write_text(json.dumps(state, indent=1))
+    logger.info(f"Browser server {browser_type} listening on {state['ws_endpoint']}")
+    return state
+
+
+def _kill(pid: int, sig: Optional[int] = None):
+    """Terminate the server and the node driver it runs in"""
+    try:
+        if os.name == "nt":
+            subprocess.run(
+                ["taskkill", "/T", "/F", "/PID", str(pid)], capture_output=True
+            )
+        else:
+            os.killpg(pid, sig or signal.SIGTERM)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Failed to stop browser server {pid}: {e}")
+
+
+def _alive(pid: int) -> bool:
+    """Check that pid runs (POSIX), zombies count as exited"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        # Linux: the state field follows the parenthesised command name
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        return stat.rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+
+def _is_server(state: dict) -> bool:
+    """Check the recorded pid is still our launch-server, not a reused pid"""
+    pid = state.get("pid")
+    if not pid:
+        return False
+    if os.name == "nt":
+        return _listening(state["ws_endpoint"])
+    if not _alive(pid):
+        return False
+    try:
+        # Started with start_new_session, so it leads its own process group
+        if os.getpgid(pid) != pid:
+            return False
+    except OSError:
+        return False
+    cmdline = Path(f"/proc/{pid}/cmdline")
+    if not cmdline.exists():
+        return True
+    try:
+        return b"launch-server" in cmdline.read_bytes()
+    except OSError:
+        return False
+
+
+def stop(path: str = BROWSER_SERVER_STATE, timeout: float = 5.0) -> bool:
+    """
+    Stop recorded server and remove the state file
+
+    A server that does not exit within timeout seconds of SIGTERM, e.g. a hung
+    one, is killed. A recorded pid that now belongs to another process is left
+    alone.
+    """
+    state = read_state(path)
+    if not state:
+        return False
+    pid = state.get("pid")
+    if _is_server(state):
+        _kill(pid)
+        if os.name != "nt":
+            deadline = time.monotonic() + timeout
+            while _alive(pid) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            if _alive(pid):
+                logger.warning(f"Browser server {pid} ignored SIGTERM, killing it")
+                _kill(pid, signal.SIGKILL)
+        logger.info(f"Browser server {pid} stopped")
+    else:
+        logger.info(f"Browser server {pid} is not running any more")
+    Path(path).unlink(missing_ok=True)
+    return True
+
+
+def connect_or_launch(
+    browser_type: str = "chromium",
+    headless: bool = True,
+    path: str = BROWSER_SERVER_STATE,
+):
+    """
+    Get (context, browser, playwright) from the running server, else launch
+
+    A server launched with a different headless mode is not used.
+
+    Returns:
+        Same tuple as DriverFactory.create_playwright_local
+    """
+    state = running_server(browser_type, path)
+    if state and state.get("headless", True) != headless:
+        logger.warning(
+            f"Browser server {state['ws_endpoint']} runs with "
+            f"headless={state.get('headless', True)}, launching locally"
+        )
+    elif state:
+        try:
+            return DriverFactory.create_playwright_remote(
+                state["ws_endpoint"], browser_type
+            )
+        except Exception as e:
+            logger.warning(f"Browser server unreachable, launching locally: {e}")
+    return DriverFactory.create_playwright_local(browser_type, headless)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("start", "stop", "status"))
+    parser.add_argument("--browser", choices=BROWSERS, default="chromium")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--state", default=BROWSER_SERVER_STATE)
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        start(args.browser, not args.headed, args.state)
+        return 0
+    if args.command == "stop":
+        return 0 if stop(args.state) else 1
+
+    state = read_state(args.state)
+    if state and _listening(state["ws_endpoint"]):
+        print(f"running {state['browser']} pid {state['pid']} {state['ws_endpoint']}")
+        return 0
+    print("stopped")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
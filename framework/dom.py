@@ -0,0 +1,385 @@
+import json
+from typing import Any, Dict, List
+from framework.locator import Locator, DriverType
+
+# Shared in-page helpers: resolve a [type, value] locator spec to DOM elements
+# and check element state the same way Playwright does.
+HELPERS_JS = """
+    const find = (type, value) => {
+        if (type === "xpath") {
+            const snapshot = document.evaluate(
+                value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            const found = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) {
+                found.push(snapshot.snapshotItem(i));
+            }
+            return found;
+        }
+        if (type === "css") {
+            return Array.from(document.querySelectorAll(value));
+        }
+        if (type === "id") {
+            const found = document.getElementById(value);
+            return found ? [found] : [];
+        }
+        if (type === "text") {
+            const needle = value.replace(/\\s+/g, " ").toLowerCase();
+            const found = [];
+            const walk = (node) => {
+                let childMatched = false;
+                for (const child of node.children) {
+                    childMatched = walk(child) || childMatched;
+                }
+                const text = (node.textContent || "").replace(/\\s+/g, " ");
+                const matched = text.toLowerCase().includes(needle);
+                if (matched && !childMatched) {
+                    found.push(node);
+                }
+                return matched;
+            };
+            if (document.body) {
+                walk(document.body);
+            }
+            return found;
+        }
+        throw new Error("Unsupported locator type: " + type);
+    };
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return (
+            rect.width > 0 &&
+            rect.height > 0 &&
+            getComputedStyle(el).visibility !== "hidden"
+        );
+    };
+    const checkState = (el, state) => {
+        switch (state) {
+            case "present":
+                return !!el;
+            case "visible":
+                return !!el && isVisible(el);
+            case "hidden":
+                return !el || !isVisible(el);
+            case "enabled":
+                return !!el && !el.disabled;
+            case "clickable":
+                return !!el && isVisible(el) && !el.disabled;
+        }
+        throw new Error("Unsupported state: " + state);
+    };
+    const nextFrame = () =>
+        new Promise((resolve) => {
+            requestAnimationFrame(resolve);
+            setTimeout(resolve, 100);
+        });
+"""
+
+PROBE_JS = (
+    "async ([specs, state, timeout]) => {"
+    + HELPERS_JS
+    + """
+    const deadline = performance.now() + timeout;
+    for (;;) {
+        const results = specs.map(
+            ([type, value]) => checkState(find(type, value)[0], state)
+        );
+        if (results.every(Boolean) || performance.now() >= deadline) {
+            return results;
+        }
+        await nextFrame();
+    }
+}"""
+)
+
+COUNT_JS = (
+    "([type, value]) => {"
+    + HELPERS_JS
+    + """
+    return find(type, value).length;
+}"""
+)
+
+PROBE_STATES = ("present", "visible", "hidden", "enabled", "clickable")
+
+
+class ScriptError(Exception):
+    """In-page script failed"""
+
+    pass
+
+
+def locator_spec(locator: Locator) -> List[str]:
+    """Convert locator to the [type, value] spec understood by HELPERS_JS"""
+    return [locator.type.value, locator.value]
+
+
+def run_script(driver, driver_type: DriverType, script: str, arg: Any = None) -> Any:
+    """Call a JS function expression in page with a single argument
+
+    Returns an awaitable for DriverType.PLAYWRIGHT_ASYNC, as do all helpers here.
+    """
+    if driver_type == DriverType.SELENIUM:
+        return driver.execute_script(f"return ({script})(arguments[0]);", arg)
+    return driver.evaluate(script, arg)
+
+
+def run_async_script(
+    driver, driver_type: DriverType, script: str, arg: Any = None
+) -> Any:
+    """Call a JS function expression returning a promise, in one round trip"""
+    if driver_type != DriverType.SELENIUM:
+        return driver.evaluate(script, arg)
+
+    result = driver.execute_async_script(
+        "const done = arguments[arguments.length - 1];"
+        f"Promise.resolve(({script})(arguments[0])).then("
+        "(value) => done({value: value}),"
+        "(error) => done({error: String(error)}));",
+        arg,
+    )
+    if result is None or "error" in result:
+        raise ScriptError((result or {}).get("error", "Script returned nothing"))
+    return result.get("value")
+
+
+def probe(
+    driver,
+    driver_type: DriverType,
+    locators: List[Locator],
+    state: str = "visible",
+    timeout: int = 0,
+) -> List[bool]:
+    """
+    Check state of several locators in a single browser round trip
+
+    Args:
+        driver: Selenium WebDriver or Playwright Page instance
+        driver_type: Type of driver
+        locators: Locators to check, first match of each is used
+        state: One of "present", "visible", "hidden", "enabled", "clickable"
+        timeout: Time in milliseconds to keep checking in page until all match
+
+    Returns:
+        List of results in the same order as locators
+    """
+    if state not in PROBE_STATES:
+        raise ValueError(f"Unsupported probe state: {state}")
+    specs = [locator_spec(locator) for locator in locators]
+    return run_async_script(driver, driver_type, PROBE_JS, [specs, state, timeout])
+
+
+def count(driver, driver_type: DriverType, locator: Locator) -> int:
+    """Count elements matching locator in current DOM, without waiting"""
+    return run_script(driver, driver_type, COUNT_JS, locator_spec(locator))
+
+
+def extract(
+    driver,
+    driver_type: DriverType,
+    locator: Locator,
+    fields: Dict[str, str],
+    timeout: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate JS expressions on every element matching locator in one round trip
+
+    Args:
+        driver: Selenium WebDriver or Playwright Page instance
+        driver_type: Type of driver
+        locator: Locator of the elements
+        fields: Mapping of field name to JS expression over `el`
+        timeout: Time in milliseconds to wait for at least one match
+
+    Returns:
+        List with one dict of field values per element
+    """
+    body = ", ".join(f"{json.dumps(name)}: ({expr})" for name, expr in fields.items())
+    script = (
+        "async ([type, value, timeout]) => {"
+        + HELPERS_JS
+        + """
+    const deadline = performance.now() + timeout;
+    let found = find(type, value);
+    while (!found.length && performance.now() < deadline) {
+        await nextFrame();
+        found = find(type, value);
+    }
+    return found.map((el) => ({"""
+        + body
+        + """}));
+}"""
+    )
+    return run_async_script(
+        driver, driver_type, script, locator_spec(locator) + [timeout]
+    )
+
+
+def element_value(
+    driver, driver_type: DriverType, locator: Locator, expression: str
+) -> Any:
+    """Evaluate JS expression over `el` on first match, None if absent"""
+    script = (
+        "([type, value]) => {"
+        + HELPERS_JS
+        + f"""
+    const el = find(type, value)[0];
+    return el ? ({expression}) : null;
+}}"""
+    )
+    return run_script(driver, driver_type, script, locator_spec(locator))
+
+
+def wait_for_value_change(
+    driver,
+    driver_type: DriverType,
+    locator: Locator,
+    expression: str,
+    previous: Any,
+    timeout: int,
+) -> bool:
+    """Wait in page until JS expression over first match differs from previous"""
+    script = (
+        "async ([type, value, previous, timeout]) => {"
+        + HELPERS_JS
+        + f"""
+    const read = () => {{
+        const el = find(type, value)[0];
+        return el ? ({expression}) : null;
+    }};
+    const deadline = performance.now() + timeout;
+    for (;;) {{
+        if (read() !== previous) {{
+            return true;
+        }}
+        if (performance.now() >= deadline) {{
+            return false;
+        }}
+        await nextFrame();
+    }}
+}}"""
+    )
+    return run_async_script(
+        driver, driver_type, script, locator_spec(locator) + [previous, timeout]
+    )
+
+
+DOM_SETTLED_JS = """([quiet, timeout]) => new Promise((resolve) => {
+    let quietTimer = null;
+    let limitTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quiet);
+    });
+    const finish = (settled) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(limitTimer);
+        resolve(settled);
+    };
+    observer.observe(document, {
+        subtree: true,
+        childList: true,
+        attributes: true,
+        characterData: true,
+    });
+    quietTimer = setTimeout(() => finish(true), quiet);
+    limitTimer = setTimeout(() => finish(false), timeout);
+})"""
+
+
+def wait_for_dom_settled(
+    driver, driver_type: DriverType, quiet_ms: int, timeout: int
+) -> bool:
+    """Wait until the DOM has no mutations for quiet_ms"""
+    return run_async_script(
+        driver, driver_type, DOM_SETTLED_JS, [quiet_ms, timeout]
+    )
+
+
+# One document-wide observer remembers when the DOM last changed; the first
+# call installs it and counts from then, as does a call with reset
+QUIET_FOR_JS = """(reset) => {
+    if (!window.__pomMutations) {
+        const mutations = {last: performance.now()};
+        new MutationObserver(() => {
+            mutations.last = performance.now();
+        }).observe(document, {
+            subtree: true,
+            childList: true,
+            attributes: true,
+            characterData: true,
+        });
+        window.__pomMutations = mutations;
+    } else if (reset) {
+        window.__pomMutations.last = performance.now();
+    }
+    return performance.now() - window.__pomMutations.last;
+}"""
+
+
+def quiet_for(driver, driver_type: DriverType, reset: bool = False) -> float:
+    """Get milliseconds since the last DOM mutation, without waiting
+
+    reset restarts the count, so older quiet time is not credited.
+    """
+    return run_script(driver, driver_type, QUIET_FOR_JS, reset)
+
+
+OBSERVE_JS = (
+    "async ([type, value, state, timeout]) => {"
+    + HELPERS_JS
+    + """
+    const match = () => {
+        const el = find(type, value)[0];
+        return checkState(el, state) ? el : null;
+    };
+    const immediate = match();
+    if (immediate) {
+        return immediate;
+    }
+    return new Promise((resolve) => {
+        let done = false;
+        const finish = (el) => {
+            if (done) {
+                return;
+            }
+            done = true;
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(el);
+        };
+        const check = () => {
+            const el = match();
+            if (el) {
+                finish(el);
+            }
+        };
+        const observer = new MutationObserver(check);
+        observer.observe(document, {
+            subtree: true,
+            childList: true,
+            attributes: true,
+            characterData: true,
+        });
+        // Layout and style changes can flip visibility without a mutation
+        const tick = () => {
+            if (!done) {
+                check();
+                requestAnimationFrame(tick);
+            }
+        };
+        requestAnimationFrame(tick);
+        const timer = setTimeout(() => finish(null), timeout);
+    });
+}"""
+)
+
+
+def observe(
+    driver, driver_type: DriverType, locator: Locator, state: str, timeout: int
+) -> Any:
+    """Return first element matching locator once it reaches state, else None"""
+    return run_async_script(
+        driver, driver_type, OBSERVE_JS, locator_spec(locator) + [state, timeout]
+    )
@@ -1,4 +1,17 @@
-from framework.logger import log_waning
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, List, Optional
+from urllib.parse import urlparse
+from framework.logger import log_waning, setup_logger
+from framework.routing import (
+    RoutingProfile,
+    RoutingStats,
+    apply_routing,
+    apply_selenium_routing,
+    get_profile,
+)
 
 try:
     from selenium import webdriver
@@ -8,14 +21,28 @@ try:
     from playwright.sync_api import sync_playwright
 except ImportError:
     log_waning("Playwright not installed, Playwright browser factory will not work")
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    log_waning("Playwright async API not available, async browser factory won't work")
 
 
 class DriverFactory:
     """Factory for creating driver instances"""
 
     @staticmethod
-    def create_selenium_local(browser: str = "firefox", headless: bool = True):
-        """Create local Selenium driver"""
+    def create_selenium_local(
+        browser: str = "firefox",
+        headless: bool = True,
+        capture_network: bool = False,
+        routing: Optional[str] = None,
+    ):
+        """Create local Selenium driver
+
+        capture_network enables Chrome's performance log, which carries the CDP
+        Network events used to wait for responses (see framework.network).
+        routing names a profile from framework.routing (Chrome only)
+        """
 
         options = {
             "firefox": webdriver.FirefoxOptions,
@@ -24,10 +51,20 @@ class DriverFactory:
 
         if headless:
             options.add_argument("--headless")
+        if capture_network:
+            if browser == "chrome":
+                options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            else:
+                log_waning(f"Network capture is not supported for {browser}")
         if browser == "firefox":
+            if routing:
+                log_waning(f"Routing profiles are not supported for {browser}")
             return webdriver.Firefox(options=options)
         elif browser == "chrome":
-            return webdriver.Chrome(options=options)
+            driver = webdriver.Chrome(options=options)
+            if routing:
+                apply_selenium_routing(driver, get_profile(routing))
+            return driver
 
     @staticmethod
     def create_selenium_remote(
@@ -43,9 +80,12 @@ class DriverFactory:
 
     @staticmethod
     def create_playwright_local(
-        browser_type: str = "chromium", headless: bool = True, timeout: int = 30000
+        browser_type: str = "chromium",
+        headless: bool = True,
+        timeout: int = 30000,
+        routing: Optional[str] = None,
     ):
-        """Create local Playwright browser"""
+        """Create local Playwright browser, routing names a framework.routing profile"""
 
         p = sync_playwright().start()
 
@@ -56,7 +96,31 @@ class DriverFactory:
         }
 
         browser = browser_map[browser_type].launch(headless=headless)
-        return browser.new_context(), browser, p
+        context = browser.new_context()
+        if routing:
+            apply_routing(context, get_profile(routing))
+        return context, browser, p
+
+    @staticmethod
+    async def create_playwright_async_local(
+        browser_type: str = "chromium", headless: bool = True
+    ):
+        """Create local Playwright browser on the async API (PLAYWRIGHT_ASYNC)
+
+        Pages of the returned browser can run concurrently on one event loop,
+        one context per flow: await browser.new_context().
+        """
+
+        p = await async_playwright().start()
+
+        browser_map = {
+            "chromium": p.chromium,
+            "firefox": p.firefox,
+            "webkit": p.webkit,
+        }
+
+        browser = await browser_map[browser_type].launch(headless=headless)
+        return await browser.new_context(), browser, p
 
     @staticmethod
     def create_playwright_remote(
@@ -74,3 +138,507 @@ class DriverFactory:
 
         browser = browser_map[browser_type].connect(ws_endpoint, timeout=timeout)
         return browser.new_context(), browser, p
+
+
+class BrowserPool:
+    """One Playwright instance and N browsers shared by a whole session
+
+    Tests get a fresh BrowserContext from new_context()/context(); browsers are
+    handed out round-robin and relaunched when they disconnect or crash. With
+    ws_endpoint the browsers are connections to a running browser server
+    (see framework.browser_server), launched locally if it cannot be reached.
+    """
+
+    def __init__(
+        self,
+        browser_type: str = "chromium",
+        size: int = 1,
+        headless: bool = True,
+        launch_options: Optional[dict] = None,
+        routing: Optional[RoutingProfile] = None,
+        routing_stats: Optional[RoutingStats] = None,
+        ws_endpoint: Optional[str] = None,
+        server_options: Optional[dict] = None,
+    ):
+        """
+        Args:
+            browser_type: "chromium", "firefox" or "webkit"
+            size: Number of browsers to keep running
+            headless: Launch browsers headless
+            launch_options: Extra keyword arguments for launch()
+            routing: Default routing profile applied to new contexts
+            routing_stats: Collects blocked request counts of all contexts
+            ws_endpoint: Browser server to connect to instead of launching
+            server_options: Options the server was launched with, headless
+                included (see browser_server.server_launch_options)
+        """
+        self.browser_type = browser_type
+        self.size = max(size, 1)
+        self.headless = headless
+        self.launch_options = launch_options or {}
+        self.routing = routing
+        self.routing_stats = routing_stats
+        self.ws_endpoint = ws_endpoint
+        self.server_options = server_options
+        self._playwright = None
+        self._browsers: List = []
+        self._next = 0
+        self.launches = 0
+        self.relaunches = 0
+        self.contexts = 0
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def start(self) -> "BrowserPool":
+        """Start Playwright and launch browsers"""
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        while len(self._browsers) < self.size:
+            self._browsers.append(self._launch())
+        return self
+
+    def _launch(self):
+        browser_map = {
+            "chromium": self._playwright.chromium,
+            "firefox": self._playwright.firefox,
+            "webkit": self._playwright.webkit,
+        }
+        if self.ws_endpoint:
+            try:
+                browser = browser_map[self.browser_type].connect(self.ws_endpoint)
+                self.launches += 1
+                self._check_server_options()
+                return browser
+            except Exception as e:
+                self._logger.warning(
+                    f"Browser server {self.ws_endpoint} unreachable, "
+                    f"launching locally: {e}"
+                )
+                self.ws_endpoint = None
+        browser = browser_map[self.browser_type].launch(
+            headless=self.headless, **self.launch_options
+        )
+        self.launches += 1
+        return browser
+
+    def _check_server_options(self):
+        """Warn when the server's browsers differ from what a local launch gives"""
+        wanted = {"headless": self.headless, **self.launch_options}
+        if self.server_options is None:
+            if self.launch_options:
+                self._logger.warning(
+                    f"launch_options {self.launch_options} are ignored by browser "
+                    f"server {self.ws_endpoint}"
+                )
+            return
+        differing = sorted(
+            key
+            for key in wanted.keys() | self.server_options.keys()
+            if wanted.get(key) != self.server_options.get(key)
+        )
+        if differing:
+            self._logger.warning(
+                f"Browser server {self.ws_endpoint} was launched with "
+                f"{self.server_options}, not {wanted} (differing: {differing})"
+            )
+
+    def _healthy(self, browser) -> bool:
+        """Check that browser process is still connected"""
+        try:
+            return browser.is_connected()
+        except Exception:
+            return False
+
+    def _recycle(self, index: int):
+        """Replace browser at index with a newly launched one"""
+        old = self._browsers[index]
+        try:
+            old.close()
+        except Exception:
+            pass
+        self._logger.warning(f"Relaunching {self.browser_type} browser #{index}")
+        self._browsers[index] = self._launch()
+        self.relaunches += 1
+
+    def acquire_browser(self):
+        """Get next healthy browser, relaunching it if needed"""
+        if self._playwright is None:
+            self.start()
+        index = self._next % self.size
+        self._next += 1
+        if not self._healthy(self._browsers[index]):
+            self._recycle(index)
+        return self._browsers[index]
+
+    def new_context(
+        self,
+        routing: Optional[RoutingProfile] = None,
+        prepare: Optional[Callable] = None,
+        **options,
+    ):
+        """
+        Create a fresh BrowserContext on a pooled browser
+
+        Args:
+            routing: Routing profile overriding the pool default
+            prepare: Called with the context before routing is applied, e.g.
+                HarArchive.apply; routing then sees requests first
+            options: Keyword arguments for browser.new_context()
+
+        Returns:
+            BrowserContext, closed by the caller
+        """
+        index = self._next % self.size
+        browser = self.acquire_browser()
+        try:
+            context = browser.new_context(**options)
+        except Exception as e:
+            # Caller errors (bad options) must not close a browser others use
+            if self._healthy(browser):
+                raise
+            self._logger.warning(f"Browser died creating a context, retrying: {e}")
+            self._recycle(index)
+            context = self._browsers[index].new_context(**options)
+        self.contexts += 1
+        if prepare is not None:
+            prepare(context)
+        routing = routing or self.routing
+        if routing is not None:
+            apply_routing(context, routing, self.routing_stats)
+        return context
+
+    @contextmanager
+    def context(
+        self,
+        routing: Optional[RoutingProfile] = None,
+        prepare: Optional[Callable] = None,
+        **options,
+    ):
+        """Context manager yielding a new context and closing it afterwards"""
+        context = self.new_context(routing, prepare, **options)
+        try:
+            yield context
+        finally:
+            try:
+                context.close()
+            except Exception as e:
+                self._logger.warning(f"Failed to close context: {e}")
+
+    def stats(self) -> dict:
+        """Get launch/relaunch/context counters"""
+        return {
+            "browsers": len(self._browsers),
+            "launches": self.launches,
+            "relaunches": self.relaunches,
+            "contexts": self.contexts,
+        }
+
+    def close(self):
+        """Close all browsers and stop Playwright"""
+        for browser in self._browsers:
+            try:
+                browser.close()
+            except Exception:
+                pass
+        self._browsers = []
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+
+def _origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+class PrewarmedPagePool:
+    """Contexts with a page already navigating to the landing URL
+
+    Sync Playwright objects are bound to the thread that created them, so
+    refilling does not use a worker thread: a spare page is started with an
+    in-page navigation that returns immediately and loads in the browser while
+    the current test runs. acquire() then only waits for that navigation to
+    reach DOMContentLoaded.
+    """
+
+    _NAVIGATE_JS = "url => { setTimeout(() => { location.href = url; }, 0); }"
+
+    def __init__(
+        self,
+        browser_pool: BrowserPool,
+        url: str,
+        size: int = 2,
+        timeout: int = 30000,
+        context_options: Optional[dict] = None,
+    ):
+        """
+        Args:
+            browser_pool: Pool providing the contexts
+            url: Landing page every pooled page is navigated to
+            size: Number of spare pages kept warming
+            timeout: Time in milliseconds to wait for a warm page to load
+            context_options: Keyword arguments for new_context()
+        """
+        self.browser_pool = browser_pool
+        self.url = url
+        self.size = size
+        self.timeout = timeout
+        self.context_options = context_options or {}
+        self._spares: deque = deque()
+        self.warm_hits = 0
+        self.cold_starts = 0
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def _warm(self):
+        """Open context and page and start navigating without waiting"""
+        context = self.browser_pool.new_context(**self.context_options)
+        page = context.new_page()
+        page.evaluate(self._NAVIGATE_JS, self.url)
+        self._spares.append((context, page))
+
+    def fill(self):
+        """Start warming pages until size spares exist"""
+        while len(self._spares) < self.size:
+            try:
+                self._warm()
+            except Exception as e:
+                self._logger.warning(f"Failed to pre-warm page: {e}")
+                return
+
+    def _ready(self, page) -> bool:
+        """Wait for pre-warmed navigation to load a page of url's origin
+
+        Error pages (chrome-error://, about:neterror) do not count as loaded.
+        """
+        origin = _origin(self.url)
+        try:
+            page.wait_for_url(
+                lambda url: _origin(url) == origin,
+                wait_until="domcontentloaded",
+                timeout=self.timeout,
+            )
+            return True
+        except Exception as e:
+            self._logger.warning(f"Pre-warmed page not ready: {e}")
+            return False
+
+    def acquire(self):
+        """
+        Get a context and its page loaded at url
+
+        Returns:
+            Tuple of (context, page); pass the context to release()
+        """
+        # Only the spares warmed before this call, refills are not retried
+        for _ in range(len(self._spares)):
+            context, page = self._spares.popleft()
+            if self._ready(page):
+                self.warm_hits += 1
+                self.fill()
+                return context, page
+            self.release(context)
+
+        self.cold_starts += 1
+        context = self.browser_pool.new_context(**self.context_options)
+        page = context.new_page()
+        page.goto(self.url)
+        self.fill()
+        return context, page
+
+    def release(self, context):
+        """Close context handed out by acquire()"""
+        try:
+            context.close()
+        except Exception as e:
+            self._logger.warning(f"Failed to close context: {e}")
+
+    @contextmanager
+    def page(self):
+        """Context manager yielding a loaded page"""
+        context, page = self.acquire()
+        try:
+            yield page
+        finally:
+            self.release(context)
+
+    def stats(self) -> dict:
+        """Get warm hit and cold start counters"""
+        return {
+            "spares": len(self._spares),
+            "warm_hits": self.warm_hits,
+            "cold_starts": self.cold_starts,
+        }
+
+    def close(self):
+        """Close spare contexts"""
+        while self._spares:
+            context, _ = self._spares.popleft()
+            self.release(context)
+
+
+class SeleniumDriverPool:
+    """Thread pool running page-object flows, one Selenium driver per thread
+
+    A flow is a callable taking the thread's driver first, e.g.
+
+        def login(driver, username, password):
+            page = LoginPage(driver, DriverType.SELENIUM)
+            return LoginPageActions(page).login(username, password)
+
+        with SeleniumDriverPool(size=4) as pool:
+            results = pool.map(login, users)
+
+    Pages, waits and actions stay single-threaded: a driver is only ever used
+    by the thread that created it. submit() blocks once size + max_pending
+    flows are queued or running, so producers cannot outrun the browsers.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        create_driver: Optional[Callable[[], Any]] = None,
+        max_pending: Optional[int] = None,
+        reset_state: bool = True,
+    ):
+        """
+        Args:
+            size: Number of worker threads, and so of drivers
+            create_driver: Driver factory, defaults to a headless local
+                Chrome; e.g. lambda: DriverFactory.create_selenium_remote(...)
+            max_pending: Flows queued beyond the running ones, defaults to size
+            reset_state: After a flow, delete cookies and clear local and
+                session storage of the current origin, then load about:blank
+        """
+        self.size = max(size, 1)
+        self._create_driver = create_driver or (
+            lambda: DriverFactory.create_selenium_local("chrome", headless=True)
+        )
+        self.reset_state = reset_state
+        pending = self.size if max_pending is None else max(max_pending, 0)
+        self._slots = threading.BoundedSemaphore(self.size + pending)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.size, thread_name_prefix="selenium"
+        )
+        self._local = threading.local()
+        self._drivers: List = []
+        self._lock = threading.Lock()
+        self.launches = 0
+        self.relaunches = 0
+        self.flows = 0
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def driver(self):
+        """Get the calling worker thread's driver, creating it on first use"""
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            driver = self._create_driver()
+            self._local.driver = driver
+            with self._lock:
+                self._drivers.append(driver)
+                self.launches += 1
+        return driver
+
+    def _healthy(self, driver) -> bool:
+        """Check that driver session still answers"""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        """Quit thread's driver, the next flow on this thread creates a new one"""
+        self._logger.warning("Discarding unresponsive Selenium driver")
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self.relaunches += 1
+        self._local.driver = None
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _reset(self, driver):
+        """Clear what the finished flow left in the browser"""
+        try:
+            driver.delete_all_cookies()
+        except Exception:
+            pass
+        try:
+            driver.execute_script(
+                "window.localStorage.clear(); window.sessionStorage.clear();"
+            )
+        except Exception:
+            # Pages like about:blank have no storage to clear
+            pass
+        try:
+            driver.get("about:blank")
+        except Exception as e:
+            self._logger.warning(f"Failed to reset driver to about:blank: {e}")
+
+    def _run(self, flow: Callable, args: tuple, kwargs: dict) -> Any:
+        driver = None
+        try:
+            driver = self.driver()
+            if not self._healthy(driver):
+                # Died while idle, e.g. the browser crashed after the last flow
+                self._discard(driver)
+                driver = self.driver()
+            return flow(driver, *args, **kwargs)
+        except Exception:
+            if driver is not None and not self._healthy(driver):
+                self._discard(driver)
+                driver = None
+            raise
+        finally:
+            if driver is not None and self.reset_state:
+                self._reset(driver)
+            with self._lock:
+                self.flows += 1
+            self._slots.release()
+
+    def submit(self, flow: Callable, *args, **kwargs) -> Future:
+        """
+        Queue flow(driver, *args, **kwargs), blocking while the queue is full
+
+        Returns:
+            Future with the flow's result or exception
+        """
+        self._slots.acquire()
+        try:
+            return self._executor.submit(self._run, flow, args, kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def map(self, flow: Callable, items: Iterable) -> List[Any]:
+        """Run flow(driver, item) for every item, results in item order"""
+        futures = [self.submit(flow, item) for item in items]
+        return [future.result() for future in futures]
+
+    def stats(self) -> dict:
+        """Get driver and flow counters"""
+        with self._lock:
+            return {
+                "drivers": len(self._drivers),
+                "launches": self.launches,
+                "relaunches": self.relaunches,
+                "flows": self.flows,
+            }
+
+    def close(self):
+        """Wait for queued flows, then quit all drivers"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                self._logger.warning(f"Failed to quit driver: {e}")
+
+    def __enter__(self) -> "SeleniumDriverPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
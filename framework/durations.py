@@ -0,0 +1,134 @@
+import heapq
+import json
+import os
+import statistics
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from framework.logger import setup_logger
+
+TEST_DURATIONS_PATH = os.getenv("TEST_DURATIONS_PATH", ".test_durations.json")
+
+
+class DurationHistory:
+    """Smoothed wall time per test node id, in seconds
+
+    Tests without history are estimated as the median of their module's
+    known tests, else the median of all known tests, else default.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = TEST_DURATIONS_PATH,
+        smoothing: float = 0.5,
+        default: float = 1.0,
+    ):
+        """
+        Args:
+            path: JSON file the history is kept in
+            smoothing: Weight of a new measurement against the stored value
+            default: Estimate when nothing at all is known
+        """
+        self.path = Path(path) if path else None
+        self.smoothing = smoothing
+        self.default = default
+        self.durations: Dict[str, float] = {}
+        # (per-module medians, global median), computed once per change
+        self._fallbacks: Optional[Tuple[Dict[str, float], float]] = None
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def update(self, measured: Dict[str, float]):
+        """Blend new measurements into the history"""
+        self._fallbacks = None
+        for node_id, duration in measured.items():
+            previous = self.durations.get(node_id)
+            if previous is None:
+                self.durations[node_id] = duration
+            else:
+                self.durations[node_id] = (
+                    self.smoothing * duration + (1 - self.smoothing) * previous
+                )
+
+    def estimate(self, node_id: str) -> float:
+        """Get expected duration of a test"""
+        known = self.durations.get(node_id)
+        if known is not None:
+            return known
+        modules, overall = self._medians()
+        return modules.get(_module(node_id), overall)
+
+    def _medians(self) -> Tuple[Dict[str, float], float]:
+        if self._fallbacks is None:
+            grouped: Dict[str, List[float]] = {}
+            for node_id, duration in self.durations.items():
+                grouped.setdefault(_module(node_id), []).append(duration)
+            modules = {
+                module: statistics.median(durations)
+                for module, durations in grouped.items()
+            }
+            overall = (
+                statistics.median(self.durations.values())
+                if self.durations
+                else self.default
+            )
+            self._fallbacks = modules, overall
+        return self._fallbacks
+
+    def load(self):
+        """Load history from path"""
+        if not self.path or not self.path.exists():
+            return
+        self._fallbacks = None
+        try:
+            self.durations.update(json.loads(self.path.read_text()))
+        except (OSError, ValueError) as e:
+            self._logger.warning(f"Failed to load durations {self.path}: {e}")
+
+    def save(self):
+        """Save history to path"""
+        if not self.path:
+            return
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(self.durations, indent=1, sort_keys=True))
+            tmp.replace(self.path)
+        except OSError as e:
+            self._logger.warning(f"Failed to save durations {self.path}: {e}")
+
+
+def _module(node_id: str) -> str:
+    return node_id.split("::", 1)[0]
+
+
+def lpt_assign(
+    units: Sequence[Sequence[str]], workers: int, history: DurationHistory
+) -> List[List[str]]:
+    """
+    Longest-processing-time-first bin packing of test units onto workers
+
+    Args:
+        units: Groups of node ids that must run on the same worker
+        workers: Number of workers
+        history: Source of duration estimates
+
+    Returns:
+        One list of node ids per worker, empty workers dropped
+    """
+    costs = [
+        (sum(history.estimate(node_id) for node_id in unit), unit) for unit in units
+    ]
+    shards: List[List[str]] = [[] for _ in range(max(workers, 1))]
+    loads = [(0.0, index) for index in range(len(shards))]
+    # Stable for equal costs: keep collection order among ties
+    for cost, unit in sorted(costs, key=lambda item: -item[0]):
+        load, index = heapq.heappop(loads)
+        shards[index].extend(unit)
+        heapq.heappush(loads, (load + cost, index))
+    return [node_ids for node_ids in shards if node_ids]
+
+
+def makespan(shards: Sequence[Sequence[str]], history: DurationHistory) -> float:
+    """Get estimated duration of the slowest worker"""
+    return max(
+        (sum(history.estimate(node_id) for node_id in shard) for shard in shards),
+        default=0.0,
+    )
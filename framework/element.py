@@ -1,9 +1,12 @@
-from typing import Optional, List, Any
+import json
+from typing import Optional, List, Any, Dict, Hashable
+from framework import dom, network
 from framework.logger import log_action, setup_logger, log_waning
 from framework.locator import Locator, DriverType
+from framework.network import ResponseSpec, ResponseTiming
 
 try:
-    from framework.waiter import SeleniumWaitManager
+    from framework.waiter import create_wait_manager
     from framework.screenshot import SeleniumScreenshotManager
     from framework.actions import SeleniumElementActions
     from selenium.webdriver.support.ui import WebDriverWait
@@ -11,11 +14,15 @@ try:
 except ImportError:
     log_waning("Selenium not installed, SeleniumWebElement will not work")
 try:
-    from framework.waiter import PlaywrightWaitManager
     from framework.screenshot import PlaywrightScreenshotManager
     from framework.actions import PlaywrightElementActions
 except ImportError:
     log_waning("Playwright not installed, PlaywrightWebElement will not work")
+try:
+    from framework.screenshot import AsyncPlaywrightScreenshotManager
+    from framework.actions import AsyncPlaywrightElementActions
+except ImportError:
+    log_waning("Playwright async API not available, AsyncWebElement will not work")
 
 
 class WebElement:
@@ -27,35 +34,40 @@ class WebElement:
         driver: Any,
         driver_type: DriverType = DriverType.SELENIUM,
         timeout: int = 10000,
+        element_cache: Optional["ElementCache"] = None,
     ):
         self._locator = locator
         self._driver = driver
         self._driver_type = driver_type
         self._timeout = timeout
+        self._element_cache = element_cache
         self._logger = setup_logger(self.__class__.__name__)
 
         self._initialize_managers()
 
     def _initialize_managers(self):
         """Initialize appropriate managers based on driver type"""
+        self._wait_manager = create_wait_manager(
+            self._driver, self._driver_type, self._timeout
+        )
         if self._driver_type == DriverType.SELENIUM:
-            self._wait_manager = SeleniumWaitManager(self._driver, self._timeout)
             self._screenshot_manager = SeleniumScreenshotManager(self._driver)
+        elif self._driver_type == DriverType.PLAYWRIGHT_ASYNC:
+            self._screenshot_manager = AsyncPlaywrightScreenshotManager(self._driver)
         else:  # PLAYWRIGHT
-            self._wait_manager = PlaywrightWaitManager(self._driver, self._timeout)
             self._screenshot_manager = PlaywrightScreenshotManager(self._driver)
 
     @log_action("Finding element")
     def find(self) -> Optional[Any]:
         """Find element"""
         if self._driver_type == DriverType.SELENIUM:
-            selenium_locator = self._locator.to_selenium()
-            return self._wait_manager.wait_for_presence(selenium_locator, self._timeout)
+            locator = self._locator.to_selenium()
         else:  # PLAYWRIGHT
-            playwright_locator = self._locator.to_playwright()
-            return self._wait_manager.wait_for_presence(
-                playwright_locator, self._timeout
-            )
+            locator = self._locator.to_playwright()
+        found = self._wait_manager.wait_for_presence(locator, self._timeout)
+        # Waiting implies the page was expected to change meanwhile
+        self._mark_dom_changed()
+        return found
 
     @log_action("Checking if clickable")
     def is_clickable(self) -> bool:
@@ -70,6 +82,7 @@ class WebElement:
             element = self._wait_manager.wait_for_clickable(
                 playwright_locator, timeout=100
             )
+        self._mark_dom_changed()
         return element is not None
 
     @log_action("Checking if visible")
@@ -92,9 +105,52 @@ class WebElement:
         """Check if element is present on page"""
         return self.find() is not None
 
+    @log_action("Checking if presented now")
+    def is_presented_now(self) -> bool:
+        """Check if element is in current DOM, without waiting"""
+        return self._query_now("present")
+
+    @log_action("Checking if visible now")
+    def is_visible_now(self) -> bool:
+        """Check if element is visible in current DOM, without waiting"""
+        return self._query_now("visible")
+
+    @log_action("Checking if hidden now")
+    def is_hidden_now(self) -> bool:
+        """Check if element is absent or hidden in current DOM, without waiting"""
+        return self._query_now("hidden")
+
+    def _query_now(self, state: str) -> bool:
+        """Answer state query from current DOM in one round trip"""
+        try:
+            return dom.probe(
+                self._driver, self._driver_type, [self._locator], state
+            )[0]
+        except Exception as e:
+            # E.g. the page navigated while the script ran
+            self._logger.warning(f"Query {state} failed: {e}")
+            return False
+
     @log_action("Performing click")
-    def click(self, x_offset: int = 0, y_offset: int = 0):
-        """Click element"""
+    def click(
+        self,
+        x_offset: int = 0,
+        y_offset: int = 0,
+        expect_response: Optional[ResponseSpec] = None,
+        response_timeout: Optional[int] = None,
+    ) -> Optional[ResponseTiming]:
+        """
+        Click element
+
+        Args:
+            x_offset: Horizontal click offset
+            y_offset: Vertical click offset
+            expect_response: Return once a response matching this spec arrives
+            response_timeout: Maximum time to wait for the response (ms)
+
+        Returns:
+            ResponseTiming of the matched response if expect_response is given
+        """
         element = self.find()
 
         if not element:
@@ -105,7 +161,19 @@ class WebElement:
         else:
             actions = PlaywrightElementActions(self._driver, element)
 
-        actions.click(x_offset, y_offset)
+        response = None
+        if expect_response is None:
+            actions.click(x_offset, y_offset)
+        else:
+            response = network.expect_response(
+                self._driver,
+                self._driver_type,
+                expect_response,
+                lambda: actions.click(x_offset, y_offset),
+                self._timeout if response_timeout is None else response_timeout,
+            )
+        self._mark_dom_changed()
+        return response
 
     @log_action("Sending keys")
     def send_keys(self, text: str):
@@ -121,6 +189,12 @@ class WebElement:
             actions = PlaywrightElementActions(self._driver, element)
 
         actions.send_keys(text)
+        self._mark_dom_changed()
+
+    def _mark_dom_changed(self):
+        """Tell the page cache that an action may have changed the DOM"""
+        if self._element_cache is not None:
+            self._element_cache.mark_dom_changed()
 
     @log_action("Getting text")
     def get_text(self) -> str:
@@ -161,25 +235,217 @@ class WebElement:
             self._screenshot_manager.highlight_and_screenshot(element, file_name)
 
 
+class AsyncWebElement(WebElement):
+    """WebElement over a Playwright async API Page, every action is awaited"""
+
+    @log_action("Finding element")
+    async def find(self) -> Optional[Any]:
+        """Find element"""
+        found = await self._wait_manager.wait_for_presence(
+            self._locator.to_playwright(), self._timeout
+        )
+        self._mark_dom_changed()
+        return found
+
+    @log_action("Checking if clickable")
+    async def is_clickable(self) -> bool:
+        """Check if element is clickable"""
+        element = await self._wait_manager.wait_for_clickable(
+            self._locator.to_playwright(), timeout=100
+        )
+        self._mark_dom_changed()
+        return element is not None
+
+    @log_action("Checking if visible")
+    async def is_visible(self, timeout: int = 500) -> bool:
+        """Check if element is visible"""
+        old_timeout = self._timeout
+        self._timeout = timeout
+        try:
+            element = await self.find()
+        finally:
+            self._timeout = old_timeout
+        if element is None:
+            return False
+        return await element.is_visible()
+
+    @log_action("Checking if presented")
+    async def is_presented(self) -> bool:
+        """Check if element is present on page"""
+        return await self.find() is not None
+
+    async def _query_now(self, state: str) -> bool:
+        """Answer state query from current DOM in one round trip"""
+        try:
+            results = await dom.probe(
+                self._driver, self._driver_type, [self._locator], state
+            )
+        except Exception as e:
+            self._logger.warning(f"Query {state} failed: {e}")
+            return False
+        return results[0]
+
+    async def _actions(self) -> "AsyncPlaywrightElementActions":
+        element = await self.find()
+        if not element:
+            raise ElementNotFound(f"Element {self._locator} not found")
+        return AsyncPlaywrightElementActions(self._driver, element)
+
+    @log_action("Performing click")
+    async def click(
+        self,
+        x_offset: int = 0,
+        y_offset: int = 0,
+        expect_response: Optional[ResponseSpec] = None,
+        response_timeout: Optional[int] = None,
+    ) -> Optional[ResponseTiming]:
+        """Click element, see WebElement.click()"""
+        actions = await self._actions()
+        response = None
+        if expect_response is None:
+            await actions.click(x_offset, y_offset)
+        else:
+            response = await network.expect_response_async(
+                self._driver,
+                expect_response,
+                lambda: actions.click(x_offset, y_offset),
+                self._timeout if response_timeout is None else response_timeout,
+            )
+        self._mark_dom_changed()
+        return response
+
+    @log_action("Sending keys")
+    async def send_keys(self, text: str):
+        """Type text into element"""
+        actions = await self._actions()
+        await actions.send_keys(text)
+        self._mark_dom_changed()
+
+    @log_action("Getting text")
+    async def get_text(self) -> str:
+        """Get element text"""
+        element = await self.find()
+        if not element:
+            return ""
+        return await AsyncPlaywrightElementActions(self._driver, element).get_text()
+
+    @log_action("Getting attribute")
+    async def get_attribute(self, attr_name: str) -> Optional[str]:
+        """Get element attribute"""
+        element = await self.find()
+        if not element:
+            return None
+        actions = AsyncPlaywrightElementActions(self._driver, element)
+        return await actions.get_attribute(attr_name)
+
+    @log_action("Taking screenshot")
+    async def highlight_and_screenshot(self, file_name: str = "element.png"):
+        """Highlight element with red border and take screenshot"""
+        element = await self.find()
+        if element:
+            await self._screenshot_manager.highlight_and_screenshot(
+                element, file_name
+            )
+
+
+class ElementCache:
+    """Per-page cache of WebElement wrappers with hit/miss counters"""
+
+    def __init__(self):
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.dom_version = 0
+
+    def get_or_create(self, key: Hashable, factory) -> WebElement:
+        """Return cached element for key or build it with factory"""
+        cached = self._elements.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        cached = self._elements[key] = factory()
+        return cached
+
+    def invalidate(self):
+        """Drop all cached elements"""
+        if self._elements:
+            self._elements.clear()
+        self.invalidations += 1
+        self.mark_dom_changed()
+
+    def mark_dom_changed(self):
+        """Expire DOM-derived state such as cached collection counts"""
+        self.dom_version += 1
+
+    def stats(self) -> dict:
+        """Get cache counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self._elements),
+        }
+
+
 class element:
+    element_class = WebElement
+    async_element_class = AsyncWebElement
+
     def __init__(self, locator_name: str):
         self.locator_name = locator_name
 
     def __call__(self, func) -> WebElement:
-        def wrapper(obj):
+        def build(obj):
             locator = getattr(obj._locators, self.locator_name)
-            return WebElement(
+            element_class = self.element_class
+            if obj._driver_type == DriverType.PLAYWRIGHT_ASYNC:
+                element_class = self.async_element_class
+            return element_class(
                 locator,
                 obj._driver,
                 obj._driver_type,
                 obj._timeout,
+                getattr(obj, "_element_cache", None),
             )
 
+        def wrapper(obj):
+            cache = getattr(obj, "_element_cache", None)
+            if cache is None:
+                return build(obj)
+            # Same locator and wrapper type is the same element, whatever the
+            # property is called; element() and elements() stay apart
+            key = (self.locator_name, self.element_class)
+            return cache.get_or_create(key, lambda: build(obj))
+
         return property(wrapper)
 
 
 class ManyWebElements(WebElement):
-    """Collection of elements"""
+    """Collection of elements
+
+    Indexing, slicing, iteration and len() are lazy: they map to Playwright
+    nth() locators or a single indexed lookup on Selenium, backed by one
+    cached count. The count expires on navigation, element actions, waits and
+    BasePage.perform(); call refresh() after DOM changes made by other means
+    (e.g. infinite scroll driven directly through the page).
+    """
+
+    # Selenium indexed lookup: return only the requested matches
+    _SELECT_JS = (
+        "([type, value, indexes]) => {"
+        + dom.HELPERS_JS
+        + """
+    const found = find(type, value);
+    return indexes.map((i) => found[i] || null);
+}"""
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_count = None
+        self._cached_count_version = None
 
     @log_action("Finding elements")
     def find(self) -> List[Any]:
@@ -192,6 +458,8 @@ class ManyWebElements(WebElement):
             except Exception as e:
                 self._logger.warning(f"Find many failed: {e}")
                 return []
+            finally:
+                self._mark_dom_changed()
         else:
             playwright_locator = self._locator.to_playwright()
             try:
@@ -206,20 +474,177 @@ class ManyWebElements(WebElement):
         elements = self.find()
         return len(elements)
 
+    @log_action("Counting elements now")
+    def count_now(self) -> int:
+        """Get count of elements in current DOM, without waiting"""
+        return dom.count(self._driver, self._driver_type, self._locator)
+
     @log_action("Getting all text")
     def get_all_text(self) -> List[str]:
         """Get text from all elements"""
-        elements = self.find()
+        if self._driver_type == DriverType.SELENIUM:
+            # Selenium .text is the rendered, trimmed text
+            expression = '(el.innerText || "").trim()'
+        else:
+            expression = 'el.textContent || ""'
+        return [row["value"] for row in self.extract({"value": expression})]
+
+    @log_action("Getting all attributes")
+    def get_all_attributes(self, attr_name: str) -> List[Optional[str]]:
+        """Get attribute value from all elements"""
+        expression = f"el.getAttribute({json.dumps(attr_name)})"
+        return [row["value"] for row in self.extract({"value": expression})]
+
+    @log_action("Extracting fields")
+    def extract(self, fields: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Evaluate JS expressions over all elements in one round trip
+
+        Args:
+            fields: Mapping of field name to JS expression over `el`,
+                e.g. {"text": "el.textContent", "href": "el.href"}
+
+        Returns:
+            List with one dict of field values per element
+        """
+        # Keep the waiting behaviour of find(): Selenium waits for presence,
+        # Playwright returns whatever is in the DOM
+        timeout = self._timeout if self._driver_type == DriverType.SELENIUM else 0
+        try:
+            return dom.extract(
+                self._driver, self._driver_type, self._locator, fields, timeout
+            )
+        except Exception as e:
+            self._logger.warning(f"Extract failed: {e}")
+            return []
 
+    @log_action("Taking screenshot")
+    def highlight_and_screenshot(self, file_name: str = "elements.png"):
+        """Highlight all elements with red border and take one screenshot"""
         if self._driver_type == DriverType.SELENIUM:
-            return [elem.text or "" for elem in elements]
+            found = self.find()
         else:
-            return [elem.text_content() or "" for elem in elements]
+            # Base locator matches every element, styled in one evaluate_all
+            found = self._driver.locator(self._locator.to_playwright())
+        if found:
+            self._screenshot_manager.highlight_and_screenshot_many(found, file_name)
+
+    def _dom_version(self) -> int:
+        if self._element_cache is None:
+            return 0
+        return self._element_cache.dom_version
+
+    def refresh(self):
+        """Forget cached count"""
+        self._cached_count = None
+
+    def __bool__(self) -> bool:
+        """Collections are always truthy, use count_now() to check emptiness"""
+        return True
+
+    def __len__(self) -> int:
+        """Get cached count of elements in current DOM"""
+        version = self._dom_version()
+        if self._cached_count is None or self._cached_count_version != version:
+            self._cached_count = self.count_now()
+            self._cached_count_version = version
+        return self._cached_count
+
+    def _select(self, indexes: List[int]) -> List[Any]:
+        """Get element handles at indexes without materializing the list"""
+        if self._driver_type == DriverType.SELENIUM:
+            return dom.run_script(
+                self._driver,
+                self._driver_type,
+                self._SELECT_JS,
+                dom.locator_spec(self._locator) + [indexes],
+            )
+        locator = self._driver.locator(self._locator.to_playwright())
+        return [locator.nth(i) for i in indexes]
 
-    def __getitem__(self, index: int):
-        """Access element by index"""
-        elements = self.find()
-        return elements[index]
+    def __getitem__(self, index):
+        """Access element by index or slice"""
+        size = len(self)
+        if isinstance(index, slice):
+            return self._select(list(range(*index.indices(size))))
+
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f"Element index {index} out of range for {size}")
+        return self._select([index])[0]
+
+    def __iter__(self):
+        """Iterate over element handles"""
+        return iter(self[:])
+
+
+class AsyncManyWebElements(ManyWebElements):
+    """Collection of elements on a Playwright async API Page
+
+    len(), slicing and iteration would need a blocking count: use
+    await count_now() and indexing (an nth() locator) instead.
+    """
+
+    @log_action("Finding elements")
+    async def find(self) -> List[Any]:
+        """Find multiple elements"""
+        try:
+            return await self._driver.locator(self._locator.to_playwright()).all()
+        except Exception as e:
+            self._logger.warning(f"Find many failed: {e}")
+            return []
+
+    @log_action("Counting elements")
+    async def count(self) -> int:
+        """Get count of elements"""
+        return len(await self.find())
+
+    @log_action("Getting all text")
+    async def get_all_text(self) -> List[str]:
+        """Get text from all elements"""
+        rows = await self.extract({"value": 'el.textContent || ""'})
+        return [row["value"] for row in rows]
+
+    @log_action("Getting all attributes")
+    async def get_all_attributes(self, attr_name: str) -> List[Optional[str]]:
+        """Get attribute value from all elements"""
+        expression = f"el.getAttribute({json.dumps(attr_name)})"
+        return [row["value"] for row in await self.extract({"value": expression})]
+
+    @log_action("Extracting fields")
+    async def extract(self, fields: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Evaluate JS expressions over all elements in one round trip"""
+        try:
+            return await dom.extract(
+                self._driver, self._driver_type, self._locator, fields, 0
+            )
+        except Exception as e:
+            self._logger.warning(f"Extract failed: {e}")
+            return []
+
+    @log_action("Taking screenshot")
+    async def highlight_and_screenshot(self, file_name: str = "elements.png"):
+        """Highlight all elements with red border and take one screenshot"""
+        found = self._driver.locator(self._locator.to_playwright())
+        await self._screenshot_manager.highlight_and_screenshot_many(found, file_name)
+
+    def __len__(self) -> int:
+        raise TypeError("Use await count_now() on async elements")
+
+    def __getitem__(self, index):
+        """Get nth() locator, negative indexes count from the end"""
+        if isinstance(index, slice):
+            raise TypeError("Slicing async elements is not supported")
+        return self._driver.locator(self._locator.to_playwright()).nth(index)
+
+    def __iter__(self):
+        raise TypeError("Use await find() to iterate async elements")
+
+
+class elements(element):
+    element_class = ManyWebElements
+    async_element_class = AsyncManyWebElements
 
 
 class ElementNotFound(Exception):
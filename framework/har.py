@@ -0,0 +1,108 @@
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional
+from framework.logger import setup_logger
+
+HAR_MODE = os.getenv("HAR_MODE", "").lower()
+HAR_DIR = os.getenv("HAR_DIR", "hars")
+HAR_MISS_POLICY = os.getenv("HAR_MISS_POLICY", "strict").lower()
+
+HAR_MODES = ("record", "replay")
+MISS_POLICIES = ("strict", "lenient")
+
+
+class HarMissStats:
+    """Requests that replay could not serve from an archive"""
+
+    def __init__(self):
+        self.misses: List[str] = []
+        self._lock = threading.Lock()
+
+    def record(self, archive: str, method: str, url: str):
+        with self._lock:
+            self.misses.append(f"{archive}: {method} {url}")
+
+    def summary(self) -> str:
+        return f"{len(self.misses)} requests not found in HAR archives"
+
+
+class HarArchive:
+    """Record a context's traffic to a HAR file or serve it back from one
+
+    Replay never touches the network: requests missing from the archive are
+    aborted (strict) or answered with an empty 404 (lenient), and WebSockets
+    are left unconnected.
+    """
+
+    def __init__(
+        self,
+        path,
+        mode: str,
+        miss_policy: str = "strict",
+        stats: Optional[HarMissStats] = None,
+    ):
+        """
+        Args:
+            path: HAR file
+            mode: "record" or "replay"
+            miss_policy: "strict" or "lenient", replay only
+            stats: Collects replay misses
+        """
+        if mode not in HAR_MODES:
+            raise ValueError(f"Unknown HAR mode {mode!r}, expected {HAR_MODES}")
+        if miss_policy not in MISS_POLICIES:
+            raise ValueError(
+                f"Unknown HAR miss policy {miss_policy!r}, expected {MISS_POLICIES}"
+            )
+        self.path = Path(path)
+        self.mode = mode
+        self.miss_policy = miss_policy
+        self.stats = stats
+        self._logger = setup_logger(self.__class__.__name__)
+
+    @property
+    def context_options(self) -> dict:
+        """new_context() options, service workers would bypass routing"""
+        return {"service_workers": "block"}
+
+    def apply(self, context):
+        """Install HAR routes on a BrowserContext before other routes"""
+        if self.mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            context.route_from_har(
+                self.path, update=True, update_content="embed", update_mode="minimal"
+            )
+            return
+
+        if not self.path.exists():
+            if self.miss_policy == "strict":
+                raise FileNotFoundError(f"HAR archive {self.path} not recorded")
+            self._logger.warning(f"HAR archive {self.path} missing, serving 404s")
+
+        # Registered first so it only sees what the archive did not match
+        context.route("**/*", self._miss)
+        if self.path.exists():
+            context.route_from_har(self.path, not_found="fallback")
+        context.route_web_socket("**/*", lambda web_socket: None)
+
+    def _miss(self, route):
+        request = route.request
+        if self.stats is not None:
+            self.stats.record(self.path.name, request.method, request.url)
+        self._logger.debug(f"HAR miss: {request.method} {request.url}")
+        if self.miss_policy == "strict":
+            route.abort("internetdisconnected")
+        else:
+            route.fulfill(status=404, body="")
+
+
+def har_archive(
+    name: str, stats: Optional[HarMissStats] = None
+) -> Optional[HarArchive]:
+    """Get archive HAR_DIR/<name>.har for HAR_MODE, None when mode is unset"""
+    if not HAR_MODE:
+        return None
+    return HarArchive(
+        Path(HAR_DIR) / f"{name}.har", HAR_MODE, HAR_MISS_POLICY, stats
+    )
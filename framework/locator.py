@@ -13,6 +13,7 @@ class LocatorType(Enum):
 class DriverType(Enum):
     SELENIUM = "selenium"
     PLAYWRIGHT = "playwright"
+    PLAYWRIGHT_ASYNC = "playwright_async"
 
 
 @dataclass
@@ -1,40 +1,352 @@
+import atexit
+import inspect
+import json
 import logging
+import os
+import queue
+import threading
+from contextvars import ContextVar
 from functools import wraps
-from typing import Callable
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, List, Optional
+from framework.locator import DriverType
+from framework.tracing import tracer
 
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+LOG_JSONL = os.getenv("LOG_JSONL")
+
+_loggers: Dict[str, logging.Logger] = {}
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+_current_action: ContextVar = ContextVar("current_action", default=None)
+_step_depth: ContextVar = ContextVar("step_depth", default=0)
+_step_listeners: List[Callable] = []
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "logger": record.name,
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue records with the message formatted, but not the _Truncated results
+
+    Arguments are rendered now, since they may change before the listener
+    thread gets to them. Only str() of _Truncated step results, which can be
+    large, is left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if isinstance(args, tuple) and any(isinstance(a, _Truncated) for a in args):
+            text = str(record.msg) % tuple(
+                _DEFERRED if isinstance(arg, _Truncated) else arg for arg in args
+            )
+            record.msg = text.replace("%", "%%").replace(_DEFERRED, "%s")
+            record.args = tuple(arg for arg in args if isinstance(arg, _Truncated))
+        elif args:
+            record.msg, record.args = record.getMessage(), None
+        return record
+
+
+# Stands in for _Truncated arguments while the rest of a message is rendered
+_DEFERRED = "\x00deferred\x00"
+
+
+def configure_logging(jsonl_path: Optional[str] = LOG_JSONL) -> QueueHandler:
+    """
+    (Re)start the background log writer
+
+    Args:
+        jsonl_path: Optional file to also receive structured JSONL records
+
+    Returns:
+        Queue handler shared by all framework loggers
+    """
+    global _queue_handler, _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers = [stream_handler]
+        if jsonl_path:
+            jsonl_handler = logging.FileHandler(jsonl_path, encoding="utf-8")
+            jsonl_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(jsonl_handler)
+
+        if _queue_handler is None:
+            _queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(
+            _queue_handler.queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+    return _queue_handler
+
+
+def _stop_logging():
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+
+
+atexit.register(_stop_logging)
+
+
+def setup_logger(name: str, level: int = LOG_LEVEL) -> logging.Logger:
+    """Setup logger instance, cached per name"""
+    logger = _loggers.get(name)
+    if logger is not None:
+        return logger
 
-def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
-    """Setup logger instance"""
     logger = logging.getLogger(name)
     if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        logger.addHandler(_queue_handler or configure_logging())
         logger.setLevel(level)
+    _loggers[name] = logger
     return logger
 
 
+class _Truncated:
+    """Defer str() of a value until the record is formatted"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        return text if len(text) <= 200 else text[:197] + "..."
+
+
+def _log_failure(logger: logging.Logger, action_name: str, error: Exception):
+    """Log an error once, at the innermost action it passed through"""
+    if getattr(error, "_action_logged", False):
+        return
+    logger.error(
+        "Failed: %s. Error: %s: %s",
+        action_name,
+        type(error).__name__,
+        error,
+        extra={"fields": {"action": action_name, "error": type(error).__name__}},
+    )
+    try:
+        error._action_logged = True
+    except AttributeError:
+        pass
+
+
+def add_step_listener(listener: Callable):
+    """
+    Call listener(owner, action_name, error) after every top-level step
+
+    Args:
+        listener: Callback receiving the object whose step finished, the step
+            name and the exception it raised (None on success)
+    """
+    if listener not in _step_listeners:
+        _step_listeners.append(listener)
+
+
+def remove_step_listener(listener: Callable):
+    """Stop calling listener after steps"""
+    if listener in _step_listeners:
+        _step_listeners.remove(listener)
+
+
+def _notify_step(owner, action_name: str, error: Optional[BaseException]):
+    for listener in list(_step_listeners):
+        try:
+            listener(owner, action_name, error)
+        except Exception as e:
+            setup_logger("logger").warning(f"Step listener failed: {e}")
+
+
+def _returns_awaitables(owner) -> bool:
+    """Whether owner is, or acts on, a page object or element on the async API"""
+    page = getattr(owner, "_page", owner)
+    return getattr(page, "_driver_type", None) == DriverType.PLAYWRIGHT_ASYNC
+
+
+def _awaiting(func: Callable) -> Callable:
+    """Coroutine function calling func and awaiting what it returns"""
+
+    async def run(self, *args, **kwargs):
+        result = func(self, *args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    return run
+
+
+async def _finish_awaited(logger: logging.Logger, action_name: str, awaitable):
+    """Log result of a sync step that returned an awaitable once it resolves"""
+    try:
+        result = await awaitable
+    except Exception as e:
+        _log_failure(logger, action_name, e)
+        raise
+    logger.info(
+        "%s: %s",
+        _Truncated(result),
+        action_name,
+        extra={"fields": {"action": action_name, "event": "end"}},
+    )
+    return result
+
+
+def _async_action(func: Callable, action_name: str) -> Callable:
+    """log_action for coroutine functions, same logging, spans and listeners"""
+
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        logger = setup_logger(self.__class__.__name__)
+        verbose = logger.isEnabledFor(logging.INFO) and (
+            _current_action.get() != action_name
+        )
+        span = None
+        if tracer.enabled:
+            span = tracer.start(f"{self.__class__.__name__}.{action_name}")
+        action_token = _current_action.set(action_name)
+        depth_token = _step_depth.set(_step_depth.get() + 1)
+        error = None
+        try:
+            if verbose:
+                logger.info(
+                    "Starting: %s on %s",
+                    action_name,
+                    getattr(self, "_locator", "unknown"),
+                    extra={"fields": {"action": action_name, "event": "start"}},
+                )
+            result = await func(self, *args, **kwargs)
+            if verbose:
+                logger.info(
+                    "%s: %s",
+                    _Truncated(result),
+                    action_name,
+                    extra={"fields": {"action": action_name, "event": "end"}},
+                )
+            return result
+        except BaseException as e:
+            error = e
+            if span is not None:
+                span.error = type(e).__name__
+            if isinstance(e, Exception):
+                _log_failure(logger, action_name, e)
+            raise
+        finally:
+            _current_action.reset(action_token)
+            _step_depth.reset(depth_token)
+            if span is not None:
+                tracer.finish(span)
+            if _step_listeners and _step_depth.get() == 0:
+                _notify_step(self, action_name, error)
+
+    return wrapper
+
+
 def log_action(action_name: str) -> Callable:
-    """Decorator for logging actions"""
+    """Decorator for logging actions
+
+    A step that directly wraps another step with the same name (e.g. a page
+    action delegating to the page object) is logged once. While the tracer
+    is enabled every step is also recorded as a span, and step listeners are
+    notified when an outermost step finishes. Coroutine functions are wrapped
+    in a coroutine, and so are sync steps of page objects, elements and their
+    actions on DriverType.PLAYWRIGHT_ASYNC: the step runs, is traced and
+    notifies listeners when awaited. Any other sync step returning an
+    awaitable logs its result once awaited.
+    """
 
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
+        if inspect.iscoroutinefunction(func):
+            return _async_action(func, action_name)
+        awaited = _async_action(_awaiting(func), action_name)
+
+        def logged(self, args, kwargs):
             logger = setup_logger(self.__class__.__name__)
-            locator_info = getattr(self, "_locator", "unknown")
-            logger.info(f"Starting: {action_name} on {locator_info}")
+            if not logger.isEnabledFor(logging.INFO):
+                try:
+                    return func(self, *args, **kwargs)
+                except Exception as e:
+                    _log_failure(logger, action_name, e)
+                    raise
+
+            verbose = _current_action.get() != action_name
+            token = _current_action.set(action_name)
             try:
+                if verbose:
+                    logger.info(
+                        "Starting: %s on %s",
+                        action_name,
+                        getattr(self, "_locator", "unknown"),
+                        extra={"fields": {"action": action_name, "event": "start"}},
+                    )
                 result = func(self, *args, **kwargs)
-                logger.info(f"{result}: {action_name}")
+                if verbose and inspect.isawaitable(result):
+                    return _finish_awaited(logger, action_name, result)
+                if verbose:
+                    logger.info(
+                        "%s: %s",
+                        _Truncated(result),
+                        action_name,
+                        extra={"fields": {"action": action_name, "event": "end"}},
+                    )
                 return result
             except Exception as e:
-                logger.error(
-                    f"Failed: {action_name}. Error: {type(e).__name__}: {str(e)}"
-                )
+                _log_failure(logger, action_name, e)
+                raise
+            finally:
+                _current_action.reset(token)
+
+        def traced(self, args, kwargs):
+            if not tracer.enabled:
+                return logged(self, args, kwargs)
+
+            span = tracer.start(f"{self.__class__.__name__}.{action_name}")
+            try:
+                return logged(self, args, kwargs)
+            except BaseException as e:
+                span.error = type(e).__name__
+                raise
+            finally:
+                tracer.finish(span)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if _returns_awaitables(self):
+                return awaited(self, *args, **kwargs)
+            if not _step_listeners:
+                return traced(self, args, kwargs)
+
+            error = None
+            token = _step_depth.set(_step_depth.get() + 1)
+            try:
+                return traced(self, args, kwargs)
+            except BaseException as e:
+                error = e
                 raise
+            finally:
+                _step_depth.reset(token)
+                if _step_depth.get() == 0:
+                    _notify_step(self, action_name, error)
 
         return wrapper
 
@@ -0,0 +1,172 @@
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+from framework.locator import DriverType
+from framework.logger import log_waning, setup_logger
+
+try:
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    log_waning("Playwright not installed, Playwright response waits will not work")
+
+
+def _success(status: int) -> bool:
+    return 200 <= status < 400
+
+
+@dataclass
+class ResponseSpec:
+    """Describes the HTTP response that completes an action"""
+
+    url_pattern: str
+    method: Optional[str] = None
+    status: Callable[[int], bool] = _success
+
+    def matches(self, url: str, method: str, status: int) -> bool:
+        """Check response against spec"""
+        if self.method and method.upper() != self.method.upper():
+            return False
+        if not re.search(self.url_pattern, url):
+            return False
+        return self.status(status)
+
+
+@dataclass
+class ResponseTiming:
+    """Response that completed an action"""
+
+    url: str
+    method: str
+    status: int
+    elapsed_ms: float
+    timing: dict = field(default_factory=dict)
+
+
+def expect_response(
+    driver,
+    driver_type: DriverType,
+    spec: ResponseSpec,
+    action: Callable[[], None],
+    timeout: int = 10000,
+) -> Optional[ResponseTiming]:
+    """
+    Run action and return as soon as a response matching spec arrives
+
+    Args:
+        driver: Selenium WebDriver or Playwright Page instance
+        driver_type: Type of driver
+        spec: Response to wait for
+        action: Callable triggering the request
+        timeout: Maximum time to wait in milliseconds
+
+    Returns:
+        ResponseTiming, or None if no matching response arrived in time
+    """
+    if driver_type == DriverType.SELENIUM:
+        return _expect_selenium_response(driver, spec, action, timeout)
+    return _expect_playwright_response(driver, spec, action, timeout)
+
+
+def _expect_playwright_response(page, spec, action, timeout):
+    logger = setup_logger("ResponseWaiter")
+    started = time.monotonic()
+    acted = False
+    try:
+        with page.expect_response(
+            lambda r: spec.matches(r.url, r.request.method, r.status),
+            timeout=timeout,
+        ) as response_info:
+            action()
+            acted = True
+        response = response_info.value
+    except PlaywrightTimeoutError as e:
+        # A failing action (e.g. a click timing out) is the caller's error
+        if not acted:
+            raise
+        logger.warning(f"Wait for response {spec.url_pattern} failed: {e}")
+        return None
+
+    return ResponseTiming(
+        url=response.url,
+        method=response.request.method,
+        status=response.status,
+        elapsed_ms=(time.monotonic() - started) * 1000,
+        timing=dict(response.request.timing),
+    )
+
+
+async def expect_response_async(
+    page,
+    spec: ResponseSpec,
+    action: Callable[[], Awaitable[None]],
+    timeout: int = 10000,
+) -> Optional[ResponseTiming]:
+    """Async Playwright variant of expect_response(), action is a coroutine function"""
+    logger = setup_logger("ResponseWaiter")
+    started = time.monotonic()
+    acted = False
+    try:
+        async with page.expect_response(
+            lambda r: spec.matches(r.url, r.request.method, r.status),
+            timeout=timeout,
+        ) as response_info:
+            await action()
+            acted = True
+        response = await response_info.value
+    except PlaywrightTimeoutError as e:
+        # Playwright's async API raises the same TimeoutError class
+        if not acted:
+            raise
+        logger.warning(f"Wait for response {spec.url_pattern} failed: {e}")
+        return None
+
+    return ResponseTiming(
+        url=response.url,
+        method=response.request.method,
+        status=response.status,
+        elapsed_ms=(time.monotonic() - started) * 1000,
+        timing=dict(response.request.timing),
+    )
+
+
+def _expect_selenium_response(driver, spec, action, timeout):
+    """Watch CDP Network events through Chrome's performance log"""
+    logger = setup_logger("ResponseWaiter")
+    try:
+        # Drain entries recorded before the action
+        driver.get_log("performance")
+    except Exception as e:
+        logger.warning(
+            f"Network events unavailable ({e}), create the driver with "
+            f"capture_network=True on Chrome. Not waiting for response"
+        )
+        action()
+        return None
+
+    started = time.monotonic()
+    action()
+    deadline = started + timeout / 1000
+    methods = {}
+    while time.monotonic() < deadline:
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            params = message.get("params", {})
+            if message.get("method") == "Network.requestWillBeSent":
+                methods[params["requestId"]] = params["request"]["method"]
+            elif message.get("method") == "Network.responseReceived":
+                response = params["response"]
+                method = methods.get(params["requestId"], "")
+                if spec.matches(response["url"], method, response["status"]):
+                    return ResponseTiming(
+                        url=response["url"],
+                        method=method,
+                        status=response["status"],
+                        elapsed_ms=(time.monotonic() - started) * 1000,
+                        timing=response.get("timing") or {},
+                    )
+        time.sleep(0.05)
+
+    logger.warning(f"Wait for response {spec.url_pattern} timed out")
+    return None
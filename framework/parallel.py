@@ -0,0 +1,296 @@
+"""Run the pytest suite in parallel worker processes
+
+    python -m framework.parallel -n 8 --shard-by module -- tests/ -q
+
+Every worker is a separate pytest process, so it owns its own session
+fixtures (browser pool, drivers). Results are merged into one JUnit report.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from framework.durations import (
+    TEST_DURATIONS_PATH,
+    DurationHistory,
+    lpt_assign,
+    makespan,
+)
+from framework.logger import setup_logger
+from framework.routing import ROUTE_SIZES_PATH, RoutingStats
+from framework.timeouts import WAIT_HISTORY_PATH, TimeoutHistory
+
+SHARD_MODES = ("module", "test")
+
+logger = setup_logger("parallel")
+
+
+@dataclass
+class WorkerResult:
+    """Outcome of one worker process"""
+
+    worker_id: int
+    returncode: int
+    junit_path: Path
+    log_path: Path
+    duration: float
+    tests: int
+
+
+_VERBOSITY_FLAGS = ("-q", "-qq", "-v", "-vv", "--quiet", "--verbose")
+
+
+def split_args(pytest_args: Sequence[str]) -> tuple:
+    """Split pytest args into (options, test paths or node ids)"""
+    options, paths = [], []
+    for arg in pytest_args:
+        is_path = not arg.startswith("-") and os.path.exists(arg.split("::", 1)[0])
+        (paths if is_path else options).append(arg)
+    return options, paths
+
+
+def collect(pytest_args: Sequence[str]) -> List[str]:
+    """Collect test node ids without running them"""
+    args = [arg for arg in pytest_args if arg not in _VERBOSITY_FLAGS]
+    completed = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *args],
+        capture_output=True,
+        text=True,
+    )
+    node_ids = [line for line in completed.stdout.splitlines() if "::" in line]
+    if completed.returncode not in (0, 5) and not node_ids:
+        raise RuntimeError(f"Collection failed:\n{completed.stdout}{completed.stderr}")
+    return node_ids
+
+
+def group(node_ids: Sequence[str], shard_by: str = "module") -> List[List[str]]:
+    """Split node ids into units that must run on the same worker"""
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"Unknown shard mode {shard_by!r}, expected {SHARD_MODES}")
+    if shard_by == "test":
+        return [[node_id] for node_id in node_ids]
+
+    modules: Dict[str, List[str]] = OrderedDict()
+    for node_id in node_ids:
+        modules.setdefault(node_id.split("::", 1)[0], []).append(node_id)
+    return list(modules.values())
+
+
+def shard(
+    node_ids: Sequence[str],
+    workers: int,
+    shard_by: str = "module",
+    history: Optional[DurationHistory] = None,
+) -> List[List[str]]:
+    """
+    Assign node ids to workers, longest expected units first
+
+    Without history every test counts as equally long.
+
+    Returns:
+        One list of node ids per worker, empty workers dropped
+    """
+    history = history or DurationHistory(None)
+    return lpt_assign(group(node_ids, shard_by), workers, history)
+
+
+def run_workers(
+    shards: List[List[str]],
+    pytest_args: Sequence[str],
+    output_dir: Path,
+) -> List[WorkerResult]:
+    """Start one pytest process per shard and wait for all of them"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Workers get the options only, their tests come from the ids file
+    options, _ = split_args(pytest_args)
+    running = []
+    for worker_id, node_ids in enumerate(shards):
+        ids_path = output_dir / f"worker-{worker_id}.txt"
+        ids_path.write_text("\n".join(node_ids) + "\n")
+        junit_path = output_dir / f"worker-{worker_id}.xml"
+        log_path = output_dir / f"worker-{worker_id}.log"
+        env = dict(
+            os.environ,
+            PARALLEL_WORKER_ID=str(worker_id),
+            PARALLEL_WORKERS=str(len(shards)),
+            DURATION_REPORT=str(output_dir / f"durations-{worker_id}.json"),
+            WAIT_HISTORY_REPORT=str(output_dir / f"wait-history-{worker_id}.json"),
+            ROUTE_SIZES_REPORT=str(output_dir / f"route-sizes-{worker_id}.json"),
+        )
+        log_file = open(log_path, "w")
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                *options,
+                f"--junitxml={junit_path}",
+                "-p",
+                "no:cacheprovider",
+                f"@{ids_path}",
+            ],
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            env=env,
+        )
+        result = WorkerResult(worker_id, -1, junit_path, log_path, 0.0, len(node_ids))
+        running.append((result, process, log_file, time.monotonic()))
+
+    results = []
+    for result, process, log_file, started in running:
+        result.returncode = process.wait()
+        result.duration = time.monotonic() - started
+        log_file.close()
+        results.append(result)
+    return results
+
+
+def _read_reports(output_dir: Path, pattern: str) -> List[dict]:
+    """Load the per-worker JSON reports matching pattern"""
+    reports = []
+    for path in sorted(output_dir.glob(pattern)):
+        try:
+            reports.append(json.loads(path.read_text()))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read worker report {path}: {e}")
+    return reports
+
+
+def merge_durations(output_dir: Path, history: DurationHistory):
+    """Blend per-worker duration reports into history and save it"""
+    for report in _read_reports(output_dir, "durations-*.json"):
+        history.update(report)
+    history.save()
+
+
+def merge_wait_history(output_dir: Path, history: TimeoutHistory):
+    """Add per-worker wait samples to history and save it"""
+    reports = _read_reports(output_dir, "wait-history-*.json")
+    if not reports:
+        return
+    history.load()
+    for report in reports:
+        history.extend(report)
+    history.save()
+
+
+def merge_route_sizes(output_dir: Path, stats: RoutingStats):
+    """Add per-worker learned response sizes to stats and save them"""
+    reports = _read_reports(output_dir, "route-sizes-*.json")
+    if not reports:
+        return
+    stats.load()
+    for report in reports:
+        for url, size in report.items():
+            stats.record_size(url, size)
+    stats.save()
+
+
+def merge_junit(paths: Sequence[Path], output: Path) -> dict:
+    """
+    Merge worker JUnit XML files into one <testsuites> report
+
+    Returns:
+        Totals of tests, failures, errors, skipped and time
+    """
+    merged = ET.Element("testsuites", name="parallel")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0, "time": 0.0}
+    for path in paths:
+        if not Path(path).exists():
+            logger.warning(f"Missing worker report {path}")
+            continue
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for suite in suites:
+            merged.append(suite)
+            for key in ("tests", "failures", "errors", "skipped"):
+                totals[key] += int(suite.get(key, 0))
+            totals["time"] = max(totals["time"], float(suite.get("time", 0)))
+
+    for key, value in totals.items():
+        merged.set(key, f"{value:.3f}" if key == "time" else str(value))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(merged).write(output, encoding="utf-8", xml_declaration=True)
+    return totals
+
+
+def run(
+    pytest_args: Sequence[str],
+    workers: Optional[int] = None,
+    shard_by: str = "module",
+    junitxml: str = "report.xml",
+    output_dir: Optional[str] = None,
+    durations_path: Optional[str] = TEST_DURATIONS_PATH,
+) -> int:
+    """
+    Collect, shard by recorded durations, run and merge
+
+    Returns:
+        Exit code: 0 if every worker passed, else the first failing code
+    """
+    workers = workers or os.cpu_count() or 1
+    node_ids = collect(pytest_args)
+    if not node_ids:
+        logger.warning("No tests collected")
+        return 5
+
+    history = DurationHistory(durations_path)
+    history.load()
+    shards = shard(node_ids, workers, shard_by, history)
+    total = sum(history.estimate(node_id) for node_id in node_ids)
+    logger.info(
+        f"Running {len(node_ids)} tests on {len(shards)} workers by {shard_by}, "
+        f"estimated makespan {makespan(shards, history):.1f}s "
+        f"(ideal {total / len(shards):.1f}s)"
+    )
+    directory = Path(output_dir or tempfile.mkdtemp(prefix="parallel-"))
+    results = run_workers(shards, pytest_args, directory)
+    merge_durations(directory, history)
+    merge_wait_history(directory, TimeoutHistory(WAIT_HISTORY_PATH))
+    merge_route_sizes(directory, RoutingStats(ROUTE_SIZES_PATH))
+
+    for result in results:
+        logger.info(
+            f"Worker {result.worker_id}: {result.tests} tests, exit "
+            f"{result.returncode} in {result.duration:.1f}s (log {result.log_path})"
+        )
+    totals = merge_junit([result.junit_path for result in results], Path(junitxml))
+    logger.info(f"Merged report {junitxml}: {totals}")
+
+    codes = [result.returncode for result in results]
+    failed = [code for code in codes if code not in (0, 5)]
+    return failed[0] if failed else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--workers", type=int, default=None)
+    parser.add_argument("--shard-by", choices=SHARD_MODES, default="module")
+    parser.add_argument("--junitxml", default="report.xml")
+    parser.add_argument("--output-dir", default=None)
+    parser.add_argument("--durations-path", default=TEST_DURATIONS_PATH)
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    pytest_args = args.pytest_args
+    if pytest_args[:1] == ["--"]:
+        pytest_args = pytest_args[1:]
+    return run(
+        pytest_args,
+        args.workers,
+        args.shard_by,
+        args.junitxml,
+        args.output_dir,
+        args.durations_path,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import io
+import re
+from collections import deque
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from framework.logger import log_waning, setup_logger
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+    log_waning("Pillow not installed, recorded frames are kept full size as PNG")
+
+
+class FrameRecorder:
+    """Ring buffer of the last frames of a test, kept in memory
+
+    Frames are taken after each top-level log_action step (use on_step as a
+    step listener) and written to disk only via dump(), i.e. when a test
+    failed.
+    """
+
+    def __init__(
+        self,
+        capture: Callable[[], bytes],
+        max_frames: int = 10,
+        max_width: int = 640,
+        quality: int = 50,
+    ):
+        """
+        Args:
+            capture: Returns a PNG of the current page
+            max_frames: Frames kept, older frames are dropped
+            max_width: Frames are downscaled to this width (needs Pillow)
+            quality: JPEG quality of stored frames (needs Pillow)
+        """
+        self._capture = capture
+        self.max_width = max_width
+        self.quality = quality
+        self.frames: deque = deque(maxlen=max_frames)
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def _shrink(self, png: bytes) -> Tuple[bytes, str]:
+        """Downscale and JPEG-encode a frame, return (bytes, extension)"""
+        if Image is None:
+            return png, "png"
+        image = Image.open(io.BytesIO(png)).convert("RGB")
+        image.thumbnail((self.max_width, self.max_width * 4))
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=self.quality)
+        return output.getvalue(), "jpg"
+
+    def record(self, label: str = "frame"):
+        """Capture current page into the buffer"""
+        try:
+            data, extension = self._shrink(self._capture())
+        except Exception as e:
+            self._logger.warning(f"Failed to record frame after {label}: {e}")
+            return
+        self.frames.append((label, data, extension))
+
+    def on_step(self, owner, action_name: str, error: Optional[BaseException]):
+        """Step listener recording a frame after each top-level step"""
+        label = f"{owner.__class__.__name__}.{action_name}"
+        if error is not None:
+            label += " (failed)"
+        self.record(label)
+
+    def clear(self):
+        """Drop buffered frames"""
+        self.frames.clear()
+
+    def dump(self, directory) -> List[Path]:
+        """
+        Write buffered frames to directory
+
+        Every frame is written as a numbered file; with Pillow an animated
+        strip.gif of all frames is added.
+
+        Returns:
+            Written paths
+        """
+        if not self.frames:
+            return []
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        written = []
+        for index, (label, data, extension) in enumerate(self.frames):
+            safe_label = re.sub(r"[^\w.-]+", "_", label).strip("_")
+            path = directory / f"{index:03d}_{safe_label}.{extension}"
+            path.write_bytes(data)
+            written.append(path)
+
+        if Image is not None:
+            images = [Image.open(io.BytesIO(data)) for _, data, _ in self.frames]
+            strip = directory / "strip.gif"
+            images[0].save(
+                strip,
+                save_all=True,
+                append_images=images[1:],
+                duration=800,
+                loop=0,
+            )
+            written.append(strip)
+        return written
@@ -0,0 +1,224 @@
+import base64
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+from framework.logger import log_waning, setup_logger
+
+ROUTING_PROFILE = os.getenv("ROUTING_PROFILE", "full")
+ROUTE_SIZES_PATH = os.getenv("ROUTE_SIZES_PATH", ".route_sizes.json")
+# Set by framework.parallel: workers save learned sizes here for merging
+ROUTE_SIZES_REPORT = os.getenv("ROUTE_SIZES_REPORT")
+
+# 1x1 transparent PNG served instead of images
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kg"
+    "AAAABJRU5ErkJggg=="
+)
+
+BEACON_PATTERNS = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"connect\.facebook\.net",
+    r"/logging_client_events",
+    r"/ajax/bz",
+    r"/beacon",
+)
+
+# Selenium (CDP Network.setBlockedURLs) matches URL wildcards, not types
+_TYPE_URL_PATTERNS = {
+    "font": ("*.woff*", "*.ttf*", "*.otf*", "*.eot*"),
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"),
+    "media": ("*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*", "*.ogg*"),
+}
+
+
+@dataclass(frozen=True)
+class RoutingProfile:
+    """Which requests to abort or answer with a stub
+
+    Resource types are Playwright's request.resource_type values ("font",
+    "image", "media", ...), patterns are regular expressions on the URL.
+    """
+
+    name: str
+    abort_types: FrozenSet[str] = frozenset()
+    stub_types: FrozenSet[str] = frozenset()
+    abort_patterns: Tuple[str, ...] = ()
+
+    def action_for(self, url: str, resource_type: str) -> Optional[str]:
+        """Get "abort", "stub" or None (let request through)"""
+        if resource_type in self.abort_types:
+            return "abort"
+        if any(re.search(pattern, url) for pattern in self.abort_patterns):
+            return "abort"
+        if resource_type in self.stub_types:
+            return "stub"
+        return None
+
+    @property
+    def passthrough(self) -> bool:
+        return not (self.abort_types or self.stub_types or self.abort_patterns)
+
+
+PROFILES: Dict[str, RoutingProfile] = {
+    "full": RoutingProfile("full"),
+    "visual": RoutingProfile("visual", abort_patterns=BEACON_PATTERNS),
+    "functional": RoutingProfile(
+        "functional",
+        abort_types=frozenset({"font", "media"}),
+        stub_types=frozenset({"image"}),
+        abort_patterns=BEACON_PATTERNS,
+    ),
+}
+
+
+def get_profile(name: str) -> RoutingProfile:
+    """Get routing profile by name"""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown routing profile {name!r}, expected one of {sorted(PROFILES)}"
+        ) from None
+
+
+@dataclass
+class RoutingStats:
+    """Blocked/stubbed request counters and the bytes they would have cost
+
+    Response sizes are learned from Content-Length of requests that were let
+    through (persisted in path), so bytes_saved only counts URLs seen before:
+    runs under the default "full" profile learn the sizes that blocking runs
+    report as saved.
+    """
+
+    path: Optional[Path] = None
+    blocked: int = 0
+    stubbed: int = 0
+    bytes_saved: int = 0
+    unknown_size: int = 0
+    sizes: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._learned = False
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def record_skipped(self, url: str, action: str):
+        """Count aborted or stubbed request"""
+        with self._lock:
+            if action == "abort":
+                self.blocked += 1
+            else:
+                self.stubbed += 1
+            size = self.sizes.get(url)
+            if size is None:
+                self.unknown_size += 1
+            else:
+                self.bytes_saved += size
+
+    def record_size(self, url: str, size: int):
+        """Remember response size of a request that went through"""
+        with self._lock:
+            if self.sizes.get(url) != size:
+                self.sizes[url] = size
+                self._learned = True
+
+    def on_response(self, response):
+        """Response listener learning sizes from Content-Length"""
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.record_size(response.url, int(length))
+
+    def summary(self) -> str:
+        summary = (
+            f"blocked {self.blocked}, stubbed {self.stubbed} requests, "
+            f"saved {self.bytes_saved / 1024:.1f} KiB"
+        )
+        if self.unknown_size:
+            summary += (
+                f" ({self.unknown_size} of unknown size, "
+                "run once with ROUTING_PROFILE=full to learn them)"
+            )
+        return summary
+
+    def load(self):
+        """Load learned sizes"""
+        if not self.path or not Path(self.path).exists():
+            return
+        try:
+            self.sizes.update(json.loads(Path(self.path).read_text()))
+        except (OSError, ValueError) as e:
+            self._logger.warning(f"Failed to load route sizes {self.path}: {e}")
+
+    def save(self, path: Optional[Path] = None):
+        """Persist learned sizes to path (default self.path), if any are new"""
+        path = path or self.path
+        if not path or not self._learned:
+            return
+        path = Path(path)
+        with self._lock:
+            data = dict(self.sizes)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(data))
+            tmp.replace(path)
+        except OSError as e:
+            self._logger.warning(f"Failed to save route sizes {path}: {e}")
+
+
+def apply_routing(
+    target, profile: RoutingProfile, stats: Optional[RoutingStats] = None
+):
+    """
+    Route requests of a Playwright Page or BrowserContext through profile
+
+    Requests the profile does not handle fall back to earlier routes (e.g. a
+    HAR replay) or the network.
+    """
+    if stats is not None:
+        target.on("response", stats.on_response)
+    if profile.passthrough:
+        return
+
+    def handle(route):
+        request = route.request
+        action = profile.action_for(request.url, request.resource_type)
+        if action is None:
+            route.fallback()
+            return
+        if stats is not None:
+            stats.record_skipped(request.url, action)
+        if action == "abort":
+            route.abort("blockedbyclient")
+        else:
+            route.fulfill(status=200, content_type="image/png", body=PIXEL_PNG)
+
+    target.route("**/*", handle)
+
+
+def apply_selenium_routing(driver, profile: RoutingProfile):
+    """
+    Block profile's requests on a Chromium Selenium driver via CDP
+
+    CDP blocking works on URL wildcards only: resource types map to file
+    extensions, stub types are blocked as well, and no stats are collected.
+    """
+    if profile.passthrough:
+        return
+    if not hasattr(driver, "execute_cdp_cmd"):
+        log_waning(f"Routing profile {profile.name} needs a Chromium driver")
+        return
+
+    urls = []
+    for resource_type in profile.abort_types | profile.stub_types:
+        urls.extend(_TYPE_URL_PATTERNS.get(resource_type, ()))
+    for pattern in profile.abort_patterns:
+        urls.append("*" + pattern.replace("\\", "") + "*")
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
@@ -1,10 +1,194 @@
+import io
+import os
+import queue
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from functools import reduce
+from pathlib import Path
+from typing import List, Optional
+from framework.logger import log_waning, setup_logger
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+    log_waning("Pillow not installed, JPEG/WebP screenshots will be saved as PNG")
+
+
+@dataclass
+class ScreenshotOptions:
+    """How screenshots are captured and stored"""
+
+    clip_to_element: bool = os.getenv("SCREENSHOT_CLIP", "false").lower() == "true"
+    quality: int = int(os.getenv("SCREENSHOT_QUALITY", "80"))
+    background: bool = os.getenv("SCREENSHOT_BACKGROUND", "false").lower() == "true"
+
+
+_FORMATS = {".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP"}
+_JPEG_MAGIC = b"\xff\xd8"
+
+
+def playwright_screenshot_options(file_name: str, quality: int = 80) -> dict:
+    """Get Playwright screenshot() options, JPEG is encoded by the browser"""
+    if _FORMATS.get(Path(file_name).suffix.lower()) == "JPEG":
+        return {"type": "jpeg", "quality": quality}
+    return {"type": "png"}
+
+
+def encode_screenshot(png: bytes, file_name: str, quality: int = 80) -> tuple:
+    """
+    Encode PNG bytes for the format given by the file extension
+
+    JPEG bytes (captured natively by Playwright) are kept as they are.
+
+    Returns:
+        Tuple of (bytes, file name); the name gets a .png extension when the
+        requested format cannot be produced
+    """
+    image_format = _FORMATS.get(Path(file_name).suffix.lower())
+    if image_format is None:
+        return png, file_name
+    if image_format == "JPEG" and png.startswith(_JPEG_MAGIC):
+        return png, file_name
+    if Image is None:
+        png_name = str(Path(file_name).with_suffix(".png"))
+        log_waning(f"Pillow not installed, saving {file_name} as {png_name}")
+        return png, png_name
+
+    image = Image.open(io.BytesIO(png))
+    if image_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    output = io.BytesIO()
+    image.save(output, format=image_format, quality=quality)
+    return output.getvalue(), file_name
+
+
+def write_screenshot(png: bytes, file_name: str, quality: int = 80) -> str:
+    """Encode and write screenshot, return the written path"""
+    data, file_name = encode_screenshot(png, file_name, quality)
+    path = Path(file_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return file_name
+
+
+class ScreenshotWriter:
+    """Encodes and writes screenshots on a worker thread
+
+    submit() blocks when max_pending screenshots are already queued, so a
+    failure storm cannot grow memory without bound. flush() re-raises the
+    first error the worker hit since the previous flush.
+    """
+
+    _STOP = object()
+
+    def __init__(self, max_pending: int = 16):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._errors: List[Exception] = []
+        self._logger = setup_logger(self.__class__.__name__)
+        self._thread = threading.Thread(
+            target=self._run, name="ScreenshotWriter", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is self._STOP:
+                    return
+                png, file_name, quality = item
+                write_screenshot(png, file_name, quality)
+            except Exception as e:
+                self._logger.error(f"Failed to write screenshot: {e}")
+                self._errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, png: bytes, file_name: str, quality: int = 80):
+        """Queue screenshot for encoding and writing"""
+        self._queue.put((png, file_name, quality))
+
+    def flush(self):
+        """Wait until all queued screenshots are written, raise a write error"""
+        self._queue.join()
+        errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        """Flush and stop the worker thread"""
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+
+_writer: Optional[ScreenshotWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_screenshot_writer() -> ScreenshotWriter:
+    """Get shared background writer"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ScreenshotWriter()
+    return _writer
+
+
+def flush_screenshots():
+    """Wait for pending background screenshots, call at session end
+
+    Raises:
+        The first error hit while writing them
+    """
+    if _writer is not None:
+        _writer.flush()
+
+
+# Outline elements and remember their previous style attribute so RESTORE_JS
+# can put the DOM back exactly before anything else inspects it
+HIGHLIGHT_JS = """(elements) => {
+    const highlighted = (window.__pomHighlighted = window.__pomHighlighted || []);
+    for (const el of elements) {
+        if (!el || !el.style) {
+            continue;
+        }
+        highlighted.push([el, el.getAttribute("style")]);
+        el.style.setProperty("border", "3px solid red", "important");
+    }
+    const first = elements.find((el) => el && el.scrollIntoView);
+    if (first) {
+        first.scrollIntoView({block: "center", inline: "nearest"});
+    }
+    return highlighted.length;
+}"""
+
+RESTORE_JS = """() => {
+    const highlighted = window.__pomHighlighted || [];
+    for (const [el, style] of highlighted.reverse()) {
+        if (style === null) {
+            el.removeAttribute("style");
+        } else {
+            el.setAttribute("style", style);
+        }
+    }
+    window.__pomHighlighted = [];
+    return highlighted.length;
+}"""
 
 
 class BaseScreenshotManager(ABC):
     """Abstract screenshot manager interface"""
 
+    def __init__(self, options: Optional[ScreenshotOptions] = None):
+        self.options = options or ScreenshotOptions()
+
+    @abstractmethod
+    def capture(self, element=None) -> bytes:
+        """Capture PNG of the page, or of element's bounding box if given"""
+        pass
+
     @abstractmethod
     def highlight_and_screenshot(self, element, file_name: str = "element.png"):
         pass
@@ -15,54 +199,141 @@ class BaseScreenshotManager(ABC):
     ):
         pass
 
+    def save(self, png: bytes, file_name: str):
+        """Store screenshot synchronously, or in the background if enabled"""
+        if self.options.background:
+            get_screenshot_writer().submit(png, file_name, self.options.quality)
+        else:
+            write_screenshot(png, file_name, self.options.quality)
+
 
 class SeleniumScreenshotManager(BaseScreenshotManager):
     """Selenium screenshot implementation"""
 
-    def __init__(self, driver):
+    def __init__(self, driver, options: Optional[ScreenshotOptions] = None):
+        super().__init__(options)
         self.driver = driver
 
+    def capture(self, element=None) -> bytes:
+        """Capture PNG of the page, or of element's bounding box if given"""
+        if element is not None:
+            return element.screenshot_as_png
+        return self.driver.get_screenshot_as_png()
+
     def highlight_and_screenshot(self, element, file_name: str = "element.png"):
         """Highlight element with red border and take screenshot"""
-        self.driver.execute_script("arguments[0].scrollIntoView();", element)
-        self.driver.execute_script("arguments[0].style.border='3px solid red'", element)
-        self.driver.save_screenshot(file_name)
+        clip = element if self.options.clip_to_element else None
+        self.highlighted_screenshot([element], file_name, clip)
 
     def highlight_and_screenshot_many(
         self, elements: List, file_name: str = "elements.png"
     ):
         """Highlight multiple elements and take screenshot"""
-        for element in elements:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            self.driver.execute_script(
-                "arguments[0].style.border='3px solid red'", element
-            )
-        self.driver.save_screenshot(file_name)
+        self.highlighted_screenshot(list(elements), file_name)
+
+    def highlighted_screenshot(self, elements: List, file_name: str, clip=None):
+        """Highlight elements in one script call, capture, then restore them"""
+        self.driver.execute_script(f"return ({HIGHLIGHT_JS})(arguments[0])", elements)
+        try:
+            png = self.capture(clip)
+        finally:
+            self.driver.execute_script(f"return ({RESTORE_JS})()")
+        self.save(png, file_name)
 
 
 class PlaywrightScreenshotManager(BaseScreenshotManager):
     """Playwright screenshot implementation"""
 
-    def __init__(self, page):
+    def __init__(self, page, options: Optional[ScreenshotOptions] = None):
+        super().__init__(options)
         self.page = page
 
+    def capture(self, element=None) -> bytes:
+        """Capture PNG of the page, or of element's bounding box if given"""
+        if element is not None:
+            return element.screenshot(type="png")
+        return self.page.screenshot(type="png")
+
+    def _screenshot(self, element, file_name: str) -> bytes:
+        target = self.page if element is None else element
+        return target.screenshot(
+            **playwright_screenshot_options(file_name, self.options.quality)
+        )
+
     def highlight_and_screenshot(self, locator, file_name: str = "element.png"):
         """Highlight element with red border and take screenshot"""
-        self.page.evaluate("elem => elem.scrollIntoView()", locator.element_handle())
-        self.page.evaluate(
-            "elem => elem.style.border='3px solid red'", locator.element_handle()
-        )
-        self.page.screenshot(path=file_name)
+        locator = locator.first
+        clip = locator if self.options.clip_to_element else None
+        self.highlighted_screenshot(locator, file_name, clip)
 
     def highlight_and_screenshot_many(
-        self, locators: List, file_name: str = "elements.png"
+        self, locators, file_name: str = "elements.png"
+    ):
+        """
+        Highlight multiple elements and take screenshot
+
+        Args:
+            locators: Locator matching all elements (e.g. a ManyWebElements
+                base locator) or a list of Locators, combined into one with or_()
+        """
+        if isinstance(locators, (list, tuple)):
+            if not locators:
+                self.save(self._screenshot(None, file_name), file_name)
+                return
+            locators = reduce(lambda left, right: left.or_(right), locators)
+        self.highlighted_screenshot(locators, file_name)
+
+    def highlighted_screenshot(self, locator, file_name: str, clip=None):
+        """Highlight all matches in one evaluate call, capture, then restore them"""
+        locator.evaluate_all(HIGHLIGHT_JS)
+        try:
+            data = self._screenshot(clip, file_name)
+        finally:
+            self.page.evaluate(RESTORE_JS)
+        self.save(data, file_name)
+
+
+class AsyncPlaywrightScreenshotManager(BaseScreenshotManager):
+    """Playwright async API screenshot implementation"""
+
+    def __init__(self, page, options: Optional[ScreenshotOptions] = None):
+        super().__init__(options)
+        self.page = page
+
+    async def capture(self, element=None) -> bytes:
+        """Capture PNG of the page, or of element's bounding box if given"""
+        if element is not None:
+            return await element.screenshot(type="png")
+        return await self.page.screenshot(type="png")
+
+    async def _screenshot(self, element, file_name: str) -> bytes:
+        target = self.page if element is None else element
+        return await target.screenshot(
+            **playwright_screenshot_options(file_name, self.options.quality)
+        )
+
+    async def highlight_and_screenshot(self, locator, file_name: str = "element.png"):
+        """Highlight element with red border and take screenshot"""
+        locator = locator.first
+        clip = locator if self.options.clip_to_element else None
+        await self.highlighted_screenshot(locator, file_name, clip)
+
+    async def highlight_and_screenshot_many(
+        self, locators, file_name: str = "elements.png"
     ):
         """Highlight multiple elements and take screenshot"""
-        for locator in locators:
-            self.page.evaluate(
-                "elem => elem.scrollIntoView()", locator.element_handle()
-            )
-            self.page.evaluate(
-                "elem => elem.style.border='3px solid red'", locator.element_handle()
-            )
-        self.page.screenshot(path=file_name)
+        if isinstance(locators, (list, tuple)):
+            if not locators:
+                self.save(await self._screenshot(None, file_name), file_name)
+                return
+            locators = reduce(lambda left, right: left.or_(right), locators)
+        await self.highlighted_screenshot(locators, file_name)
+
+    async def highlighted_screenshot(self, locator, file_name: str, clip=None):
+        """Highlight all matches in one evaluate call, capture, then restore them"""
+        await locator.evaluate_all(HIGHLIGHT_JS)
+        try:
+            data = await self._screenshot(clip, file_name)
+        finally:
+            await self.page.evaluate(RESTORE_JS)
+        self.save(data, file_name)
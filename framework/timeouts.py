@@ -0,0 +1,145 @@
+import atexit
+import json
+import math
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+from framework.logger import setup_logger
+
+ADAPTIVE_TIMEOUTS = os.getenv("ADAPTIVE_TIMEOUTS", "false").lower() == "true"
+WAIT_HISTORY_PATH = os.getenv("WAIT_HISTORY_PATH", ".wait_history.json")
+# Set by framework.parallel: workers report new samples here instead of saving
+WAIT_HISTORY_REPORT = os.getenv("WAIT_HISTORY_REPORT")
+ADAPTIVE_TIMEOUT_CAP = os.getenv("ADAPTIVE_TIMEOUT_CAP")
+
+
+class TimeoutHistory:
+    """Observed wait durations per locator and the timeouts derived from them
+
+    Timeout for a locator is percentile(durations) * safety_factor, clamped to
+    [floor, cap]. Locators with fewer than min_samples fall back to the default
+    timeout, overrides always win.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        percentile: float = 0.99,
+        safety_factor: float = 3.0,
+        floor: int = 250,
+        cap: Optional[int] = None,
+        min_samples: int = 20,
+        max_samples: int = 200,
+        overrides: Optional[Dict[str, int]] = None,
+    ):
+        self.path = Path(path) if path else None
+        self.percentile = percentile
+        self.safety_factor = safety_factor
+        self.floor = floor
+        self.cap = cap
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.overrides = dict(overrides or {})
+        self._samples: Dict[str, deque] = {}
+        self._new: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def record(self, key: str, duration_ms: float):
+        """Record a successful wait duration in milliseconds"""
+        with self._lock:
+            self._append(key, [duration_ms])
+            self._new.setdefault(key, []).append(duration_ms)
+
+    def extend(self, samples: Dict[str, List[float]]):
+        """Add durations recorded elsewhere, e.g. by a parallel worker"""
+        with self._lock:
+            for key, durations in samples.items():
+                self._append(key, durations)
+
+    def _append(self, key: str, durations: List[float]):
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.max_samples)
+        samples.extend(durations)
+
+    def set_override(self, key: str, timeout: int):
+        """Use a fixed timeout for a locator"""
+        self.overrides[key] = timeout
+
+    def timeout_for(self, key: str, default: int) -> int:
+        """Get timeout in milliseconds for a locator"""
+        if key in self.overrides:
+            return self.overrides[key]
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return default
+
+        rank = max(math.ceil(self.percentile * len(samples)) - 1, 0)
+        timeout = max(int(samples[rank] * self.safety_factor), self.floor)
+        cap = self.cap if self.cap is not None else default
+        return min(timeout, cap)
+
+    def load(self):
+        """Load recorded durations from path"""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            self._logger.warning(f"Failed to load wait history {self.path}: {e}")
+            return
+        with self._lock:
+            for key, samples in data.items():
+                self._samples[key] = deque(samples, maxlen=self.max_samples)
+
+    def save(self):
+        """Save recorded durations to path"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {key: list(samples) for key, samples in self._samples.items()}
+        self._write(self.path, data)
+
+    def save_report(self, path: str):
+        """Save only durations recorded by this process, for merging later"""
+        with self._lock:
+            data = {key: list(samples) for key, samples in self._new.items()}
+        if data:
+            self._write(Path(path), data)
+
+    def _write(self, path: Path, data: dict):
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(data))
+            tmp.replace(path)
+        except OSError as e:
+            self._logger.warning(f"Failed to save wait history {path}: {e}")
+
+
+_history: Optional[TimeoutHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_timeout_history() -> Optional[TimeoutHistory]:
+    """Get shared history, None unless ADAPTIVE_TIMEOUTS=true"""
+    global _history
+    if not ADAPTIVE_TIMEOUTS:
+        return None
+    with _history_lock:
+        if _history is None:
+            cap = int(ADAPTIVE_TIMEOUT_CAP) if ADAPTIVE_TIMEOUT_CAP else None
+            _history = TimeoutHistory(WAIT_HISTORY_PATH, cap=cap)
+            _history.load()
+            atexit.register(_save_history, _history)
+    return _history
+
+
+def _save_history(history: TimeoutHistory):
+    if WAIT_HISTORY_REPORT:
+        history.save_report(WAIT_HISTORY_REPORT)
+    else:
+        history.save()
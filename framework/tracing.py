@@ -0,0 +1,126 @@
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_current_span: ContextVar = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """Timed step with a link to the step that called it"""
+
+    name: str
+    span_id: int
+    parent: Optional["Span"]
+    thread_id: int
+    start_ns: int
+    end_ns: int = 0
+    error: Optional[str] = None
+    token: object = field(default=None, repr=False)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    def stack(self) -> List[str]:
+        """Names from the root span down to this one"""
+        names = []
+        span = self
+        while span is not None:
+            names.append(span.name)
+            span = span.parent
+        return names[::-1]
+
+
+class Tracer:
+    """Records nested spans of log_action steps"""
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start(self, name: str) -> Span:
+        """Open a span as child of the current one"""
+        span = Span(
+            name=name,
+            span_id=next(self._ids),
+            parent=_current_span.get(),
+            thread_id=threading.get_ident(),
+            start_ns=time.perf_counter_ns(),
+        )
+        span.token = _current_span.set(span)
+        return span
+
+    def finish(self, span: Span):
+        """Close span and make its parent current again"""
+        span.end_ns = time.perf_counter_ns()
+        _current_span.reset(span.token)
+        span.token = None
+        with self._lock:
+            self.spans.append(span)
+
+    def reset(self):
+        """Drop recorded spans"""
+        with self._lock:
+            self.spans = []
+
+    def chrome_trace(self) -> dict:
+        """Spans as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        with self._lock:
+            spans = list(self.spans)
+        origin = min((span.start_ns for span in spans), default=0)
+        events = []
+        for span in spans:
+            event = {
+                "name": span.name,
+                "cat": "action",
+                "ph": "X",
+                "ts": (span.start_ns - origin) / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": os.getpid(),
+                "tid": span.thread_id,
+                "args": {"id": span.span_id},
+            }
+            if span.parent is not None:
+                event["args"]["parent"] = span.parent.span_id
+            if span.error:
+                event["args"]["error"] = span.error
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def collapsed_stacks(self) -> Dict[str, int]:
+        """Self time in microseconds per stack, for flamegraph tools"""
+        with self._lock:
+            spans = list(self.spans)
+        child_time: Dict[int, int] = defaultdict(int)
+        for span in spans:
+            if span.parent is not None:
+                child_time[span.parent.span_id] += span.duration_ns
+
+        stacks: Dict[str, int] = defaultdict(int)
+        for span in spans:
+            self_ns = max(span.duration_ns - child_time[span.span_id], 0)
+            key = ";".join(name.replace(";", ",") for name in span.stack())
+            stacks[key] += self_ns // 1000
+        return dict(stacks)
+
+    def export_chrome_trace(self, path):
+        """Write Chrome trace-event JSON file"""
+        Path(path).write_text(json.dumps(self.chrome_trace()))
+
+    def export_collapsed(self, path):
+        """Write collapsed-stack file (flamegraph.pl, speedscope, inferno)"""
+        lines = [f"{stack} {value}" for stack, value in self.collapsed_stacks().items()]
+        Path(path).write_text("\n".join(lines) + "\n")
+
+
+tracer = Tracer()
@@ -0,0 +1,247 @@
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+from framework.logger import log_waning, setup_logger
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    log_waning("NumPy or Pillow not installed, visual comparison will not work")
+
+VISUAL_BASELINE_DIR = os.getenv("VISUAL_BASELINE_DIR", "baselines")
+VISUAL_UPDATE = os.getenv("VISUAL_UPDATE", "false").lower() == "true"
+# Record missing baselines instead of failing; off by default under CI
+VISUAL_RECORD_MISSING = (
+    os.getenv("VISUAL_RECORD_MISSING", "false" if os.getenv("CI") else "true").lower()
+    == "true"
+)
+
+# (x, y, width, height) in screenshot pixels
+Region = Tuple[int, int, int, int]
+
+
+@dataclass
+class VisualDiff:
+    """Result of comparing a screenshot with its baseline"""
+
+    name: str
+    matched: bool
+    diff_ratio: float = 0.0
+    diff_pixels: int = 0
+    hash_distance: int = 0
+    fast_path: bool = False
+    recorded: bool = False
+    missing: bool = False
+    diff_path: Optional[Path] = None
+
+
+def load_image(source: Union[bytes, str, Path]) -> "np.ndarray":
+    """Decode PNG/JPEG bytes or file into an RGB uint8 array"""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def ignore_mask(shape: Tuple[int, ...], ignore: Sequence[Region] = ()) -> "np.ndarray":
+    """Boolean mask of compared pixels, False inside ignored regions"""
+    mask = np.ones(shape[:2], dtype=bool)
+    for x, y, width, height in ignore:
+        mask[max(y, 0) : y + height, max(x, 0) : x + width] = False
+    return mask
+
+
+def perceptual_hash(pixels: "np.ndarray", hash_size: int = 16) -> "np.ndarray":
+    """
+    Difference hash: sign of horizontal gradients of a downscaled grayscale
+
+    Returns:
+        Flat boolean array of hash_size * hash_size bits
+    """
+    gray = Image.fromarray(pixels).convert("L")
+    small = np.asarray(
+        gray.resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR),
+        dtype=np.int16,
+    )
+    return (small[:, 1:] > small[:, :-1]).ravel()
+
+
+def pixel_diff(
+    actual: "np.ndarray",
+    expected: "np.ndarray",
+    mask: Optional["np.ndarray"] = None,
+    pixel_threshold: int = 16,
+) -> "np.ndarray":
+    """Boolean map of pixels whose largest channel delta exceeds threshold"""
+    delta = np.abs(actual.astype(np.int16) - expected.astype(np.int16)).max(axis=2)
+    changed = delta > pixel_threshold
+    if mask is not None:
+        changed &= mask
+    return changed
+
+
+class VisualBaseline:
+    """Compare screenshots with baselines stored as PNG files
+
+    With update=True baselines are recorded from the screenshot instead of
+    compared, as are missing ones with record_missing=True; otherwise a missing
+    baseline is a mismatch. Decoded baselines and their hashes are kept in
+    memory, so repeated comparisons only decode the new screenshot.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = VISUAL_BASELINE_DIR,
+        tolerance: float = 0.001,
+        pixel_threshold: int = 16,
+        hash_size: int = 16,
+        update: bool = VISUAL_UPDATE,
+        record_missing: bool = VISUAL_RECORD_MISSING,
+        hash_fast_path: bool = False,
+    ):
+        """
+        Args:
+            directory: Where <name>.png baselines and <name>.diff.png live
+            tolerance: Allowed share of changed pixels (0.001 = 0.1%)
+            pixel_threshold: Channel delta below which a pixel is unchanged
+            hash_size: Side of the perceptual hash grid
+            update: Overwrite baselines with new screenshots
+            record_missing: Record missing baselines instead of failing
+            hash_fast_path: Treat equal perceptual hashes as a match and skip
+                the pixel diff; changes smaller than one hash cell can pass.
+                Identical screenshots skip the pixel diff either way
+        """
+        self.directory = Path(directory)
+        self.tolerance = tolerance
+        self.pixel_threshold = pixel_threshold
+        self.hash_size = hash_size
+        self.update = update
+        self.record_missing = record_missing
+        self.hash_fast_path = hash_fast_path
+        self._baselines: Dict[str, Tuple["np.ndarray", "np.ndarray"]] = {}
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def baseline_path(self, name: str) -> Path:
+        """Get baseline file path for name"""
+        return self.directory / f"{name}.png"
+
+    def _masked(self, pixels: "np.ndarray", mask: "np.ndarray") -> "np.ndarray":
+        if mask.all():
+            return pixels
+        masked = pixels.copy()
+        masked[~mask] = 0
+        return masked
+
+    def _baseline(self, name: str, ignore: Sequence[Region]):
+        """Get decoded baseline and its hash, None if not recorded"""
+        key = f"{name}:{tuple(ignore)}"
+        cached = self._baselines.get(key)
+        if cached is not None:
+            return cached
+        path = self.baseline_path(name)
+        if not path.exists():
+            return None
+        pixels = load_image(path)
+        mask = ignore_mask(pixels.shape, ignore)
+        cached = (pixels, perceptual_hash(self._masked(pixels, mask), self.hash_size))
+        self._baselines[key] = cached
+        return cached
+
+    def record(self, name: str, screenshot: Union[bytes, str, Path]) -> Path:
+        """Store screenshot as baseline"""
+        pixels = load_image(screenshot)
+        path = self.baseline_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(pixels).save(path, format="PNG")
+        self._baselines = {
+            key: value
+            for key, value in self._baselines.items()
+            if not key.startswith(f"{name}:")
+        }
+        return path
+
+    def compare(
+        self,
+        name: str,
+        screenshot: Union[bytes, str, Path],
+        ignore: Sequence[Region] = (),
+    ) -> VisualDiff:
+        """
+        Compare screenshot with the baseline called name
+
+        Args:
+            name: Baseline name, e.g. "login_page"
+            screenshot: PNG/JPEG bytes or image file
+            ignore: Regions excluded from the comparison
+
+        Returns:
+            VisualDiff; a diff image is written next to the baseline on mismatch
+        """
+        baseline = None if self.update else self._baseline(name, ignore)
+        if baseline is None and not (self.update or self.record_missing):
+            path = self.baseline_path(name)
+            self._logger.warning(f"Visual {name}: no baseline at {path}")
+            return VisualDiff(name, matched=False, diff_ratio=1.0, missing=True)
+        if baseline is None:
+            self.record(name, screenshot)
+            self._logger.info(f"Recorded visual baseline {name}")
+            return VisualDiff(name, matched=True, recorded=True)
+
+        expected, expected_hash = baseline
+        actual = load_image(screenshot)
+        if actual.shape != expected.shape:
+            self._logger.warning(
+                f"Visual {name}: size {actual.shape[1]}x{actual.shape[0]} "
+                f"differs from baseline {expected.shape[1]}x{expected.shape[0]}"
+            )
+            return VisualDiff(name, matched=False, diff_ratio=1.0)
+        if np.array_equal(actual, expected):
+            return VisualDiff(name, matched=True, fast_path=True)
+
+        mask = ignore_mask(actual.shape, ignore)
+        actual_hash = perceptual_hash(self._masked(actual, mask), self.hash_size)
+        hash_distance = int(np.count_nonzero(actual_hash != expected_hash))
+        if hash_distance == 0 and self.hash_fast_path:
+            return VisualDiff(name, matched=True, fast_path=True)
+
+        changed = pixel_diff(actual, expected, mask, self.pixel_threshold)
+        diff_pixels = int(np.count_nonzero(changed))
+        compared = int(np.count_nonzero(mask)) or 1
+        diff_ratio = diff_pixels / compared
+        result = VisualDiff(
+            name,
+            matched=diff_ratio <= self.tolerance,
+            diff_ratio=diff_ratio,
+            diff_pixels=diff_pixels,
+            hash_distance=hash_distance,
+        )
+        if not result.matched:
+            result.diff_path = self._write_diff(name, actual, changed)
+            self._logger.warning(
+                f"Visual {name}: {diff_pixels} pixels ({diff_ratio:.2%}) differ"
+            )
+        return result
+
+    def _write_diff(
+        self, name: str, actual: "np.ndarray", changed: "np.ndarray"
+    ) -> Path:
+        """Write screenshot dimmed with changed pixels in red"""
+        overlay = (actual // 3).astype(np.uint8)
+        overlay[changed] = (255, 0, 0)
+        path = self.directory / f"{name}.diff.png"
+        Image.fromarray(overlay).save(path, format="PNG")
+        return path
+
+
+_visual: Optional[VisualBaseline] = None
+
+
+def get_visual_baseline() -> VisualBaseline:
+    """Get shared baseline store in VISUAL_BASELINE_DIR"""
+    global _visual
+    if _visual is None:
+        _visual = VisualBaseline()
+    return _visual
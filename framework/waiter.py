@@ -1,5 +1,14 @@
-from typing import Optional, Any
+import asyncio
+import inspect
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Any, Callable
+from framework import dom
+from framework.locator import Locator, LocatorType, DriverType
 from framework.logger import setup_logger, log_waning
+from framework.timeouts import TimeoutHistory, get_timeout_history
 
 try:
     from selenium.webdriver.support.ui import WebDriverWait
@@ -8,26 +17,170 @@ except ImportError:
     log_waning("Selenium not installed, SeleniumWaitManager will not work")
 from playwright.sync_api import expect
 
+try:
+    from playwright.async_api import expect as async_expect
+except ImportError:
+    log_waning(
+        "Playwright async API not available, AsyncPlaywrightWaitManager will not work"
+    )
+
+
+class BaseWaitManager(ABC):
+    """Backend-independent waits used by postconditions"""
+
+    driver_type: DriverType
+    history: Optional[TimeoutHistory] = None
+
+    def _resolve_timeout(self, key: str, timeout: Optional[int]) -> int:
+        """Explicit timeout wins, the default one may be replaced by a learned one"""
+        if timeout is not None and timeout != self.timeout:
+            return max(timeout, 1)
+        if self.history is None:
+            return self.timeout
+        return self.history.timeout_for(key, self.timeout)
+
+    def _timeout_ms(self, timeout: Optional[int]) -> int:
+        """Get timeout in ms, None meaning the default
+
+        An explicit 0 checks once; it becomes 1 as Playwright reads 0 as no limit.
+        """
+        return max(self.timeout if timeout is None else timeout, 1)
+
+    def _record(self, key: str, started: float):
+        """Record duration of a successful wait"""
+        if self.history is not None:
+            self.history.record(key, (time.monotonic() - started) * 1000)
+
+    @property
+    @abstractmethod
+    def browser(self) -> Any:
+        """Selenium WebDriver or Playwright Page"""
+        pass
+
+    @abstractmethod
+    def convert(self, locator: Locator) -> Any:
+        """Convert locator to the format this backend waits on"""
+        pass
+
+    @abstractmethod
+    def current_url(self) -> str:
+        pass
+
+    @abstractmethod
+    def wait_for_url_change(self, old_url: str, timeout: Optional[int] = None) -> bool:
+        pass
+
+    @abstractmethod
+    def wait_for_load(self, timeout: Optional[int] = None) -> bool:
+        pass
 
-class SeleniumWaitManager:
+    def is_loaded(self) -> bool:
+        """Check document is past the loading state"""
+        return (
+            dom.run_script(self.browser, self.driver_type, "() => document.readyState")
+            != "loading"
+        )
+
+    def poll_until(
+        self,
+        predicate: Callable[[], bool],
+        timeout: Optional[int] = None,
+        interval: float = 0.05,
+    ) -> bool:
+        """Poll predicate until it is true or timeout (ms) expires
+
+        Errors, e.g. a script hitting a navigation, count as not yet.
+        """
+        deadline = time.monotonic() + self._timeout_ms(timeout) / 1000
+        while True:
+            try:
+                if predicate():
+                    return True
+            except Exception:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
+    def is_visible_now(self, locator: Locator) -> bool:
+        """Check element visibility in current DOM"""
+        return dom.probe(self.browser, self.driver_type, [locator], "visible")[0]
+
+    def count_now(self, locator: Locator) -> int:
+        """Count matching elements in current DOM"""
+        return dom.count(self.browser, self.driver_type, locator)
+
+    def element_value(self, locator: Locator, expression: str) -> Any:
+        """Evaluate JS expression over `el` on first match"""
+        return dom.element_value(self.browser, self.driver_type, locator, expression)
+
+    def quiet_for(self, reset: bool = False) -> float:
+        """Get milliseconds since the last DOM mutation, reset restarts the count"""
+        return dom.quiet_for(self.browser, self.driver_type, reset)
+
+    def wait_for_value_change(
+        self,
+        locator: Locator,
+        expression: str,
+        previous: Any,
+        timeout: Optional[int] = None,
+    ) -> bool:
+        """Wait until JS expression over first match differs from previous"""
+        try:
+            return dom.wait_for_value_change(
+                self.browser,
+                self.driver_type,
+                locator,
+                expression,
+                previous,
+                self._timeout_ms(timeout),
+            )
+        except Exception as e:
+            self.logger.warning(f"Wait for value change failed: {e}")
+            return False
+
+    def wait_for_dom_settled(
+        self, quiet_ms: int = 300, timeout: Optional[int] = None
+    ) -> bool:
+        """Wait until the DOM has no mutations for quiet_ms"""
+        try:
+            return dom.wait_for_dom_settled(
+                self.browser,
+                self.driver_type,
+                quiet_ms,
+                self._timeout_ms(timeout),
+            )
+        except Exception as e:
+            self.logger.warning(f"Wait for DOM settled failed: {e}")
+            return False
+
+
+class SeleniumWaitManager(BaseWaitManager):
     """Selenium wait implementation"""
 
+    driver_type = DriverType.SELENIUM
+
     def __init__(self, driver, timeout: int = 10000):
         self.driver = driver
         self.timeout = timeout
+        self.history = get_timeout_history()
         self.logger = setup_logger(self.__class__.__name__)
 
     def wait_for_presence(
         self, locator_tuple, timeout: Optional[int] = None
     ) -> Optional[Any]:
         """Wait for element presence"""
+        key = f"presence:{locator_tuple}"
         try:
-            actual_timeout = (timeout or self.timeout) / 1000
+            actual_timeout = self._resolve_timeout(key, timeout) / 1000
+            started = time.monotonic()
             wait = WebDriverWait(self.driver, actual_timeout)
-            return wait.until(
+            element = wait.until(
                 EC.presence_of_element_located(locator_tuple),
                 message=f"Element {locator_tuple} not found",
             )
+            self._record(key, started)
+            return element
         except Exception as e:
             self.logger.warning(f"Wait for presence failed: {e}")
             return None
@@ -36,13 +189,17 @@ class SeleniumWaitManager:
         self, locator_tuple, timeout: Optional[int] = None
     ) -> Optional[Any]:
         """Wait for element to be clickable"""
+        key = f"clickable:{locator_tuple}"
         try:
-            actual_timeout = (timeout or self.timeout) / 1000
+            actual_timeout = self._resolve_timeout(key, timeout) / 1000
+            started = time.monotonic()
             wait = WebDriverWait(self.driver, actual_timeout)
-            return wait.until(
+            element = wait.until(
                 EC.element_to_be_clickable(locator_tuple),
                 message=f"Element {locator_tuple} not clickable",
             )
+            self._record(key, started)
+            return element
         except Exception as e:
             self.logger.warning(f"Wait for clickable failed: {e}")
             return None
@@ -51,33 +208,182 @@ class SeleniumWaitManager:
         self, locator_tuple, timeout: Optional[int] = None
     ) -> Optional[Any]:
         """Wait for element visibility"""
+        key = f"visibility:{locator_tuple}"
         try:
-            actual_timeout = (timeout or self.timeout) / 1000
+            actual_timeout = self._resolve_timeout(key, timeout) / 1000
+            started = time.monotonic()
             wait = WebDriverWait(self.driver, actual_timeout)
-            return wait.until(
+            element = wait.until(
                 EC.visibility_of_element_located(locator_tuple),
                 message=f"Element {locator_tuple} not visible",
             )
+            self._record(key, started)
+            return element
         except Exception as e:
             self.logger.warning(f"Wait for visibility failed: {e}")
             return None
 
+    @property
+    def browser(self) -> Any:
+        return self.driver
+
+    def convert(self, locator: Locator) -> Any:
+        return locator.to_selenium()
 
-class PlaywrightWaitManager:
+    def current_url(self) -> str:
+        return self.driver.current_url
+
+    def wait_for_url_change(self, old_url: str, timeout: Optional[int] = None) -> bool:
+        """Wait until current URL differs from old_url"""
+        try:
+            actual_timeout = self._timeout_ms(timeout) / 1000
+            wait = WebDriverWait(self.driver, actual_timeout, poll_frequency=0.05)
+            return wait.until(lambda driver: driver.current_url != old_url)
+        except Exception as e:
+            self.logger.warning(f"Wait for URL change failed: {e}")
+            return False
+
+    def wait_for_load(self, timeout: Optional[int] = None) -> bool:
+        """Wait until document finished loading"""
+        try:
+            actual_timeout = self._timeout_ms(timeout) / 1000
+            wait = WebDriverWait(self.driver, actual_timeout, poll_frequency=0.05)
+            return wait.until(
+                lambda driver: driver.execute_script("return document.readyState")
+                != "loading"
+            )
+        except Exception as e:
+            self.logger.warning(f"Wait for load failed: {e}")
+            return False
+
+
+class SeleniumObserverWaitManager(SeleniumWaitManager):
+    """Selenium waits resolved inside the page by a MutationObserver
+
+    Each wait is a single execute_async_script call that returns the element
+    as soon as the condition holds, instead of WebDriverWait polling
+    find_element every 500 ms.
+    """
+
+    _LOCATOR_TYPES = {
+        "xpath": LocatorType.XPATH,
+        "css selector": LocatorType.CSS,
+        "id": LocatorType.ID,
+    }
+
+    def _observe(
+        self, locator_tuple, state: str, timeout: Optional[int]
+    ) -> Optional[Any]:
+        by, value = locator_tuple
+        locator = Locator(type=self._LOCATOR_TYPES[by], value=value)
+        key = f"{state}:{locator_tuple}"
+        try:
+            actual_timeout = self._resolve_timeout(key, timeout)
+            started = time.monotonic()
+            deadline = started + actual_timeout / 1000
+            while True:
+                remaining = int((deadline - time.monotonic()) * 1000)
+                try:
+                    element = dom.observe(
+                        self.driver, self.driver_type, locator, state, max(remaining, 1)
+                    )
+                    break
+                except Exception as e:
+                    # A navigation unloads the document the observer runs in,
+                    # observe the new one for the rest of the timeout
+                    # ("document unloaded" on Chrome, "Document was unloaded"
+                    # on Firefox)
+                    if "unloaded" not in str(e).lower() or remaining <= 0:
+                        raise
+            if element is not None:
+                self._record(key, started)
+            else:
+                self.logger.warning(f"Element {locator_tuple} not {state}")
+            return element
+        except Exception as e:
+            self.logger.warning(f"Wait for {state} failed: {e}")
+            return None
+
+    def wait_for_presence(
+        self, locator_tuple, timeout: Optional[int] = None
+    ) -> Optional[Any]:
+        """Wait for element presence"""
+        if locator_tuple[0] not in self._LOCATOR_TYPES:
+            return super().wait_for_presence(locator_tuple, timeout)
+        return self._observe(locator_tuple, "present", timeout)
+
+    def wait_for_clickable(
+        self, locator_tuple, timeout: Optional[int] = None
+    ) -> Optional[Any]:
+        """Wait for element to be clickable"""
+        if locator_tuple[0] not in self._LOCATOR_TYPES:
+            return super().wait_for_clickable(locator_tuple, timeout)
+        return self._observe(locator_tuple, "clickable", timeout)
+
+    def wait_for_visibility(
+        self, locator_tuple, timeout: Optional[int] = None
+    ) -> Optional[Any]:
+        """Wait for element visibility"""
+        if locator_tuple[0] not in self._LOCATOR_TYPES:
+            return super().wait_for_visibility(locator_tuple, timeout)
+        return self._observe(locator_tuple, "visible", timeout)
+
+
+class PlaywrightWaitManager(BaseWaitManager):
     """Playwright wait implementation"""
 
+    driver_type = DriverType.PLAYWRIGHT
+
     def __init__(self, page, timeout: int = 10000):
         self.page = page
         self.timeout = timeout
+        self.history = get_timeout_history()
         self.logger = setup_logger(self.__class__.__name__)
 
+    @property
+    def browser(self) -> Any:
+        return self.page
+
+    def convert(self, locator: Locator) -> Any:
+        return locator.to_playwright()
+
+    def current_url(self) -> str:
+        return self.page.url
+
+    def wait_for_url_change(self, old_url: str, timeout: Optional[int] = None) -> bool:
+        """Wait until page URL differs from old_url"""
+        try:
+            self.page.wait_for_url(
+                lambda url: url != old_url,
+                wait_until="commit",
+                timeout=self._timeout_ms(timeout),
+            )
+            return True
+        except Exception as e:
+            self.logger.warning(f"Wait for URL change failed: {e}")
+            return False
+
+    def wait_for_load(self, timeout: Optional[int] = None) -> bool:
+        """Wait until DOM content of the current document is loaded"""
+        try:
+            self.page.wait_for_load_state(
+                "domcontentloaded", timeout=self._timeout_ms(timeout)
+            )
+            return True
+        except Exception as e:
+            self.logger.warning(f"Wait for load failed: {e}")
+            return False
+
     def wait_for_presence(
         self, locator: str, timeout: Optional[int] = None
     ) -> Optional[Any]:
         """Wait for element presence"""
+        key = f"presence:{locator}"
         try:
-            actual_timeout = timeout or self.timeout
+            actual_timeout = self._resolve_timeout(key, timeout)
+            started = time.monotonic()
             self.page.wait_for_selector(locator, timeout=actual_timeout)
+            self._record(key, started)
             return self.page.locator(locator)
         except Exception as e:
             self.logger.warning(f"Wait for presence failed: {e}")
@@ -87,12 +393,15 @@ class PlaywrightWaitManager:
         self, locator: str, timeout: Optional[int] = None
     ) -> Optional[Any]:
         """Wait for element to be clickable"""
+        key = f"clickable:{locator}"
         try:
-            actual_timeout = timeout or self.timeout
+            actual_timeout = self._resolve_timeout(key, timeout)
+            started = time.monotonic()
             locator_obj = self.page.locator(locator)
             expect(locator_obj).not_to_have_attribute(
                 "disabled", None, timeout=actual_timeout
             )
+            self._record(key, started)
             return locator_obj
         except Exception as e:
             self.logger.warning(f"Wait for clickable failed: {e}")
@@ -102,11 +411,455 @@ class PlaywrightWaitManager:
         self, locator: str, timeout: Optional[int] = None
     ) -> Optional[Any]:
         """Wait for element visibility"""
+        key = f"visibility:{locator}"
         try:
-            actual_timeout = timeout or self.timeout
+            actual_timeout = self._resolve_timeout(key, timeout)
+            started = time.monotonic()
             locator_obj = self.page.locator(locator)
             locator_obj.wait_for(state="visible", timeout=actual_timeout)
+            self._record(key, started)
+            return locator_obj
+        except Exception as e:
+            self.logger.warning(f"Wait for visibility failed: {e}")
+            return None
+
+
+class AsyncPlaywrightWaitManager(BaseWaitManager):
+    """Playwright async API wait implementation, every wait is a coroutine"""
+
+    driver_type = DriverType.PLAYWRIGHT_ASYNC
+
+    def __init__(self, page, timeout: int = 10000):
+        self.page = page
+        self.timeout = timeout
+        self.history = get_timeout_history()
+        self.logger = setup_logger(self.__class__.__name__)
+
+    @property
+    def browser(self) -> Any:
+        return self.page
+
+    def convert(self, locator: Locator) -> Any:
+        return locator.to_playwright()
+
+    def current_url(self) -> str:
+        return self.page.url
+
+    async def wait_for_url_change(
+        self, old_url: str, timeout: Optional[int] = None
+    ) -> bool:
+        """Wait until page URL differs from old_url"""
+        try:
+            await self.page.wait_for_url(
+                lambda url: url != old_url,
+                wait_until="commit",
+                timeout=self._timeout_ms(timeout),
+            )
+            return True
+        except Exception as e:
+            self.logger.warning(f"Wait for URL change failed: {e}")
+            return False
+
+    async def wait_for_load(self, timeout: Optional[int] = None) -> bool:
+        """Wait until DOM content of the current document is loaded"""
+        try:
+            await self.page.wait_for_load_state(
+                "domcontentloaded", timeout=self._timeout_ms(timeout)
+            )
+            return True
+        except Exception as e:
+            self.logger.warning(f"Wait for load failed: {e}")
+            return False
+
+    async def is_loaded(self) -> bool:
+        """Check document is past the loading state"""
+        state = await dom.run_script(
+            self.page, self.driver_type, "() => document.readyState"
+        )
+        return state != "loading"
+
+    async def poll_until(
+        self,
+        predicate: Callable[[], Any],
+        timeout: Optional[int] = None,
+        interval: float = 0.05,
+    ) -> bool:
+        """Poll predicate (sync or async) until true or timeout (ms) expires
+
+        Errors, e.g. a script hitting a navigation, count as not yet.
+        """
+        deadline = time.monotonic() + self._timeout_ms(timeout) / 1000
+        while True:
+            try:
+                result = predicate()
+                if inspect.isawaitable(result):
+                    result = await result
+                if result:
+                    return True
+            except Exception:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+
+    async def is_visible_now(self, locator: Locator) -> bool:
+        """Check element visibility in current DOM"""
+        results = await dom.probe(self.page, self.driver_type, [locator], "visible")
+        return results[0]
+
+    async def count_now(self, locator: Locator) -> int:
+        """Count matching elements in current DOM"""
+        return await dom.count(self.page, self.driver_type, locator)
+
+    async def element_value(self, locator: Locator, expression: str) -> Any:
+        """Evaluate JS expression over `el` on first match"""
+        return await dom.element_value(self.page, self.driver_type, locator, expression)
+
+    async def quiet_for(self, reset: bool = False) -> float:
+        """Get milliseconds since the last DOM mutation, reset restarts the count"""
+        return await dom.quiet_for(self.page, self.driver_type, reset)
+
+    async def wait_for_value_change(
+        self,
+        locator: Locator,
+        expression: str,
+        previous: Any,
+        timeout: Optional[int] = None,
+    ) -> bool:
+        """Wait until JS expression over first match differs from previous"""
+        try:
+            return await dom.wait_for_value_change(
+                self.page,
+                self.driver_type,
+                locator,
+                expression,
+                previous,
+                self._timeout_ms(timeout),
+            )
+        except Exception as e:
+            self.logger.warning(f"Wait for value change failed: {e}")
+            return False
+
+    async def wait_for_dom_settled(
+        self, quiet_ms: int = 300, timeout: Optional[int] = None
+    ) -> bool:
+        """Wait until the DOM has no mutations for quiet_ms"""
+        try:
+            return await dom.wait_for_dom_settled(
+                self.page, self.driver_type, quiet_ms, self._timeout_ms(timeout)
+            )
+        except Exception as e:
+            self.logger.warning(f"Wait for DOM settled failed: {e}")
+            return False
+
+    async def wait_for_presence(
+        self, locator: str, timeout: Optional[int] = None
+    ) -> Optional[Any]:
+        """Wait for element presence"""
+        key = f"presence:{locator}"
+        try:
+            actual_timeout = self._resolve_timeout(key, timeout)
+            started = time.monotonic()
+            await self.page.wait_for_selector(locator, timeout=actual_timeout)
+            self._record(key, started)
+            return self.page.locator(locator)
+        except Exception as e:
+            self.logger.warning(f"Wait for presence failed: {e}")
+            return None
+
+    async def wait_for_clickable(
+        self, locator: str, timeout: Optional[int] = None
+    ) -> Optional[Any]:
+        """Wait for element to be clickable"""
+        key = f"clickable:{locator}"
+        try:
+            actual_timeout = self._resolve_timeout(key, timeout)
+            started = time.monotonic()
+            locator_obj = self.page.locator(locator)
+            await async_expect(locator_obj).not_to_have_attribute(
+                "disabled", None, timeout=actual_timeout
+            )
+            self._record(key, started)
+            return locator_obj
+        except Exception as e:
+            self.logger.warning(f"Wait for clickable failed: {e}")
+            return None
+
+    async def wait_for_visibility(
+        self, locator: str, timeout: Optional[int] = None
+    ) -> Optional[Any]:
+        """Wait for element visibility"""
+        key = f"visibility:{locator}"
+        try:
+            actual_timeout = self._resolve_timeout(key, timeout)
+            started = time.monotonic()
+            locator_obj = self.page.locator(locator)
+            await locator_obj.wait_for(state="visible", timeout=actual_timeout)
+            self._record(key, started)
             return locator_obj
         except Exception as e:
             self.logger.warning(f"Wait for visibility failed: {e}")
             return None
+
+
+SELENIUM_WAIT_ENGINES = {
+    "webdriver": SeleniumWaitManager,
+    "observer": SeleniumObserverWaitManager,
+}
+SELENIUM_WAIT_ENGINE = os.getenv("SELENIUM_WAIT_ENGINE", "webdriver")
+
+
+def create_wait_manager(
+    driver, driver_type: DriverType, timeout: int = 10000
+) -> BaseWaitManager:
+    """Create wait manager for driver type
+
+    Selenium engine is chosen by SELENIUM_WAIT_ENGINE: "webdriver" (default)
+    or "observer"
+    """
+    if driver_type == DriverType.SELENIUM:
+        try:
+            engine = SELENIUM_WAIT_ENGINES[SELENIUM_WAIT_ENGINE]
+        except KeyError:
+            raise ValueError(
+                f"Unknown SELENIUM_WAIT_ENGINE {SELENIUM_WAIT_ENGINE!r}, "
+                f"expected one of {sorted(SELENIUM_WAIT_ENGINES)}"
+            ) from None
+        return engine(driver, timeout)
+    if driver_type == DriverType.PLAYWRIGHT_ASYNC:
+        return AsyncPlaywrightWaitManager(driver, timeout)
+    return PlaywrightWaitManager(driver, timeout)
+
+
+async def _resolve(value: Any) -> Any:
+    """Await value if it is awaitable"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class Postcondition(ABC):
+    """Condition that marks an action as finished
+
+    arm() captures state before the action, wait() returns as soon as the
+    condition holds after it. Conditions combine with `|`. The *_async
+    variants take an AsyncPlaywrightWaitManager.
+    """
+
+    def arm(self, manager: BaseWaitManager):
+        """Capture state before the action"""
+        pass
+
+    @abstractmethod
+    def check(self, manager: BaseWaitManager) -> bool:
+        """Check condition once"""
+        pass
+
+    def wait(self, manager: BaseWaitManager, timeout: Optional[int] = None) -> bool:
+        """Wait until condition holds or timeout (ms) expires"""
+        return manager.poll_until(lambda: self.check(manager), timeout)
+
+    async def arm_async(self, manager: BaseWaitManager):
+        await _resolve(self.arm(manager))
+
+    async def check_async(self, manager: BaseWaitManager) -> bool:
+        return bool(await _resolve(self.check(manager)))
+
+    async def wait_async(
+        self, manager: BaseWaitManager, timeout: Optional[int] = None
+    ) -> bool:
+        return await manager.poll_until(lambda: self.check_async(manager), timeout)
+
+    def __or__(self, other: "Postcondition") -> "Postcondition":
+        return AnyOf(self, other)
+
+
+class AnyOf(Postcondition):
+    """Holds when any of the conditions holds"""
+
+    def __init__(self, *conditions: Postcondition):
+        self.conditions = conditions
+
+    def arm(self, manager: BaseWaitManager):
+        for condition in self.conditions:
+            condition.arm(manager)
+
+    def check(self, manager: BaseWaitManager) -> bool:
+        # A condition that errors, e.g. mid-navigation, must not hide the others
+        for condition in self.conditions:
+            try:
+                if condition.check(manager):
+                    return True
+            except Exception:
+                pass
+        return False
+
+    async def arm_async(self, manager: BaseWaitManager):
+        for condition in self.conditions:
+            await condition.arm_async(manager)
+
+    async def check_async(self, manager: BaseWaitManager) -> bool:
+        for condition in self.conditions:
+            try:
+                if await condition.check_async(manager):
+                    return True
+            except Exception:
+                pass
+        return False
+
+    def __or__(self, other: Postcondition) -> Postcondition:
+        return AnyOf(*self.conditions, other)
+
+
+class UrlChanged(Postcondition):
+    """Holds once the page URL differs from the URL before the action"""
+
+    def arm(self, manager: BaseWaitManager):
+        self.old_url = manager.current_url()
+
+    def check(self, manager: BaseWaitManager) -> bool:
+        return manager.current_url() != self.old_url
+
+    def wait(self, manager: BaseWaitManager, timeout: Optional[int] = None) -> bool:
+        return manager.wait_for_url_change(self.old_url, timeout)
+
+    async def wait_async(
+        self, manager: BaseWaitManager, timeout: Optional[int] = None
+    ) -> bool:
+        return await manager.wait_for_url_change(self.old_url, timeout)
+
+
+class NavigationCommitted(UrlChanged):
+    """Holds once the URL changed and the new document is loaded"""
+
+    def check(self, manager: BaseWaitManager) -> bool:
+        return super().check(manager) and manager.is_loaded()
+
+    def wait(self, manager: BaseWaitManager, timeout: Optional[int] = None) -> bool:
+        started = time.monotonic()
+        if not super().wait(manager, timeout):
+            return False
+        elapsed = int((time.monotonic() - started) * 1000)
+        return manager.wait_for_load(max(manager._timeout_ms(timeout) - elapsed, 1))
+
+    async def check_async(self, manager: BaseWaitManager) -> bool:
+        return UrlChanged.check(self, manager) and await manager.is_loaded()
+
+    async def wait_async(
+        self, manager: BaseWaitManager, timeout: Optional[int] = None
+    ) -> bool:
+        started = time.monotonic()
+        if not await super().wait_async(manager, timeout):
+            return False
+        elapsed = int((time.monotonic() - started) * 1000)
+        return await manager.wait_for_load(
+            max(manager._timeout_ms(timeout) - elapsed, 1)
+        )
+
+
+class DomSettled(Postcondition):
+    """Holds once the DOM had no mutations for quiet_ms"""
+
+    def __init__(self, quiet_ms: int = 300):
+        self.quiet_ms = quiet_ms
+
+    def arm(self, manager: BaseWaitManager):
+        # Installs or restarts the mutation clock, so check() can answer
+        # without waiting and quiet time before the action is not counted
+        manager.quiet_for(reset=True)
+
+    def check(self, manager: BaseWaitManager) -> bool:
+        return manager.quiet_for() >= self.quiet_ms
+
+    async def arm_async(self, manager: BaseWaitManager):
+        await manager.quiet_for(reset=True)
+
+    async def check_async(self, manager: BaseWaitManager) -> bool:
+        return await manager.quiet_for() >= self.quiet_ms
+
+    def wait(self, manager: BaseWaitManager, timeout: Optional[int] = None) -> bool:
+        return manager.wait_for_dom_settled(self.quiet_ms, timeout)
+
+    async def wait_async(
+        self, manager: BaseWaitManager, timeout: Optional[int] = None
+    ) -> bool:
+        return await manager.wait_for_dom_settled(self.quiet_ms, timeout)
+
+
+class ElementVisible(Postcondition):
+    """Holds once the element is visible"""
+
+    def __init__(self, locator: Locator):
+        self.locator = locator
+
+    def check(self, manager: BaseWaitManager) -> bool:
+        return manager.is_visible_now(self.locator)
+
+    def wait(self, manager: BaseWaitManager, timeout: Optional[int] = None) -> bool:
+        converted = manager.convert(self.locator)
+        return manager.wait_for_visibility(converted, timeout) is not None
+
+    async def wait_async(
+        self, manager: BaseWaitManager, timeout: Optional[int] = None
+    ) -> bool:
+        converted = manager.convert(self.locator)
+        return await manager.wait_for_visibility(converted, timeout) is not None
+
+
+class ElementStateChanged(Postcondition):
+    """Holds once a JS expression over the first match changes value"""
+
+    def __init__(self, locator: Locator, expression: str):
+        self.locator = locator
+        self.expression = expression
+
+    def arm(self, manager: BaseWaitManager):
+        self.previous = manager.element_value(self.locator, self.expression)
+
+    def check(self, manager: BaseWaitManager) -> bool:
+        return manager.element_value(self.locator, self.expression) != self.previous
+
+    def wait(self, manager: BaseWaitManager, timeout: Optional[int] = None) -> bool:
+        return manager.wait_for_value_change(
+            self.locator, self.expression, self.previous, timeout
+        )
+
+    async def arm_async(self, manager: BaseWaitManager):
+        self.previous = await manager.element_value(self.locator, self.expression)
+
+    async def check_async(self, manager: BaseWaitManager) -> bool:
+        value = await manager.element_value(self.locator, self.expression)
+        return value != self.previous
+
+    async def wait_async(
+        self, manager: BaseWaitManager, timeout: Optional[int] = None
+    ) -> bool:
+        return await manager.wait_for_value_change(
+            self.locator, self.expression, self.previous, timeout
+        )
+
+
+class AttributeChanged(ElementStateChanged):
+    """Holds once an attribute of the first match changes, e.g. Like -> Unlike"""
+
+    def __init__(self, locator: Locator, attr_name: str):
+        super().__init__(locator, f"el.getAttribute({json.dumps(attr_name)})")
+
+
+class CountChanged(Postcondition):
+    """Holds once the number of matching elements changes"""
+
+    def __init__(self, locator: Locator):
+        self.locator = locator
+
+    def arm(self, manager: BaseWaitManager):
+        self.previous = manager.count_now(self.locator)
+
+    def check(self, manager: BaseWaitManager) -> bool:
+        return manager.count_now(self.locator) != self.previous
+
+    async def arm_async(self, manager: BaseWaitManager):
+        self.previous = await manager.count_now(self.locator)
+
+    async def check_async(self, manager: BaseWaitManager) -> bool:
+        return await manager.count_now(self.locator) != self.previous
@@ -1,9 +1,32 @@
-from framework.locator import DriverType
-from framework.logger import setup_logger
+import inspect
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+from framework import dom
+from framework.element import ElementCache, WebElement
+from framework.locator import DriverType, Locator
+from framework.logger import log_action, setup_logger
+from framework.network import ResponseSpec, ResponseTiming
+from framework.screenshot import (
+    AsyncPlaywrightScreenshotManager,
+    PlaywrightScreenshotManager,
+    SeleniumScreenshotManager,
+)
+from framework.visual import Region, VisualBaseline, VisualDiff, get_visual_baseline
+from framework.waiter import Postcondition, create_wait_manager
+
+# Element caches of all page objects per Playwright page, so that each page
+# gets one framenavigated listener however many page objects wrap it
+_navigation_caches: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
 
 
 class BasePage:
-    """Base class for all page objects."""
+    """Base class for all page objects.
+
+    With DriverType.PLAYWRIGHT_ASYNC the driver is an async API Page and
+    element actions, probe(), perform() and compare_screenshot() return
+    awaitables, as do the log_action steps of page objects and of action
+    classes wrapping them (LoginPageActions etc.).
+    """
 
     def __init__(
         self,
@@ -15,8 +38,8 @@ class BasePage:
         Initialize LoginPage
 
         Args:
-            driver: Selenium WebDriver or Playwright Page instance
-            driver_type: Type of driver (SELENIUM or PLAYWRIGHT)
+            driver: Selenium WebDriver or Playwright (sync or async) Page instance
+            driver_type: Type of driver (SELENIUM, PLAYWRIGHT or PLAYWRIGHT_ASYNC)
             timeout: Timeout in milliseconds for element waits
         """
         if driver_type == DriverType.SELENIUM:
@@ -25,14 +48,215 @@ class BasePage:
                     f"Expected Selenium WebDriver, got {type(driver).__name__}. "
                     f"Pass a WebDriver instance for DriverType.SELENIUM"
                 )
-        else:  # PLAYWRIGHT
+        else:  # PLAYWRIGHT, PLAYWRIGHT_ASYNC
             if not hasattr(driver, "locator"):
                 raise TypeError(
                     f"Expected Playwright Page, got {type(driver).__name__}. "
-                    f"Pass a Page instance for DriverType.PLAYWRIGHT"
+                    f"Pass a Page instance for DriverType.{driver_type.name}"
                 )
         self._driver = driver
         self._driver_type = driver_type
         self._timeout = timeout
         self._logger = setup_logger(self.__class__.__name__)
         self._locators = None
+        self._element_cache = ElementCache()
+        self._wait_manager = create_wait_manager(driver, driver_type, timeout)
+        self._watch_navigation()
+
+    def _watch_navigation(self):
+        """Invalidate cached elements when the main frame navigates"""
+        if self._driver_type == DriverType.SELENIUM:
+            # Selenium has no navigation events, call invalidate_elements()
+            return
+        caches = _navigation_caches.get(self._driver)
+        if caches is None:
+            caches = _navigation_caches[self._driver] = weakref.WeakSet()
+
+            def on_frame_navigated(frame):
+                if frame.parent_frame is None:
+                    for cache in list(caches):
+                        cache.invalidate()
+
+            self._driver.on("framenavigated", on_frame_navigated)
+        caches.add(self._element_cache)
+
+    def _then(
+        self,
+        value: Any,
+        callback: Callable[[Any], Any],
+        on_error: Optional[Callable[[Exception], Any]] = None,
+    ) -> Any:
+        """Apply callback to value, once awaited if value is awaitable
+
+        on_error, if given, turns an exception from awaiting value or from
+        callback into the result.
+        """
+        if not inspect.isawaitable(value):
+            if on_error is None:
+                return callback(value)
+            try:
+                return callback(value)
+            except Exception as e:
+                return on_error(e)
+
+        async def resolved():
+            if on_error is None:
+                return callback(await value)
+            try:
+                return callback(await value)
+            except Exception as e:
+                return on_error(e)
+
+        return resolved()
+
+    def _display_check_failed(self, error: Exception) -> bool:
+        """Log a failed is_page_displayed() check, which counts as not displayed"""
+        self._logger.error(f"Failed to check if page displayed: {error}")
+        return False
+
+    def invalidate_elements(self):
+        """Drop cached elements, e.g. after navigating a Selenium driver"""
+        self._element_cache.invalidate()
+
+    def element_cache_stats(self) -> dict:
+        """Get element cache hit/miss counters"""
+        return self._element_cache.stats()
+
+    @log_action("Probing elements")
+    def probe(
+        self,
+        locators: List[Union[str, Locator]],
+        state: str = "visible",
+        timeout: int = 0,
+    ) -> Dict[str, bool]:
+        """
+        Check state of several elements in one browser round trip
+
+        Args:
+            locators: Locator names (e.g. "USERNAME_INPUT") or Locator objects
+            state: One of "present", "visible", "hidden", "enabled", "clickable"
+            timeout: Time in milliseconds to keep checking until all match
+
+        Returns:
+            Dict of locator name (or locator value) to result
+        """
+        keys = []
+        resolved = []
+        for locator in locators:
+            if isinstance(locator, str):
+                keys.append(locator)
+                resolved.append(getattr(self._locators, locator))
+            else:
+                keys.append(locator.value)
+                resolved.append(locator)
+
+        results = dom.probe(
+            self._driver, self._driver_type, resolved, state=state, timeout=timeout
+        )
+        return self._then(results, lambda found: dict(zip(keys, found)))
+
+    @log_action("Performing action and waiting for postcondition")
+    def perform(
+        self,
+        action: Callable[[], None],
+        postcondition: Postcondition,
+        timeout: Optional[int] = None,
+    ) -> bool:
+        """
+        Run action and return as soon as postcondition holds
+
+        Args:
+            action: Callable performing the action, e.g. element.click
+            postcondition: Condition marking the action as finished
+            timeout: Maximum time to wait in milliseconds
+
+        Returns:
+            True if postcondition held before timeout, False otherwise
+        """
+        if self._driver_type == DriverType.PLAYWRIGHT_ASYNC:
+            return self._perform_async(action, postcondition, timeout)
+        postcondition.arm(self._wait_manager)
+        action()
+        timeout = self._timeout if timeout is None else timeout
+        satisfied = postcondition.wait(self._wait_manager, timeout)
+        self._element_cache.mark_dom_changed()
+        if not satisfied:
+            self._warn_unmet(postcondition)
+        return satisfied
+
+    async def _perform_async(
+        self,
+        action: Callable[[], Any],
+        postcondition: Postcondition,
+        timeout: Optional[int] = None,
+    ) -> bool:
+        await postcondition.arm_async(self._wait_manager)
+        result = action()
+        if inspect.isawaitable(result):
+            await result
+        timeout = self._timeout if timeout is None else timeout
+        satisfied = await postcondition.wait_async(self._wait_manager, timeout)
+        self._element_cache.mark_dom_changed()
+        if not satisfied:
+            self._warn_unmet(postcondition)
+        return satisfied
+
+    def _warn_unmet(self, postcondition: Postcondition):
+        self._logger.warning(
+            f"Postcondition {type(postcondition).__name__} not met in time"
+        )
+
+    def click_and_wait(
+        self,
+        element: WebElement,
+        postcondition: Postcondition,
+        timeout: Optional[int] = None,
+        expect_response: Optional[ResponseSpec] = None,
+    ) -> Optional[ResponseTiming]:
+        """
+        Click element and wait for the response spec if given, else postcondition
+
+        Args:
+            element: Element to click
+            postcondition: Condition marking the click as finished
+            timeout: Maximum time to wait in milliseconds
+            expect_response: Response that completes the click
+
+        Returns:
+            ResponseTiming of the matched response if expect_response is given
+        """
+        if expect_response is not None:
+            return element.click(
+                expect_response=expect_response, response_timeout=timeout
+            )
+        satisfied = self.perform(element.click, postcondition, timeout)
+        return self._then(satisfied, lambda _: None)
+
+    @log_action("Comparing screenshot with baseline")
+    def compare_screenshot(
+        self,
+        name: str,
+        ignore: Sequence[Region] = (),
+        visual: Optional[VisualBaseline] = None,
+    ) -> VisualDiff:
+        """
+        Compare page screenshot with a stored baseline
+
+        Args:
+            name: Baseline name, e.g. "login_page"
+            ignore: (x, y, width, height) regions to skip, e.g. timestamps
+            visual: Baseline store, defaults to VISUAL_BASELINE_DIR
+
+        Returns:
+            VisualDiff with matched flag and diff statistics
+        """
+        visual = visual or get_visual_baseline()
+        if self._driver_type == DriverType.SELENIUM:
+            manager = SeleniumScreenshotManager(self._driver)
+        elif self._driver_type == DriverType.PLAYWRIGHT_ASYNC:
+            manager = AsyncPlaywrightScreenshotManager(self._driver)
+        else:
+            manager = PlaywrightScreenshotManager(self._driver)
+        return self._then(
+            manager.capture(), lambda png: visual.compare(name, png, ignore)
+        )
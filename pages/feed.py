@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from framework.locator import Locator, LocatorType, DriverType
-from framework.element import element, WebElement
+from framework.element import element, elements, WebElement, ManyWebElements
 from pages._base import BasePage
 
 
@@ -274,11 +274,21 @@ class FeedPage(BasePage):
         """Individual post element"""
         pass
 
+    @elements("POST_ITEM")
+    def post_items(self) -> ManyWebElements:
+        """All post elements"""
+        pass
+
     @element("POST_AUTHOR")
     def post_author(self) -> WebElement:
         """Post author element"""
         pass
 
+    @elements("POST_AUTHOR")
+    def post_authors(self) -> ManyWebElements:
+        """All post author elements"""
+        pass
+
     @element("POST_IMAGE")
     def post_image(self) -> WebElement:
         """Post image element"""
@@ -1,6 +1,14 @@
-import time
+from typing import Optional
 from framework.logger import log_action, setup_logger
-from pages.feed import FeedPage
+from framework.network import ResponseSpec
+from framework.waiter import (
+    AttributeChanged,
+    CountChanged,
+    DomSettled,
+    ElementStateChanged,
+    ElementVisible,
+)
+from pages.feed import FeedPage, FeedPageLocators
 
 
 class FeedPageActions:
@@ -14,16 +22,23 @@ class FeedPageActions:
         """
         self._page = feed_page
         self._logger = setup_logger(self.__class__.__name__)
+        self.last_response = None
 
     # Page state checks
     @log_action("Checking if feed page is displayed")
     def is_page_displayed(self) -> bool:
         """Check if feed page is displayed"""
         try:
-            return self.feed_container.is_presented() and self.nav_bar.is_presented()
+            results = self._page.probe(
+                ["FEED_CONTAINER", "NAV_BAR"],
+                state="present",
+                timeout=self._page._timeout,
+            )
         except Exception as e:
-            self._logger.error(f"Failed to check if page displayed: {e}")
-            return False
+            return self._page._display_check_failed(e)
+        return self._page._then(
+            results, lambda found: all(found.values()), self._page._display_check_failed
+        )
 
     @log_action("Checking if navigation bar is visible")
     def is_nav_bar_visible(self) -> bool:
@@ -65,13 +80,20 @@ class FeedPageActions:
     def get_posts_count(self) -> int:
         """Get number of posts visible in feed"""
         try:
-            # This would need to be implemented based on your framework's ability to find multiple elements
-            # For now, returning 0 as placeholder
-            return 0
+            return len(self._page.post_items)
         except Exception as e:
             self._logger.error(f"Failed to get posts count: {e}")
             return 0
 
+    @log_action("Getting all post author names")
+    def get_post_author_names(self) -> list:
+        """Get author names of all loaded posts"""
+        try:
+            return self._page.post_authors.get_all_text()
+        except Exception as e:
+            self._logger.error(f"Failed to get post author names: {e}")
+            return []
+
     @log_action("Getting post author name")
     def get_post_author_name(self) -> str:
         """Get the author name of the first post"""
@@ -235,44 +257,67 @@ class FeedPageActions:
 
     # Post interaction actions
     @log_action("Liking a post")
-    def like_post(self, wait_after: float = 0.5) -> None:
+    def like_post(
+        self,
+        wait_after: float = 0.5,
+        expect_response: Optional[ResponseSpec] = None,
+    ) -> None:
         """
         Like the first visible post
 
         Args:
-            wait_after: Time to wait after liking (seconds)
+            wait_after: Maximum time to wait for Like/Unlike label flip (seconds)
+            expect_response: Finish as soon as this response arrives instead
         """
         try:
             self._logger.debug("Liking post")
-            self._page.like_button.click()
-            time.sleep(wait_after)
+            self.last_response = self._page.click_and_wait(
+                self._page.like_button,
+                AttributeChanged(FeedPageLocators.LIKE_BUTTON, "aria-label"),
+                timeout=int(wait_after * 1000),
+                expect_response=expect_response,
+            )
 
         except Exception as e:
             self._logger.error(f"Failed to like post: {e}")
             raise
 
     @log_action("Commenting on a post")
-    def comment_on_post(self, comment_text: str, wait_after: float = 1.0) -> None:
+    def comment_on_post(
+        self,
+        comment_text: str,
+        wait_after: float = 1.0,
+        expect_response: Optional[ResponseSpec] = None,
+    ) -> None:
         """
         Add a comment to the first visible post
 
         Args:
             comment_text: Text of the comment
-            wait_after: Time to wait after posting comment (seconds)
+            wait_after: Maximum time to wait for comment input to clear (seconds)
+            expect_response: Finish as soon as this response (e.g. the comment
+                POST) arrives instead
         """
         try:
             self._logger.debug(f"Adding comment: {comment_text}")
 
             # Click comment button to focus input
-            self._page.comment_button.click()
-            time.sleep(0.3)
+            self._page.perform(
+                self._page.comment_button.click,
+                ElementVisible(FeedPageLocators.COMMENT_INPUT),
+                timeout=300,
+            )
 
             # Enter comment text
             self._page.comment_input.send_keys(comment_text)
 
-            # Post the comment
-            self._page.post_comment_button.click()
-            time.sleep(wait_after)
+            # Post the comment, input is cleared once it is accepted
+            self.last_response = self._page.click_and_wait(
+                self._page.post_comment_button,
+                ElementStateChanged(FeedPageLocators.COMMENT_INPUT, "el.value"),
+                timeout=int(wait_after * 1000),
+                expect_response=expect_response,
+            )
 
             self._logger.info("Comment posted successfully")
 
@@ -286,29 +331,41 @@ class FeedPageActions:
         Share the first visible post
 
         Args:
-            wait_after: Time to wait after sharing (seconds)
+            wait_after: Maximum time to wait for share dialog to settle (seconds)
         """
         try:
             self._logger.debug("Sharing post")
-            self._page.share_button.click()
-            time.sleep(wait_after)
+            self._page.perform(
+                self._page.share_button.click,
+                DomSettled(),
+                timeout=int(wait_after * 1000),
+            )
 
         except Exception as e:
             self._logger.error(f"Failed to share post: {e}")
             raise
 
     @log_action("Saving a post")
-    def save_post(self, wait_after: float = 0.5) -> None:
+    def save_post(
+        self,
+        wait_after: float = 0.5,
+        expect_response: Optional[ResponseSpec] = None,
+    ) -> None:
         """
         Save the first visible post
 
         Args:
-            wait_after: Time to wait after saving (seconds)
+            wait_after: Maximum time to wait for Save/Remove label flip (seconds)
+            expect_response: Finish as soon as this response arrives instead
         """
         try:
             self._logger.debug("Saving post")
-            self._page.save_button.click()
-            time.sleep(wait_after)
+            self.last_response = self._page.click_and_wait(
+                self._page.save_button,
+                AttributeChanged(FeedPageLocators.SAVE_BUTTON, "aria-label"),
+                timeout=int(wait_after * 1000),
+                expect_response=expect_response,
+            )
 
         except Exception as e:
             self._logger.error(f"Failed to save post: {e}")
@@ -350,17 +407,26 @@ class FeedPageActions:
 
     # Suggestions actions
     @log_action("Following a suggested user")
-    def follow_suggested_user(self, wait_after: float = 0.5) -> None:
+    def follow_suggested_user(
+        self,
+        wait_after: float = 0.5,
+        expect_response: Optional[ResponseSpec] = None,
+    ) -> None:
         """
         Follow a suggested user from the suggestions section
 
         Args:
-            wait_after: Time to wait after clicking follow (seconds)
+            wait_after: Maximum time to wait for the Follow button to flip (seconds)
+            expect_response: Finish as soon as this response arrives instead
         """
         try:
             self._logger.debug("Following suggested user")
-            self._page.follow_button.click()
-            time.sleep(wait_after)
+            self.last_response = self._page.click_and_wait(
+                self._page.follow_button,
+                CountChanged(FeedPageLocators.FOLLOW_BUTTON),
+                timeout=int(wait_after * 1000),
+                expect_response=expect_response,
+            )
 
         except Exception as e:
             self._logger.error(f"Failed to follow suggested user: {e}")
@@ -382,7 +448,7 @@ class FeedPageActions:
             like: Whether to like the post
             comment: Comment text to add (None to skip commenting)
             save: Whether to save the post
-            wait_between_actions: Time to wait between actions (seconds)
+            wait_between_actions: Maximum time to wait for each action (seconds)
 
         Returns:
             True if all interactions succeeded, False otherwise
@@ -413,13 +479,23 @@ class FeedPageActions:
             True if all elements are valid, False otherwise
         """
         try:
+            visible = self._page.probe(
+                ["FEED_CONTAINER", "NAV_BAR", "POSTS_CONTAINER"],
+                state="visible",
+                timeout=500,
+            )
+            enabled = self._page.probe(
+                ["HOME_BUTTON", "CREATE_POST_BUTTON", "PROFILE_BUTTON"],
+                state="enabled",
+                timeout=100,
+            )
             checks = {
-                "Feed container visible": self.is_page_displayed(),
-                "Navigation bar visible": self.is_nav_bar_visible(),
-                "Posts visible": self.is_posts_visible(),
-                "Home button clickable": self.is_home_button_clickable(),
-                "Create post button clickable": self.is_create_post_button_clickable(),
-                "Profile button clickable": self.is_profile_button_clickable(),
+                "Feed container visible": visible["FEED_CONTAINER"],
+                "Navigation bar visible": visible["NAV_BAR"],
+                "Posts visible": visible["POSTS_CONTAINER"],
+                "Home button clickable": enabled["HOME_BUTTON"],
+                "Create post button clickable": enabled["CREATE_POST_BUTTON"],
+                "Profile button clickable": enabled["PROFILE_BUTTON"],
             }
 
             all_valid = all(checks.values())
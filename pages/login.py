@@ -109,15 +109,16 @@ class LoginPage(BasePage):
     def is_page_displayed(self) -> bool:
         """Check if login page is displayed"""
         try:
-            return (
-                self.login_form.is_presented()
-                and self.username_input.is_presented()
-                and self.password_input.is_presented()
-                and self.login_button.is_presented()
+            results = self.probe(
+                ["LOGIN_FORM", "USERNAME_INPUT", "PASSWORD_INPUT", "LOGIN_BUTTON"],
+                state="present",
+                timeout=self._timeout,
             )
         except Exception as e:
-            self._logger.error(f"Failed to check if page displayed: {e}")
-            return False
+            return self._display_check_failed(e)
+        return self._then(
+            results, lambda found: all(found.values()), self._display_check_failed
+        )
 
     @log_action("Checking if username input is visible")
     def is_username_input_visible(self) -> bool:
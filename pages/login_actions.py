@@ -1,6 +1,8 @@
-import time
+from typing import Optional
 from framework.logger import log_action, setup_logger
-from pages.login import LoginPage
+from framework.network import ResponseSpec
+from framework.waiter import ElementVisible, UrlChanged
+from pages.login import LoginPage, LoginPageLocators
 
 
 class LoginPageActions:
@@ -28,10 +30,15 @@ class LoginPageActions:
 
         self._page = login_page
         self._logger = setup_logger(self.__class__.__name__)
+        self.last_response = None
 
     @log_action("Performing login")
     def login(
-        self, username: str, password: str, wait_after_login: float = 2.0
+        self,
+        username: str,
+        password: str,
+        wait_after_login: float = 2.0,
+        expect_response: Optional[ResponseSpec] = None,
     ) -> bool:
         """
         Perform login with username and password
@@ -39,7 +46,10 @@ class LoginPageActions:
         Args:
             username: Username or email
             password: Password
-            wait_after_login: Time to wait after clicking login button (seconds)
+            wait_after_login: Maximum time to wait for redirect or error
+                message after clicking login button (seconds)
+            expect_response: Finish as soon as this response (e.g. the login
+                POST) arrives instead; its timing is kept in last_response
 
         Returns:
             True if login was successful, False otherwise
@@ -64,12 +74,14 @@ class LoginPageActions:
             self._logger.debug("Entering password")
             self._page.password_input.send_keys(password)
 
-            # Click login button
+            # Click login button and wait for redirect or error message
             self._logger.debug("Clicking login button")
-            self._page.login_button.click()
-
-            # Wait for page to process login
-            time.sleep(wait_after_login)
+            self.last_response = self._page.click_and_wait(
+                self._page.login_button,
+                UrlChanged() | ElementVisible(LoginPageLocators.ERROR_MESSAGE),
+                timeout=int(wait_after_login * 1000),
+                expect_response=expect_response,
+            )
 
             self._logger.info("Login completed successfully")
             return True
@@ -227,10 +239,14 @@ class LoginPageActions:
             True if all elements are valid, False otherwise
         """
         try:
+            visible = self._page.probe(
+                ["USERNAME_INPUT", "PASSWORD_INPUT"], state="visible", timeout=500
+            )
+            enabled = self._page.probe(["LOGIN_BUTTON"], state="enabled", timeout=100)
             checks = {
-                "Username input visible": self._page.is_username_input_visible(),
-                "Password input visible": self._page.is_password_input_visible(),
-                "Login button clickable": self._page.is_login_button_clickable(),
+                "Username input visible": visible["USERNAME_INPUT"],
+                "Password input visible": visible["PASSWORD_INPUT"],
+                "Login button clickable": enabled["LOGIN_BUTTON"],
             }
 
             all_valid = all(checks.values())
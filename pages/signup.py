@@ -127,17 +127,23 @@ class SignupPage(BasePage):
     def is_page_displayed(self) -> bool:
         """Check if signup page is displayed"""
         try:
-            return (
-                self.signup_form.is_presented()
-                and self.email_input.is_presented()
-                and self.username_input.is_presented()
-                and self.password_input.is_presented()
-                and self.password_confirm_input.is_presented()
-                and self.signup_button.is_presented()
+            results = self.probe(
+                [
+                    "SIGNUP_FORM",
+                    "EMAIL_INPUT",
+                    "USERNAME_INPUT",
+                    "PASSWORD_INPUT",
+                    "PASSWORD_CONFIRM_INPUT",
+                    "SIGNUP_BUTTON",
+                ],
+                state="present",
+                timeout=self._timeout,
             )
         except Exception as e:
-            self._logger.error(f"Failed to check if page displayed: {e}")
-            return False
+            return self._display_check_failed(e)
+        return self._then(
+            results, lambda found: all(found.values()), self._display_check_failed
+        )
 
     @log_action("Checking if email input is visible")
     def is_email_input_visible(self) -> bool:
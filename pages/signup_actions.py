@@ -1,6 +1,8 @@
-import time
+from typing import Optional
 from framework.logger import log_action, setup_logger
-from pages.signup import SignupPage
+from framework.network import ResponseSpec
+from framework.waiter import ElementVisible, UrlChanged
+from pages.signup import SignupPage, SignupPageLocators
 
 
 class SignupPageActions:
@@ -32,6 +34,7 @@ class SignupPageActions:
 
         self._page = signup_page
         self._logger = setup_logger(self.__class__.__name__)
+        self.last_response = None
 
     @log_action("Performing signup")
     def signup(
@@ -41,6 +44,7 @@ class SignupPageActions:
         password: str,
         password_confirm: str,
         wait_after_signup: float = 2.0,
+        expect_response: Optional[ResponseSpec] = None,
     ) -> bool:
         """
         Perform signup with email, username, and password
@@ -50,7 +54,10 @@ class SignupPageActions:
             username: Username
             password: Password
             password_confirm: Password confirmation
-            wait_after_signup: Time to wait after clicking signup button (seconds)
+            wait_after_signup: Maximum time to wait for redirect or error
+                message after clicking signup button (seconds)
+            expect_response: Finish as soon as this response (e.g. the signup
+                POST) arrives instead; its timing is kept in last_response
 
         Returns:
             True if signup was successful, False otherwise
@@ -89,12 +96,14 @@ class SignupPageActions:
             self._logger.debug("Entering password confirmation")
             self._page.password_confirm_input.send_keys(password_confirm)
 
-            # Click signup button
+            # Click signup button and wait for redirect or error message
             self._logger.debug("Clicking signup button")
-            self._page.signup_button.click()
-
-            # Wait for page to process signup
-            time.sleep(wait_after_signup)
+            self.last_response = self._page.click_and_wait(
+                self._page.signup_button,
+                UrlChanged() | ElementVisible(SignupPageLocators.ERROR_MESSAGE),
+                timeout=int(wait_after_signup * 1000),
+                expect_response=expect_response,
+            )
 
             self._logger.info("Signup fill successfully")
             return (
@@ -288,12 +297,25 @@ class SignupPageActions:
             True if all elements are valid, False otherwise
         """
         try:
+            visible = self._page.probe(
+                [
+                    "EMAIL_INPUT",
+                    "USERNAME_INPUT",
+                    "PASSWORD_INPUT",
+                    "PASSWORD_CONFIRM_INPUT",
+                    "SIGNUP_BUTTON",
+                ],
+                state="visible",
+                timeout=500,
+            )
             checks = {
-                "Email input visible": self._page.is_email_input_visible(),
-                "Username input visible": self._page.is_username_input_visible(),
-                "Password input visible": self._page.is_password_input_visible(),
-                "Password confirmation input visible": self._page.is_password_confirm_input_visible(),
-                "Signup button visible": self._page.is_signup_button_visible(),
+                "Email input visible": visible["EMAIL_INPUT"],
+                "Username input visible": visible["USERNAME_INPUT"],
+                "Password input visible": visible["PASSWORD_INPUT"],
+                "Password confirmation input visible": visible[
+                    "PASSWORD_CONFIRM_INPUT"
+                ],
+                "Signup button visible": visible["SIGNUP_BUTTON"],
             }
 
             all_valid = all(checks.values())
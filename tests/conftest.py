@@ -1,10 +1,30 @@
+import json
 import os
+import re
 import pytest
 from contextlib import contextmanager
+from pathlib import Path
 
-from framework.driver_factory import DriverFactory
+from framework.auth_state import AuthStateCache
+from framework.browser_server import running_server, server_launch_options
+from framework.driver_factory import BrowserPool, PrewarmedPagePool
+from framework.durations import TEST_DURATIONS_PATH, DurationHistory
+from framework.har import HAR_MODE, HarMissStats, har_archive
 from framework.locator import DriverType
+from framework.logger import add_step_listener, remove_step_listener
+from framework.recorder import FrameRecorder
+from framework.routing import (
+    ROUTE_SIZES_PATH,
+    ROUTE_SIZES_REPORT,
+    ROUTING_PROFILE,
+    RoutingStats,
+    get_profile,
+)
+from framework.screenshot import PlaywrightScreenshotManager, flush_screenshots
+from framework.tracing import tracer
 
+from pages.feed import FeedPage
+from pages.feed_actions import FeedPageActions
 from pages.login import LoginPage
 from pages.login_actions import LoginPageActions
 from pages.signup import SignupPage
@@ -17,6 +37,142 @@ DEBUG_URL = os.getenv("DEBUG_URL", "http://localhost:5000/")
 TEST_URL = os.getenv("TEST_URL", "https://www.instagram.com/")
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
+TRACE_DIR = os.getenv("TRACE_DIR")
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+PREWARM_PAGES = int(os.getenv("PREWARM_PAGES", "2"))
+FRAME_BUFFER = int(os.getenv("FRAME_BUFFER", "0"))
+FRAME_DIR = os.getenv("FRAME_DIR", "failures")
+
+
+def artifact_name(nodeid: str) -> str:
+    """Make a file-system safe name from a test node id"""
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+
+
+@pytest.fixture(autouse=True)
+def action_trace(request):
+    """Export per-test action spans to TRACE_DIR when it is set"""
+    if not TRACE_DIR:
+        yield
+        return
+
+    tracer.reset()
+    tracer.enabled = True
+    try:
+        yield
+    finally:
+        tracer.enabled = False
+        trace_dir = Path(TRACE_DIR)
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        name = artifact_name(request.node.nodeid)
+        tracer.export_chrome_trace(trace_dir / f"{name}.trace.json")
+        tracer.export_collapsed(trace_dir / f"{name}.folded")
+
+
+ROUTING_STATS = RoutingStats(ROUTE_SIZES_PATH)
+HAR_STATS = HarMissStats()
+TEST_DURATIONS = {}
+UNTIMED_TESTS = set()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "routing(profile): request routing profile (full, visual, functional)",
+    )
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report requests skipped by routing profiles"""
+    if ROUTING_STATS.blocked or ROUTING_STATS.stubbed:
+        terminalreporter.write_sep("-", "request routing")
+        terminalreporter.write_line(ROUTING_STATS.summary())
+    # Parallel workers report learned sizes to the runner, which merges them
+    ROUTING_STATS.save(ROUTE_SIZES_REPORT)
+    if HAR_STATS.misses:
+        terminalreporter.write_sep("-", "HAR replay")
+        terminalreporter.write_line(HAR_STATS.summary())
+        for miss in HAR_STATS.misses[:20]:
+            terminalreporter.write_line(f"  {miss}")
+
+
+def pytest_runtest_logreport(report):
+    """Sum setup, call and teardown time per test that passed"""
+    # Failed and skipped runs stop early, their time says nothing about the test
+    if report.nodeid in UNTIMED_TESTS:
+        return
+    if report.failed or report.skipped:
+        UNTIMED_TESTS.add(report.nodeid)
+        TEST_DURATIONS.pop(report.nodeid, None)
+        return
+    previous = TEST_DURATIONS.get(report.nodeid, 0.0)
+    TEST_DURATIONS[report.nodeid] = previous + report.duration
+
+
+def pytest_sessionfinish(session):
+    """Hand durations to the parallel runner, or record them directly"""
+    if not TEST_DURATIONS:
+        return
+    report_path = os.getenv("DURATION_REPORT")
+    if report_path:
+        Path(report_path).write_text(json.dumps(TEST_DURATIONS))
+        return
+    history = DurationHistory(TEST_DURATIONS_PATH)
+    history.load()
+    history.update(TEST_DURATIONS)
+    history.save()
+
+
+def routing_profile(request):
+    """Get profile from the closest routing marker, else ROUTING_PROFILE"""
+    marker = request.node.get_closest_marker("routing")
+    return get_profile(marker.args[0] if marker else ROUTING_PROFILE)
+
+
+def har_options(name: str) -> tuple:
+    """Get prepare hook and context options for HAR archive name under HAR_MODE"""
+    archive = har_archive(name, HAR_STATS)
+    if archive is None:
+        return None, {}
+    return archive.apply, archive.context_options
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Expose each phase's report on the item as rep_setup/rep_call"""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+@pytest.fixture(autouse=True)
+def frame_recorder(request):
+    """Keep the last FRAME_BUFFER frames, written to FRAME_DIR on failure"""
+    names = ("fresh_page", "authenticated_page", "base_page")
+    pages = [name for name in names if name in request.fixturenames]
+    if not FRAME_BUFFER or not pages:
+        yield None
+        return
+
+    _, page = request.getfixturevalue(pages[0])
+    recorder = FrameRecorder(
+        PlaywrightScreenshotManager(page).capture, max_frames=FRAME_BUFFER
+    )
+    add_step_listener(recorder.on_step)
+    try:
+        yield recorder
+    finally:
+        remove_step_listener(recorder.on_step)
+        report = getattr(request.node, "rep_call", None)
+        if report is not None and report.failed:
+            recorder.dump(Path(FRAME_DIR) / artifact_name(request.node.nodeid))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def screenshot_writer():
+    """Wait for background screenshots before the session ends"""
+    yield
+    flush_screenshots()
 
 
 @pytest.fixture(scope="session")
@@ -27,39 +183,134 @@ def get_test_credentials() -> tuple[str, str]:
     return test_username, test_password
 
 
-@contextmanager
-def build_context(url: str):
-    """Context manager to create and cleanup browser context"""
-    context, browser, playwright = DriverFactory.create_playwright_local(
-        browser_type="chromium", headless=HEADLESS
-    )
-    page = context.new_page()
+@pytest.fixture(scope="session")
+def browser_pool():
+    """Session-wide Playwright browsers, relaunched if they crash
 
-    try:
-        page.goto(url)
+    Connects to the browser server daemon when it runs (python -m
+    framework.browser_server start), else launches browsers locally.
+    """
+    ROUTING_STATS.load()
+    server = running_server("chromium")
+    pool = BrowserPool(
+        browser_type="chromium",
+        size=BROWSER_POOL_SIZE,
+        headless=HEADLESS,
+        routing=get_profile(ROUTING_PROFILE),
+        routing_stats=ROUTING_STATS,
+        ws_endpoint=server["ws_endpoint"] if server else None,
+        server_options=server_launch_options(server) if server else None,
+    ).start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def page_pool(browser_pool):
+    """Pages pre-navigated to the landing URL, refilled as fixtures take them"""
+    url = DEBUG_URL if DEBUG else TEST_URL
+    # HAR contexts need their archive routes before navigating, no pre-warming
+    size = 0 if HAR_MODE else PREWARM_PAGES
+    pool = PrewarmedPagePool(browser_pool, url, size=size)
+    pool.fill()
+    yield pool
+    pool.close()
+
+
+@contextmanager
+def build_context(pool: PrewarmedPagePool):
+    """Context manager to take a loaded page and cleanup its context"""
+    with pool.page() as page:
         yield page
-    finally:
-        context.close()
-        browser.close()
-        playwright.stop()
+
+
+@pytest.fixture()
+def browser_context(request, browser_pool):
+    """Fresh browser context for a single test"""
+    prepare, options = har_options(artifact_name(request.node.nodeid))
+    with browser_pool.context(routing_profile(request), prepare, **options) as context:
+        yield context
+
+
+@pytest.fixture()
+def fresh_page(request, browser_pool, page_pool):
+    """Page loaded at the landing URL in its own context, for a single test"""
+    url = DEBUG_URL if DEBUG else TEST_URL
+    if routing_profile(request) == browser_pool.routing and not HAR_MODE:
+        # Pre-warmed pages each come with a fresh context
+        with build_context(page_pool) as page:
+            yield url, page
+        return
+
+    page = request.getfixturevalue("browser_context").new_page()
+    page.goto(url)
+    yield url, page
 
 
 @pytest.fixture(scope="module")
-def base_page():
+def base_page(request, browser_pool, page_pool):
     """Base fixture that provides page object and URL"""
     url = DEBUG_URL if DEBUG else TEST_URL
-    with build_context(url) as page:
+    profile = routing_profile(request)
+    if profile == browser_pool.routing and not HAR_MODE:
+        with build_context(page_pool) as page:
+            yield url, page
+        return
+
+    # Pre-warmed pages use the default profile and no HAR, build this one directly
+    prepare, options = har_options(request.module.__name__)
+    with browser_pool.context(profile, prepare, **options) as context:
+        page = context.new_page()
+        page.goto(url)
         yield url, page
 
 
+@pytest.fixture(scope="session")
+def auth_state(browser_pool, get_test_credentials) -> Path:
+    """Storage state of a logged-in test user, logging in via UI at most once per TTL"""
+    url = DEBUG_URL if DEBUG else TEST_URL
+    username, password = get_test_credentials
+
+    def login() -> dict:
+        prepare, options = har_options("auth_state")
+        with browser_pool.context(None, prepare, **options) as context:
+            page = context.new_page()
+            page.goto(url)
+            actions = LoginPageActions(LoginPage(page, DriverType.PLAYWRIGHT))
+            actions.login(username, password)
+            if actions._page.login_form.is_visible_now():
+                raise AssertionError(f"Login as {username} failed, state not stored")
+            return context.storage_state()
+
+    return AuthStateCache().ensure(username, url, login)
+
+
 @pytest.fixture()
-def login_page(base_page):
-    """fixture for login page"""
-    url, page = base_page
+def authenticated_page(request, browser_pool, auth_state):
+    """Page of a pre-authenticated context, no UI login"""
+    url = DEBUG_URL if DEBUG else TEST_URL
+    prepare, options = har_options(artifact_name(request.node.nodeid))
+    with browser_pool.context(
+        routing_profile(request), prepare, storage_state=str(auth_state), **options
+    ) as context:
+        page = context.new_page()
+        page.goto(url)
+        yield url, page
+
+
+@pytest.fixture()
+def feed_page(authenticated_page):
+    """fixture for feed page of a logged-in user"""
+    _, page = authenticated_page
+    return FeedPageActions(FeedPage(page, DriverType.PLAYWRIGHT))
+
+
+@pytest.fixture()
+def login_page(fresh_page):
+    """fixture for login page, its context is discarded after the test"""
+    _, page = fresh_page
     login_page = LoginPage(page, DriverType.PLAYWRIGHT)
-    login_page_actions = LoginPageActions(login_page)
-    yield login_page_actions
-    logout(url, login_page_actions)
+    return LoginPageActions(login_page)
 
 
 @pytest.fixture(scope="module")
@@ -1,5 +1,9 @@
+import json
+import subprocess
 from urllib.parse import urlparse
 
+import pytest
+
 
 def logout(_url, page):
     """Make logout"""
@@ -9,3 +13,100 @@ def logout(_url, page):
     logout_url = f"{base_url}/logout"
     page._page._driver.goto(logout_url)
     page._page._driver.goto(url)
+
+
+# Minimal DOM for running framework.dom / screenshot scripts without a browser.
+# Elements are described as dicts: {"css": [selectors it matches], "id", "text",
+# "width", "height", "visibility", "disabled", "attrs", "children"}
+FAKE_DOM_JS = """
+class FakeStyle {
+    constructor(el) { this.el = el; }
+    setProperty(name, value, priority) {
+        const rule = `${name}: ${value}${priority ? " !" + priority : ""};`;
+        const current = this.el.getAttribute("style");
+        this.el.setAttribute("style", current ? `${current} ${rule}` : rule);
+    }
+    getPropertyValue(name) {
+        const match = (this.el.getAttribute("style") || "")
+            .split(";")
+            .map((rule) => rule.split(":").map((part) => part.trim()))
+            .filter(([key]) => key === name)
+            .pop();
+        return match ? match[1].replace(" !important", "") : "";
+    }
+}
+class FakeElement {
+    constructor(spec) {
+        Object.assign(this, {
+            css: [], id: null, text: "", width: 10, height: 10,
+            visibility: "visible", disabled: false,
+        }, spec);
+        this.attrs = Object.assign({}, spec.attrs || {});
+        this.children = (spec.children || []).map((child) => new FakeElement(child));
+        this.style = new FakeStyle(this);
+    }
+    get textContent() {
+        return this.text + this.children.map((child) => child.textContent).join("");
+    }
+    get innerText() { return this.textContent; }
+    getBoundingClientRect() { return {width: this.width, height: this.height}; }
+    getAttribute(name) { return name in this.attrs ? this.attrs[name] : null; }
+    setAttribute(name, value) { this.attrs[name] = String(value); }
+    removeAttribute(name) { delete this.attrs[name]; }
+    hasAttribute(name) { return name in this.attrs; }
+    all() { return [this, ...this.children.flatMap((child) => child.all())]; }
+}
+const body = new FakeElement({children: input.elements});
+globalThis.window = globalThis;
+globalThis.document = {
+    body: body,
+    querySelectorAll: (selector) =>
+        body.all().filter((el) => el.css.includes(selector)),
+    getElementById: (id) => body.all().find((el) => el.id === id) || null,
+};
+globalThis.getComputedStyle = (el) => ({visibility: el.visibility});
+globalThis.requestAnimationFrame = (callback) => setTimeout(callback, 16);
+const arg = input.elements_arg === undefined
+    ? input.arg
+    : document.querySelectorAll(input.elements_arg);
+Promise.resolve((SCRIPT)(arg)).then(
+    (value) => console.log(JSON.stringify({
+        value: value instanceof FakeElement ? value.attrs : value,
+        attrs: body.all().slice(1).map((el) => el.attrs),
+    })),
+    (error) => console.log(JSON.stringify({error: String(error)})),
+);
+"""
+
+
+def run_fake_dom(script: str, elements: list, arg=None, elements_arg=None) -> dict:
+    """
+    Run a JS function expression against a fake DOM in Playwright's node
+
+    Args:
+        script: Function expression, e.g. framework.dom.PROBE_JS
+        elements: Element specs, see FAKE_DOM_JS
+        arg: Argument passed to the function
+        elements_arg: CSS selector; pass the matching elements instead of arg
+
+    Returns:
+        {"value": result, "attrs": attributes of every element afterwards}
+    """
+    driver = pytest.importorskip("playwright._impl._driver")
+    node, _ = driver.compute_driver_executable()
+    source = "const input = JSON.parse(process.argv[1]);\n" + FAKE_DOM_JS.replace(
+        "SCRIPT", script
+    )
+    payload = {"elements": elements, "arg": arg}
+    if elements_arg is not None:
+        payload["elements_arg"] = elements_arg
+    completed = subprocess.run(
+        [node, "-e", source, json.dumps(payload)],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    assert "error" not in result, result["error"]
+    return result
@@ -0,0 +1,143 @@
+import asyncio
+from framework.locator import DriverType, Locator, LocatorType
+from framework.logger import add_step_listener, log_action, remove_step_listener
+from framework.tracing import tracer
+from framework.waiter import AsyncPlaywrightWaitManager, CountChanged, UrlChanged
+from pages.login import LoginPage
+from pages.login_actions import LoginPageActions
+
+
+class AsyncPage:
+    @log_action("Checking")
+    async def check(self):
+        await asyncio.sleep(0)
+        return True
+
+
+class AsyncActions:
+    def __init__(self):
+        self._page = AsyncPage()
+
+    @log_action("Doing")
+    async def do(self):
+        await self._page.check()
+        raise ValueError("boom")
+
+
+class FakePage:
+    url = "https://example.com/"
+
+
+class CountingManager(AsyncPlaywrightWaitManager):
+    """Count grows by one per check, no browser involved"""
+
+    def __init__(self):
+        super().__init__(FakePage(), timeout=500)
+        self.counts = iter([2, 2, 2, 3])
+
+    async def count_now(self, locator):
+        return next(self.counts)
+
+
+def test_async_steps_are_traced():
+    tracer.reset()
+    tracer.enabled = True
+    try:
+        asyncio.run(AsyncActions().do())
+    except ValueError:
+        pass
+    finally:
+        tracer.enabled = False
+
+    assert set(tracer.collapsed_stacks()) == {
+        "AsyncActions.Doing",
+        "AsyncActions.Doing;AsyncPage.Checking",
+    }
+    root = next(span for span in tracer.spans if span.parent is None)
+    assert root.error == "ValueError"
+
+
+def test_async_postconditions():
+    manager = CountingManager()
+    locator = Locator(LocatorType.CSS, "article")
+
+    async def scenario():
+        changed = CountChanged(locator) | UrlChanged()
+        await changed.arm_async(manager)
+        assert changed.conditions[0].previous == 2
+        return await changed.wait_async(manager, 500)
+
+    assert asyncio.run(scenario())
+
+
+class FakeAsyncPage:
+    """Async Playwright Page stand-in whose evaluate() resolves to results"""
+
+    def __init__(self, results):
+        self.results = results
+
+    def locator(self, selector):
+        pass
+
+    def on(self, event, callback):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        await asyncio.sleep(0)
+        if isinstance(self.results, Exception):
+            raise self.results
+        return self.results
+
+
+def test_sync_page_steps_are_logged_when_awaited():
+    steps = []
+
+    def listener(owner, action_name, error):
+        steps.append(action_name)
+
+    page = LoginPage(FakeAsyncPage([True] * 4), DriverType.PLAYWRIGHT_ASYNC)
+    add_step_listener(listener)
+    tracer.reset()
+    tracer.enabled = True
+    try:
+        displayed = page.is_page_displayed()
+        assert steps == [] and tracer.spans == []
+        assert asyncio.run(displayed)
+    finally:
+        tracer.enabled = False
+        remove_step_listener(listener)
+
+    assert steps == ["Checking if login page is displayed"]
+    assert set(tracer.collapsed_stacks()) == {
+        "LoginPage.Checking if login page is displayed",
+        "LoginPage.Checking if login page is displayed;LoginPage.Probing elements",
+    }
+
+
+def test_action_class_steps_are_awaitable():
+    steps = []
+
+    def listener(owner, action_name, error):
+        steps.append((type(owner).__name__, action_name))
+
+    page = LoginPage(FakeAsyncPage([True] * 4), DriverType.PLAYWRIGHT_ASYNC)
+    actions = LoginPageActions(page)
+    add_step_listener(listener)
+    try:
+        displayed = actions.is_page_displayed()
+        assert steps == []
+        assert asyncio.run(displayed) is True
+    finally:
+        remove_step_listener(listener)
+
+    assert steps == [("LoginPageActions", "Checking if login page is displayed")]
+
+
+def test_async_display_check_failure_counts_as_not_displayed():
+    page = LoginPage(FakeAsyncPage(RuntimeError("closed")), DriverType.PLAYWRIGHT_ASYNC)
+    assert asyncio.run(page.is_page_displayed()) is False
+
+
+def test_async_now_query_failure_is_false():
+    page = LoginPage(FakeAsyncPage(RuntimeError("closed")), DriverType.PLAYWRIGHT_ASYNC)
+    assert asyncio.run(page.sign_up_link.is_visible_now()) is False
@@ -0,0 +1,57 @@
+import os
+import time
+
+from framework.auth_state import AuthStateCache, selenium_cookies
+
+STATE = {
+    "cookies": [
+        {
+            "name": "sessionid",
+            "value": "abc",
+            "domain": ".example.com",
+            "path": "/",
+            "expires": 1900000000.5,
+            "httpOnly": True,
+            "secure": True,
+            "sameSite": "Lax",
+        },
+        {"name": "other", "value": "x", "domain": "other.org", "path": "/"},
+    ],
+    "origins": [],
+}
+
+
+def test_login_runs_once_until_ttl_expires(tmp_path):
+    cache = AuthStateCache(tmp_path, ttl=60)
+    calls = []
+
+    def login():
+        calls.append(1)
+        return STATE
+
+    path = cache.ensure("user", "https://www.example.com/", login)
+    assert cache.ensure("user", "https://www.example.com/", login) == path
+    assert cache.load(path) == STATE
+    assert len(calls) == 1
+
+    expired = time.time() - 120
+    os.utime(path, (expired, expired))
+    cache.ensure("user", "https://www.example.com/", login)
+    assert len(calls) == 2
+
+
+def test_selenium_cookies_keep_only_matching_domain():
+    cookies = selenium_cookies(STATE, "https://www.example.com/accounts/")
+
+    assert cookies == [
+        {
+            "name": "sessionid",
+            "value": "abc",
+            "path": "/",
+            "secure": True,
+            "httpOnly": True,
+            "domain": ".example.com",
+            "expiry": 1900000000,
+            "sameSite": "Lax",
+        }
+    ]
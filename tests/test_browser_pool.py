@@ -0,0 +1,239 @@
+from types import SimpleNamespace
+
+import pytest
+
+from framework.driver_factory import BrowserPool, PrewarmedPagePool
+from framework.routing import RoutingStats, get_profile
+
+URL = "https://app.test/"
+
+
+class FakePage:
+    def __init__(self, lands_on):
+        self.lands_on = lands_on
+        self.url = "about:blank"
+
+    def evaluate(self, script, url):
+        pass
+
+    def wait_for_url(self, predicate, wait_until, timeout):
+        if not predicate(self.lands_on):
+            raise TimeoutError(f"Timeout {timeout}ms exceeded")
+        self.url = self.lands_on
+
+    def goto(self, url):
+        self.url = url
+
+
+class FakeContext:
+    def __init__(self, lands_on, options=None):
+        self.lands_on = lands_on
+        self.options = options or {}
+        self.closed = False
+        self.calls = []
+
+    def on(self, event, callback):
+        self.calls.append(("on", event))
+
+    def route(self, pattern, handler):
+        self.calls.append(("route", pattern))
+
+    def new_page(self):
+        return FakePage(self.lands_on)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowserPool:
+    """Each new context's page navigates to the next URL in lands_on"""
+
+    def __init__(self, *lands_on):
+        self.lands_on = list(lands_on)
+        self.contexts = []
+
+    def new_context(self, **options):
+        lands_on = self.lands_on.pop(0) if len(self.lands_on) > 1 else self.lands_on[0]
+        self.contexts.append(FakeContext(lands_on))
+        return self.contexts[-1]
+
+
+def test_acquire_takes_a_warm_page_and_refills():
+    pool = PrewarmedPagePool(FakeBrowserPool(URL + "home"), URL, size=2)
+    pool.fill()
+
+    context, page = pool.acquire()
+
+    assert page.url == URL + "home"
+    assert pool.stats() == {"spares": 2, "warm_hits": 1, "cold_starts": 0}
+
+
+def test_error_pages_are_not_ready():
+    browsers = FakeBrowserPool("chrome-error://chromewebdata/", URL)
+    pool = PrewarmedPagePool(browsers, URL, size=1)
+    pool.fill()
+
+    context, page = pool.acquire()
+
+    assert browsers.contexts[0].closed
+    assert page.url == URL
+    assert pool.stats()["cold_starts"] == 1
+
+
+def test_acquire_tries_each_spare_once_when_all_fail():
+    browsers = FakeBrowserPool("chrome-error://chromewebdata/")
+    pool = PrewarmedPagePool(browsers, URL, size=2, timeout=10)
+    pool.fill()
+
+    context, page = pool.acquire()
+
+    # Two failed spares and the cold start, then a refill of two
+    assert len(browsers.contexts) == 5
+    assert all(context.closed for context in browsers.contexts[:2])
+    assert pool.stats() == {"spares": 2, "warm_hits": 0, "cold_starts": 1}
+
+
+class FakeBrowser:
+    def __init__(self, how):
+        self.how = how
+        self.connected = True
+        # Reports connected, but dies on use
+        self.broken = False
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self, **options):
+        if self.broken:
+            self.connected = False
+        if not self.connected:
+            raise RuntimeError("Target closed")
+        if "storage_state" in options:
+            raise FileNotFoundError(options["storage_state"])
+        self.contexts.append(FakeContext(URL, options))
+        return self.contexts[-1]
+
+    def close(self):
+        self.connected = False
+
+
+class FakeBrowserType:
+    def launch(self, **options):
+        return FakeBrowser(("launch", options))
+
+    def connect(self, ws_endpoint):
+        if ws_endpoint.endswith("/down"):
+            raise ConnectionError("connect ECONNREFUSED")
+        return FakeBrowser(("connect", ws_endpoint))
+
+
+def fake_browser_pool(**kwargs) -> BrowserPool:
+    pool = BrowserPool(**kwargs)
+    browser_type = FakeBrowserType()
+    pool._playwright = SimpleNamespace(
+        chromium=browser_type, firefox=browser_type, webkit=browser_type
+    )
+    return pool
+
+
+class Warnings(list):
+    def warning(self, message):
+        self.append(message)
+
+
+def test_server_launched_differently_is_reported():
+    pool = fake_browser_pool(
+        headless=False,
+        ws_endpoint="ws://127.0.0.1:1/t",
+        server_options={"headless": True},
+    )
+    pool._logger = Warnings()
+    pool.start()
+
+    assert pool._browsers[0].how == ("connect", "ws://127.0.0.1:1/t")
+    assert pool._logger == [
+        "Browser server ws://127.0.0.1:1/t was launched with {'headless': True}, "
+        "not {'headless': False} (differing: ['headless'])"
+    ]
+
+    pool = fake_browser_pool(
+        ws_endpoint="ws://127.0.0.1:1/t", launch_options={"slow_mo": 50}
+    )
+    pool._logger = Warnings()
+    pool.start()
+    assert "ignored by browser server" in pool._logger[0]
+
+
+def test_contexts_round_robin_over_browsers():
+    pool = fake_browser_pool(size=2, launch_options={"slow_mo": 5}).start()
+
+    contexts = [pool.new_context(locale="de-DE") for _ in range(3)]
+
+    first, second = pool._browsers
+    assert first.how == ("launch", {"headless": True, "slow_mo": 5})
+    assert first.contexts == [contexts[0], contexts[2]]
+    assert second.contexts == [contexts[1]]
+    assert contexts[0].options == {"locale": "de-DE"}
+    assert pool.stats() == {
+        "browsers": 2,
+        "launches": 2,
+        "relaunches": 0,
+        "contexts": 3,
+    }
+
+
+def test_crashed_browser_is_relaunched():
+    pool = fake_browser_pool().start()
+    crashed = pool._browsers[0]
+    crashed.connected = False
+
+    pool.new_context()
+
+    assert pool._browsers[0] is not crashed
+    assert pool.stats()["relaunches"] == 1
+
+
+def test_browser_dying_between_check_and_use_is_retried():
+    pool = fake_browser_pool().start()
+    dying = pool._browsers[0]
+    dying.broken = True
+
+    context = pool.new_context()
+
+    assert pool._browsers[0] is not dying
+    assert pool._browsers[0].contexts == [context]
+
+
+def test_caller_errors_do_not_recycle_a_healthy_browser():
+    pool = fake_browser_pool().start()
+    browser = pool._browsers[0]
+
+    with pytest.raises(FileNotFoundError):
+        pool.new_context(storage_state="missing.json")
+
+    assert pool._browsers[0] is browser and browser.connected
+    assert pool.stats()["relaunches"] == 0
+
+
+def test_prepare_runs_before_routing_and_context_is_closed():
+    stats = RoutingStats()
+    pool = fake_browser_pool(routing=get_profile("functional"), routing_stats=stats)
+    pool.start()
+
+    def prepare(context):
+        context.calls.append("prepare")
+
+    with pool.context(prepare=prepare) as ctx:
+        assert ctx.calls == ["prepare", ("on", "response"), ("route", "**/*")]
+    assert ctx.closed
+
+    with pool.context(get_profile("full")) as ctx:
+        assert ctx.calls == [("on", "response")]
+
+
+def test_unreachable_server_falls_back_to_launching():
+    pool = fake_browser_pool(ws_endpoint="ws://127.0.0.1:1/down").start()
+
+    assert pool._browsers[0].how[0] == "launch"
+    assert pool.ws_endpoint is None
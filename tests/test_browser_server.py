@@ -0,0 +1,141 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+from framework import browser_server
+
+posix_only = pytest.mark.skipif(os.name == "nt", reason="POSIX process groups")
+
+
+def spawn(code: str) -> subprocess.Popen:
+    """Start a process group leader whose command line mentions launch-server
+
+    code prints "ready" once it is set up.
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-c", code, "launch-server"],
+        stdout=subprocess.PIPE,
+        start_new_session=True,
+    )
+    assert process.stdout.readline() == b"ready\n"
+    return process
+
+
+def write_state(path, port, browser="chromium"):
+    path.write_text(
+        json.dumps(
+            {
+                "pid": 0,
+                "browser": browser,
+                "ws_endpoint": f"ws://127.0.0.1:{port}/token",
+            }
+        )
+    )
+
+
+def test_running_endpoint_needs_a_listening_server(tmp_path):
+    state = tmp_path / "server.json"
+    assert browser_server.running_endpoint("chromium", state) is None
+
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        port = server.getsockname()[1]
+        write_state(state, port)
+        endpoint = f"ws://127.0.0.1:{port}/token"
+        assert browser_server.running_endpoint("chromium", state) == endpoint
+        assert browser_server.running_endpoint("firefox", state) is None
+
+    assert browser_server.running_endpoint("chromium", state) is None
+
+
+def test_connect_or_launch_skips_a_server_in_another_headless_mode(
+    tmp_path, monkeypatch
+):
+    calls = []
+    factory = browser_server.DriverFactory
+    monkeypatch.setattr(
+        factory, "create_playwright_remote", lambda *args: calls.append(args)
+    )
+    monkeypatch.setattr(
+        factory, "create_playwright_local", lambda *args: calls.append(args)
+    )
+    warnings = []
+    monkeypatch.setattr(browser_server.logger, "warning", warnings.append)
+    state = tmp_path / "server.json"
+
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        write_state(state, server.getsockname()[1])
+        endpoint = f"ws://127.0.0.1:{server.getsockname()[1]}/token"
+
+        browser_server.connect_or_launch("chromium", True, state)
+        browser_server.connect_or_launch("chromium", False, state)
+
+    assert calls == [(endpoint, "chromium"), ("chromium", False)]
+    assert warnings == [
+        f"Browser server {endpoint} runs with headless=True, launching locally"
+    ]
+
+
+def test_stop_removes_stale_state(tmp_path):
+    state = tmp_path / "server.json"
+    write_state(state, browser_server._free_port())
+    assert browser_server.stop(state)
+    assert not state.exists()
+    assert not browser_server.stop(state)
+
+
+def write_pid(path, pid):
+    port = browser_server._free_port()
+    path.write_text(json.dumps({"pid": pid, "ws_endpoint": f"ws://127.0.0.1:{port}/t"}))
+
+
+@posix_only
+def test_stop_kills_a_hung_server(tmp_path):
+    state = tmp_path / "server.json"
+    process = spawn(
+        "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+        "print('ready', flush=True); time.sleep(60)"
+    )
+    try:
+        # Not listening and ignoring SIGTERM, still stopped
+        write_pid(state, process.pid)
+        assert browser_server.stop(state, timeout=0.5)
+        assert process.wait(timeout=5) == -9
+        assert not state.exists()
+    finally:
+        process.kill()
+        process.wait()
+        process.stdout.close()
+
+
+@posix_only
+def test_stop_leaves_other_processes_alone(tmp_path):
+    state = tmp_path / "server.json"
+    other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    try:
+        write_pid(state, other.pid)
+        assert browser_server.stop(state, timeout=0.5)
+        assert other.poll() is None
+        assert not state.exists()
+    finally:
+        other.kill()
+        other.wait()
+
+
+def test_failed_start_removes_its_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "gettempdir", lambda: str(tmp_path))
+    monkeypatch.setattr(sys, "executable", "false")
+
+    with pytest.raises(RuntimeError, match="did not start"):
+        browser_server.start(path=tmp_path / "server.json", timeout=5)
+
+    assert not list(tmp_path.glob("browser-server-*.json"))
+    assert not (tmp_path / "server.json").exists()
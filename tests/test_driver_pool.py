@@ -0,0 +1,93 @@
+import threading
+import time
+import pytest
+from framework.driver_factory import SeleniumDriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.alive = True
+        self.quit_called = False
+        self.resets = []
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise ConnectionError("session gone")
+        return "about:blank"
+
+    def delete_all_cookies(self):
+        self.resets.append("cookies")
+
+    def execute_script(self, script):
+        self.resets.append("storage")
+
+    def get(self, url):
+        self.resets.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_one_driver_pinned_per_thread():
+    def flow(driver, item):
+        assert driver.thread == threading.get_ident()
+        time.sleep(0.01)
+        return item * 2
+
+    with SeleniumDriverPool(size=3, create_driver=FakeDriver) as pool:
+        assert pool.map(flow, range(12)) == [item * 2 for item in range(12)]
+        drivers = list(pool._drivers)
+        stats = pool.stats()
+
+    assert stats["flows"] == 12
+    assert 1 <= stats["drivers"] <= 3
+    assert all(driver.quit_called for driver in drivers)
+
+
+def test_submit_blocks_when_queue_is_full():
+    release = threading.Event()
+    pool = SeleniumDriverPool(size=1, create_driver=FakeDriver, max_pending=1)
+    pool.submit(lambda driver: release.wait())
+    pool.submit(lambda driver: None)
+
+    submitted = threading.Event()
+    producer = threading.Thread(
+        target=lambda: (pool.submit(lambda driver: None), submitted.set())
+    )
+    producer.start()
+    assert not submitted.wait(0.1)
+    release.set()
+    assert submitted.wait(1)
+    producer.join()
+    pool.close()
+
+
+def test_dead_driver_is_replaced():
+    def crash(driver):
+        driver.alive = False
+        raise RuntimeError("browser crashed")
+
+    with SeleniumDriverPool(size=1, create_driver=FakeDriver) as pool:
+        with pytest.raises(RuntimeError):
+            pool.submit(crash).result()
+        assert pool.submit(lambda driver: driver.alive).result()
+        assert pool.stats()["launches"] == 2
+        assert pool.stats()["relaunches"] == 1
+
+
+def test_state_is_reset_after_each_flow():
+    with SeleniumDriverPool(size=1, create_driver=FakeDriver) as pool:
+        driver = pool.submit(lambda driver: driver).result()
+        assert driver.resets == ["cookies", "storage", "about:blank"]
+
+
+def test_driver_that_died_while_idle_is_replaced_before_the_flow():
+    with SeleniumDriverPool(size=1, create_driver=FakeDriver) as pool:
+        first = pool.submit(lambda driver: driver).result()
+        first.alive = False
+        second = pool.submit(lambda driver: driver).result()
+
+        assert second is not first and first.quit_called
+        assert pool.stats()["relaunches"] == 1
@@ -0,0 +1,51 @@
+import time
+
+from framework.durations import DurationHistory, lpt_assign, makespan
+
+
+def test_estimate_falls_back_to_module_then_global_median():
+    history = DurationHistory(None)
+    history.update(
+        {
+            "tests/test_login.py::test_a": 1.0,
+            "tests/test_login.py::test_b": 3.0,
+            "tests/test_sign_up.py::test_c": 9.0,
+        }
+    )
+
+    assert history.estimate("tests/test_login.py::test_new") == 2.0
+    assert history.estimate("tests/test_feed.py::test_new") == 3.0
+    assert DurationHistory(None).estimate("tests/test_feed.py::test_new") == 1.0
+
+
+def test_update_smooths_measurements():
+    history = DurationHistory(None, smoothing=0.5)
+    history.update({"t::a": 4.0})
+    history.update({"t::a": 2.0})
+
+    assert history.estimate("t::a") == 3.0
+
+
+def test_lpt_separates_slow_tests():
+    history = DurationHistory(None)
+    history.update({"t::slow1": 8, "t::slow2": 7, "t::a": 3, "t::b": 3, "t::c": 2})
+    units = [["t::slow1"], ["t::a"], ["t::slow2"], ["t::b"], ["t::c"]]
+
+    shards = lpt_assign(units, 2, history)
+
+    assert not {"t::slow1", "t::slow2"} <= set(shards[0])
+    assert makespan(shards, history) == 12
+
+
+def test_estimates_for_many_unknown_tests_are_fast():
+    history = DurationHistory(None)
+    history.update({f"tests/test_{i % 100}.py::test_{i}": 1.0 for i in range(10000)})
+    unknown = [f"tests/test_{i % 200}.py::test_new_{i}" for i in range(10000)]
+
+    started = time.monotonic()
+    estimates = [history.estimate(node_id) for node_id in unknown]
+    assert time.monotonic() - started < 0.5
+    assert set(estimates) == {1.0}
+
+    history.update({"tests/test_new.py::test_a": 5.0})
+    assert history.estimate("tests/test_new.py::test_b") == 5.0
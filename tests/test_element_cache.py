@@ -0,0 +1,96 @@
+import gc
+from types import SimpleNamespace
+
+from framework.locator import DriverType
+from framework.waiter import Postcondition
+from pages.feed import FeedPage
+from pages._base import _navigation_caches
+from pages.login import LoginPage
+
+
+class FakePage:
+    """Minimal stand-in for a Playwright Page"""
+
+    def __init__(self):
+        self.listeners = {}
+
+    def locator(self, selector):
+        return SimpleNamespace(nth=lambda index: (selector, index))
+
+    def on(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def navigate(self, main_frame: bool = True):
+        parent = None if main_frame else object()
+        for callback in self.listeners.get("framenavigated", []):
+            callback(SimpleNamespace(parent_frame=parent))
+
+
+def test_element_is_reused_until_navigation():
+    page = FakePage()
+    login_page = LoginPage(page, DriverType.PLAYWRIGHT)
+
+    first = login_page.username_input
+    assert login_page.username_input is first
+    assert login_page.element_cache_stats()["hits"] == 1
+    assert login_page.element_cache_stats()["misses"] == 1
+
+    page.navigate(main_frame=False)
+    assert login_page.username_input is first
+
+    page.navigate()
+    assert login_page.username_input is not first
+    assert login_page.element_cache_stats()["misses"] == 2
+
+
+def test_collection_count_is_cached_until_dom_changes():
+    page = FakePage()
+    page.evaluate = lambda script, arg: page.evaluations.append(arg) or 3
+    page.evaluations = []
+    feed_page = FeedPage(page, DriverType.PLAYWRIGHT)
+
+    posts = feed_page.post_items
+    assert len(posts) == 3
+    assert len(posts[0:2]) == 2
+    assert len(page.evaluations) == 1
+
+    feed_page.like_button._mark_dom_changed()
+    assert len(posts) == 3
+    assert len(page.evaluations) == 2
+
+
+def test_one_navigation_listener_per_page():
+    page = FakePage()
+    pages = [LoginPage(page, DriverType.PLAYWRIGHT) for _ in range(5)]
+    assert len(page.listeners["framenavigated"]) == 1
+
+    first = pages[-1].username_input
+    page.navigate()
+    assert pages[-1].username_input is not first
+
+    del pages, first
+    gc.collect()
+    current = LoginPage(page, DriverType.PLAYWRIGHT)
+    assert len(page.listeners["framenavigated"]) == 1
+    assert list(_navigation_caches[page]) == [current._element_cache]
+
+
+class Holds(Postcondition):
+    def check(self, manager):
+        return True
+
+
+def test_collection_count_expires_on_perform_and_is_truthy_without_count():
+    page = FakePage()
+    page.evaluate = lambda script, arg: page.evaluations.append(arg) or 3
+    page.evaluations = []
+    feed_page = FeedPage(page, DriverType.PLAYWRIGHT)
+
+    posts = feed_page.post_items
+    assert posts
+    assert page.evaluations == []
+
+    assert len(posts) == 3
+    feed_page.perform(lambda: None, Holds())
+    assert len(posts) == 3
+    assert len(page.evaluations) == 2
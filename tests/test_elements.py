@@ -0,0 +1,130 @@
+from framework import dom
+from framework.element import ManyWebElements, WebElement, element, elements
+from framework.locator import DriverType, Locator, LocatorType
+from pages._base import BasePage
+from tests.helper import run_fake_dom
+
+ELEMENTS = [
+    {"css": ["li"], "text": "one", "attrs": {"data-id": "1"}},
+    {"css": ["li"], "text": "two", "attrs": {"data-id": "2"}},
+    {"css": ["li", ".hidden"], "text": "three", "width": 0},
+]
+
+
+class FakeDomPage:
+    """Playwright Page stand-in evaluating scripts against the fake DOM"""
+
+    def __init__(self, elements=ELEMENTS):
+        self.elements = elements
+        self.scripts = 0
+
+    def locator(self, selector):
+        pass
+
+    def on(self, event, callback):
+        pass
+
+    def evaluate(self, script, arg=None):
+        self.scripts += 1
+        return run_fake_dom(script, self.elements, arg)["value"]
+
+
+class Locators:
+    ITEM = Locator(LocatorType.CSS, "li")
+    HIDDEN = Locator(LocatorType.CSS, ".hidden")
+    MISSING = Locator(LocatorType.CSS, "nav")
+
+
+class ListPage(BasePage):
+    def __init__(self, driver):
+        super().__init__(driver, DriverType.PLAYWRIGHT)
+        self._locators = Locators()
+
+    @element("ITEM")
+    def item(self) -> WebElement:
+        pass
+
+    @element("ITEM")
+    def first_item(self) -> WebElement:
+        pass
+
+    @elements("ITEM")
+    def items(self) -> ManyWebElements:
+        pass
+
+    @element("HIDDEN")
+    def hidden(self) -> WebElement:
+        pass
+
+    @element("MISSING")
+    def missing(self) -> WebElement:
+        pass
+
+    generated = [element(name)(lambda self: None) for name in ("HIDDEN", "MISSING")]
+    hidden_alias, missing_alias = generated
+
+
+def test_now_queries():
+    page = ListPage(FakeDomPage())
+    assert page.item.is_presented_now()
+    assert page.item.is_visible_now()
+    assert not page.item.is_hidden_now()
+    assert page.hidden.is_presented_now()
+    assert page.hidden.is_hidden_now()
+    assert not page.missing.is_presented_now()
+    assert page.missing.is_hidden_now()
+    assert page.items.count_now() == 3
+
+
+class NavigatingPage(FakeDomPage):
+    def evaluate(self, script, arg=None):
+        raise RuntimeError("Execution context was destroyed")
+
+
+def test_now_queries_fail_as_false():
+    page = ListPage(NavigatingPage())
+    assert not page.item.is_presented_now()
+    assert not page.item.is_visible_now()
+
+
+def test_extract_and_attributes_in_one_script():
+    driver = FakeDomPage()
+    items = ListPage(driver).items
+
+    fields = {"text": "el.textContent", "id": "el.getAttribute('data-id')"}
+    assert items.extract(fields) == [
+        {"text": "one", "id": "1"},
+        {"text": "two", "id": "2"},
+        {"text": "three", "id": None},
+    ]
+    assert items.get_all_attributes("data-id") == ["1", "2", None]
+    assert items.get_all_text() == ["one", "two", "three"]
+    assert driver.scripts == 3
+
+
+def test_extract_without_matches():
+    locator = Locator(LocatorType.CSS, "nav")
+    driver = FakeDomPage()
+    assert dom.extract(driver, DriverType.PLAYWRIGHT, locator, {"a": "1"}) == []
+
+
+def test_descriptor_cache_hits_and_invalidation():
+    page = ListPage(FakeDomPage())
+    item = page.item
+    assert page.item is item
+    assert page.element_cache_stats()["hits"] == 1
+
+    page.invalidate_elements()
+    assert page.item is not item
+
+
+def test_descriptor_cache_keys():
+    page = ListPage(FakeDomPage())
+    # Same locator and wrapper type share one element
+    assert page.first_item is page.item
+    # element() and elements() on one locator do not collide
+    assert isinstance(page.items, ManyWebElements)
+    assert not isinstance(page.item, ManyWebElements)
+    # Properties with the same function name keep their own locators
+    assert page.hidden_alias._locator is Locators.HIDDEN
+    assert page.missing_alias._locator is Locators.MISSING
@@ -0,0 +1,20 @@
+from framework.locator import DriverType
+from pages.feed_actions import FeedPageActions
+from pages.login import LoginPage
+from tests.helper import logout
+
+
+def test_feed_is_displayed_after_login(feed_page: FeedPageActions):
+    # Logged in from stored state, no login form on the way
+    assert feed_page.is_page_displayed(), "Feed page not displayed"
+    assert feed_page.is_nav_bar_visible(), "Navigation bar not visible"
+
+
+def test_logout_returns_to_login(authenticated_page, feed_page: FeedPageActions):
+    url, page = authenticated_page
+    assert feed_page.is_page_displayed(), "Feed page not displayed"
+
+    logout(url, feed_page)
+
+    login_page = LoginPage(page, DriverType.PLAYWRIGHT)
+    assert login_page.is_page_displayed(), "Login page not displayed after logout"
@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import pytest
+
+from framework import har
+from framework.har import HarArchive, HarMissStats, har_archive
+
+
+class FakeContext:
+    def __init__(self):
+        self.calls = []
+
+    def route(self, pattern, handler):
+        self.calls.append(("route", pattern))
+
+    def route_from_har(self, path, **options):
+        self.calls.append(("har", path.name, options))
+
+    def route_web_socket(self, pattern, handler):
+        self.calls.append(("web_socket", pattern))
+
+
+class FakeRoute:
+    def __init__(self, url="https://app.test/api/feed"):
+        self.request = SimpleNamespace(method="GET", url=url)
+        self.answer = None
+
+    def abort(self, error_code):
+        self.answer = ("abort", error_code)
+
+    def fulfill(self, status, body):
+        self.answer = ("fulfill", status)
+
+
+def test_unknown_mode_or_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="HAR mode"):
+        HarArchive(tmp_path / "a.har", "replays")
+    with pytest.raises(ValueError, match="miss policy"):
+        HarArchive(tmp_path / "a.har", "replay", "loose")
+
+
+def test_record_updates_the_archive(tmp_path):
+    context = FakeContext()
+    HarArchive(tmp_path / "hars" / "a.har", "record").apply(context)
+
+    assert (tmp_path / "hars").is_dir()
+    assert context.calls == [
+        (
+            "har",
+            "a.har",
+            {"update": True, "update_content": "embed", "update_mode": "minimal"},
+        )
+    ]
+
+
+def test_replay_routes_misses_before_the_archive(tmp_path):
+    (tmp_path / "a.har").write_text("{}")
+    context = FakeContext()
+    HarArchive(tmp_path / "a.har", "replay").apply(context)
+
+    assert context.calls == [
+        ("route", "**/*"),
+        ("har", "a.har", {"not_found": "fallback"}),
+        ("web_socket", "**/*"),
+    ]
+
+
+def test_missing_archive_fails_strict_replay(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        HarArchive(tmp_path / "a.har", "replay").apply(FakeContext())
+
+    context = FakeContext()
+    HarArchive(tmp_path / "a.har", "replay", "lenient").apply(context)
+    assert context.calls == [("route", "**/*"), ("web_socket", "**/*")]
+
+
+def test_misses_are_counted_and_answered_by_policy(tmp_path):
+    stats = HarMissStats()
+    route = FakeRoute()
+    HarArchive(tmp_path / "a.har", "replay", stats=stats)._miss(route)
+    assert route.answer == ("abort", "internetdisconnected")
+
+    route = FakeRoute("https://app.test/api/me")
+    HarArchive(tmp_path / "b.har", "replay", "lenient", stats)._miss(route)
+    assert route.answer == ("fulfill", 404)
+
+    assert stats.misses == [
+        "a.har: GET https://app.test/api/feed",
+        "b.har: GET https://app.test/api/me",
+    ]
+    assert stats.summary() == "2 requests not found in HAR archives"
+
+
+def test_har_archive_follows_har_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(har, "HAR_MODE", "")
+    assert har_archive("login") is None
+
+    monkeypatch.setattr(har, "HAR_MODE", "replay")
+    monkeypatch.setattr(har, "HAR_DIR", str(tmp_path))
+    archive = har_archive("login")
+    assert archive.path == tmp_path / "login.har"
+    assert archive.context_options == {"service_workers": "block"}
@@ -0,0 +1,89 @@
+import json
+import logging
+
+from framework.logger import (
+    LOG_JSONL,
+    _DeferredQueueHandler,
+    _Truncated,
+    configure_logging,
+    log_action,
+    setup_logger,
+)
+
+
+class Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class Inner:
+    @log_action("Click")
+    def click(self):
+        return "clicked"
+
+
+class Outer:
+    _locator = "#login"
+
+    @log_action("Click")
+    def click(self):
+        return Inner().click()
+
+    @log_action("Submit")
+    def submit(self):
+        return self.click()
+
+
+def test_prepare_renders_arguments_but_not_results():
+    fields = ["before"]
+    result = _Truncated("x" * 500)
+    record = logging.LogRecord(
+        "test", logging.INFO, __file__, 1, "%s 100%% %s", (fields, result), None
+    )
+
+    prepared = _DeferredQueueHandler(None).prepare(record)
+    fields.append("after")
+
+    assert prepared.args == (result,)
+    assert prepared.getMessage() == f"['before'] 100% {'x' * 197}..."
+
+
+def test_delegating_step_with_same_name_is_logged_once():
+    capture = Capture()
+    loggers = [setup_logger(name) for name in ("Outer", "Inner")]
+    for logger in loggers:
+        logger.addHandler(capture)
+    try:
+        Outer().submit()
+    finally:
+        for logger in loggers:
+            logger.removeHandler(capture)
+
+    events = [(r.name, r.fields["action"], r.fields["event"]) for r in capture.records]
+    assert events == [
+        ("Outer", "Submit", "start"),
+        ("Outer", "Click", "start"),
+        ("Outer", "Click", "end"),
+        ("Outer", "Submit", "end"),
+    ]
+
+
+def test_jsonl_output(tmp_path):
+    path = tmp_path / "log.jsonl"
+    configure_logging(str(path))
+    try:
+        Outer().click()
+    finally:
+        configure_logging(LOG_JSONL)
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(e["logger"], e["action"], e["event"]) for e in entries] == [
+        ("Outer", "Click", "start"),
+        ("Outer", "Click", "end"),
+    ]
+    assert entries[0]["message"] == "Starting: Click on #login"
+    assert entries[1]["message"] == "clicked: Click"
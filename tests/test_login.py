@@ -1,3 +1,4 @@
+from framework.waiter import UrlChanged
 from pages.login_actions import LoginPageActions
 
 
@@ -17,7 +18,7 @@ def test_login_positive(
     login_page.login(login, password)
 
     # Wait for redirect
-    assert not login_page._page.login_form.is_visible(), "Login form still displayed"
+    assert not login_page._page.login_form.is_visible_now(), "Login form still displayed"
 
 
 def test_try_login_wo_fill_name_or_password(
@@ -46,6 +47,8 @@ def test_signup_redirect(
     # Check if login page is displayed
     assert login_page.is_page_displayed(), "Login page not displayed"
 
-    login_page.click_sign_up()
+    # Wait for the redirect before checking the link is gone
+    redirected = login_page._page.perform(login_page.click_sign_up, UrlChanged())
+    assert redirected, "Sign up click did not navigate"
     # Check if sign up page is displayed
-    assert not login_page._page.sign_up_link.is_visible(), "Login page still displayed"
+    assert not login_page._page.sign_up_link.is_visible_now(), "Login page still displayed"
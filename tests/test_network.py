@@ -0,0 +1,153 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from framework.element import WebElement
+from framework.locator import DriverType, Locator, LocatorType
+from framework.network import ResponseSpec, expect_response, expect_response_async
+
+
+class FakeEventInfo:
+    def __init__(self, response):
+        self._response = response
+
+    @property
+    def value(self):
+        if self._response is None:
+            raise PlaywrightTimeoutError("Timeout 10ms exceeded")
+        return self._response
+
+
+class FakeExpectation:
+    """Mirrors Playwright's EventContextManager: value is awaited on exit"""
+
+    def __init__(self, response):
+        self.info = FakeEventInfo(response)
+
+    def __enter__(self):
+        return self.info
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc is None:
+            self.info.value
+
+
+class FakeAsyncEventInfo(FakeEventInfo):
+    @property
+    def value(self):
+        async def value():
+            return FakeEventInfo.value.fget(self)
+
+        return value()
+
+
+class FakeAsyncExpectation:
+    def __init__(self, response):
+        self.info = FakeAsyncEventInfo(response)
+
+    async def __aenter__(self):
+        return self.info
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        if exc is None:
+            await self.info.value
+
+
+class FakePage:
+    def __init__(self, response=None):
+        self.response = response
+
+    def expect_response(self, predicate, timeout):
+        return FakeExpectation(self.response)
+
+
+class FakeAsyncPage(FakePage):
+    def expect_response(self, predicate, timeout):
+        return FakeAsyncExpectation(self.response)
+
+
+def response(url="https://app.test/api/login", status=200):
+    request = SimpleNamespace(method="POST", timing={"responseEnd": 12.5})
+    return SimpleNamespace(url=url, status=status, request=request)
+
+
+SPEC = ResponseSpec(r"/api/login", method="POST")
+
+
+def test_matching_response_is_returned():
+    timing = expect_response(
+        FakePage(response()), DriverType.PLAYWRIGHT, SPEC, lambda: None, 10
+    )
+    assert (timing.url, timing.method, timing.status) == (
+        "https://app.test/api/login",
+        "POST",
+        200,
+    )
+    assert timing.timing == {"responseEnd": 12.5}
+
+
+def test_missing_response_returns_none():
+    page = FakePage()
+    assert expect_response(page, DriverType.PLAYWRIGHT, SPEC, lambda: None, 10) is None
+
+
+@pytest.mark.parametrize(
+    "error", [ValueError("click failed"), PlaywrightTimeoutError("click timeout")]
+)
+def test_action_errors_propagate(error):
+    def action():
+        raise error
+
+    with pytest.raises(type(error)):
+        expect_response(FakePage(response()), DriverType.PLAYWRIGHT, SPEC, action, 10)
+
+
+def test_async_miss_returns_none_and_action_errors_propagate():
+    async def click():
+        pass
+
+    async def failing_click():
+        raise PlaywrightTimeoutError("click timeout")
+
+    timing = asyncio.run(
+        expect_response_async(FakeAsyncPage(response()), SPEC, click, 10)
+    )
+    assert timing.status == 200
+    assert asyncio.run(expect_response_async(FakeAsyncPage(), SPEC, click, 10)) is None
+    with pytest.raises(PlaywrightTimeoutError):
+        asyncio.run(
+            expect_response_async(FakeAsyncPage(response()), SPEC, failing_click, 10)
+        )
+
+
+class ClickPage(FakePage):
+    """Records the response wait timeout of each click"""
+
+    def __init__(self, response=None):
+        super().__init__(response)
+        self.timeouts = []
+
+    def locator(self, selector):
+        return SimpleNamespace(click=lambda **kwargs: None)
+
+    def on(self, event, callback):
+        pass
+
+    def expect_response(self, predicate, timeout):
+        self.timeouts.append(timeout)
+        return super().expect_response(predicate, timeout)
+
+
+def test_click_passes_explicit_zero_response_timeout(monkeypatch):
+    page = ClickPage(response())
+    button = WebElement(
+        Locator(LocatorType.CSS, "button"), page, DriverType.PLAYWRIGHT, timeout=5000
+    )
+    monkeypatch.setattr(button, "find", lambda: page.locator("button"))
+
+    button.click(expect_response=SPEC, response_timeout=0)
+    button.click(expect_response=SPEC)
+
+    assert page.timeouts == [0, 5000]
@@ -0,0 +1,69 @@
+import json
+import xml.etree.ElementTree as ET
+
+from framework.parallel import (
+    merge_junit,
+    merge_route_sizes,
+    merge_wait_history,
+    shard,
+)
+from framework.routing import RoutingStats
+from framework.timeouts import TimeoutHistory
+
+NODE_IDS = [
+    "tests/test_login.py::test_a",
+    "tests/test_login.py::test_b",
+    "tests/test_login.py::test_c",
+    "tests/test_sign_up.py::test_d",
+    "tests/test_feed.py::test_e",
+]
+
+
+def test_shard_keeps_modules_together():
+    shards = shard(NODE_IDS, workers=2, shard_by="module")
+
+    assert shards == [NODE_IDS[:3], NODE_IDS[3:]]
+
+
+def test_shard_by_test_spreads_evenly():
+    shards = shard(NODE_IDS, workers=4, shard_by="test")
+
+    assert sorted(len(node_ids) for node_ids in shards) == [1, 1, 1, 2]
+    assert sorted(sum(shards, [])) == sorted(NODE_IDS)
+
+
+def test_merge_junit_sums_worker_reports(tmp_path):
+    for worker, failures in enumerate((0, 1)):
+        (tmp_path / f"worker-{worker}.xml").write_text(
+            f'<testsuites><testsuite name="pytest" tests="2" failures="{failures}" '
+            f'errors="0" skipped="0" time="1.5"><testcase name="t{worker}"/>'
+            "</testsuite></testsuites>"
+        )
+
+    totals = merge_junit(
+        [tmp_path / "worker-0.xml", tmp_path / "worker-1.xml"], tmp_path / "report.xml"
+    )
+
+    assert totals["tests"] == 4 and totals["failures"] == 1
+    root = ET.parse(tmp_path / "report.xml").getroot()
+    assert len(root.findall("testsuite")) == 2
+
+
+def test_merge_worker_wait_history_and_route_sizes(tmp_path):
+    history_path = tmp_path / "history.json"
+    history_path.write_text(json.dumps({"key": [100]}))
+    for worker in (0, 1):
+        report = tmp_path / f"wait-history-{worker}.json"
+        report.write_text(json.dumps({"key": [200 + worker]}))
+        report = tmp_path / f"route-sizes-{worker}.json"
+        report.write_text(json.dumps({f"https://cdn.test/{worker}.jpg": 10}))
+
+    merge_wait_history(tmp_path, TimeoutHistory(history_path))
+    merge_route_sizes(tmp_path, RoutingStats(tmp_path / "sizes.json"))
+
+    assert json.loads(history_path.read_text()) == {"key": [100, 200, 201]}
+    assert json.loads((tmp_path / "sizes.json").read_text()) == {
+        "https://cdn.test/0.jpg": 10,
+        "https://cdn.test/1.jpg": 10,
+    }
+    assert not list(tmp_path.glob("*.tmp"))
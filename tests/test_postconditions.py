@@ -0,0 +1,161 @@
+import time
+from framework.dom import ScriptError
+from framework.locator import DriverType, Locator, LocatorType
+from framework.waiter import (
+    AttributeChanged,
+    BaseWaitManager,
+    CountChanged,
+    DomSettled,
+    Postcondition,
+    UrlChanged,
+)
+from pages.login import LoginPage
+
+LOCATOR = Locator(LocatorType.CSS, "article")
+
+
+class FakeManager(BaseWaitManager):
+    """Scripted page state, each read advances to the next value"""
+
+    driver_type = DriverType.PLAYWRIGHT
+
+    def __init__(self, urls=("a",), counts=(0,), values=(None,), quiet=(0,)):
+        self.timeout = 200
+        self.urls, self.counts = list(urls), list(counts)
+        self.values, self.quiet = list(values), list(quiet)
+
+    @staticmethod
+    def _next(values):
+        return values.pop(0) if len(values) > 1 else values[0]
+
+    @property
+    def browser(self):
+        return None
+
+    def convert(self, locator):
+        return locator.value
+
+    def current_url(self):
+        return self._next(self.urls)
+
+    def count_now(self, locator):
+        return self._next(self.counts)
+
+    def element_value(self, locator, expression):
+        return self._next(self.values)
+
+    def quiet_for(self, reset=False):
+        self.resets = getattr(self, "resets", 0) + reset
+        return self._next(self.quiet)
+
+    def wait_for_url_change(self, old_url, timeout=None):
+        return self.poll_until(lambda: self.current_url() != old_url, timeout)
+
+    def wait_for_value_change(self, locator, expression, previous, timeout=None):
+        return self.poll_until(
+            lambda: self.element_value(locator, expression) != previous, timeout
+        )
+
+    def wait_for_load(self, timeout=None):
+        return True
+
+
+def armed(condition, manager):
+    condition.arm(manager)
+    return condition
+
+
+def test_url_changed():
+    manager = FakeManager(urls=["a", "a", "a", "b"])
+    condition = armed(UrlChanged(), manager)
+    assert not condition.check(manager)
+    assert condition.wait(manager, 200)
+
+    manager = FakeManager(urls=["a"])
+    assert not armed(UrlChanged(), manager).wait(manager, 20)
+
+
+def test_count_changed():
+    manager = FakeManager(counts=[3, 3, 4])
+    condition = armed(CountChanged(LOCATOR), manager)
+    assert condition.previous == 3
+    assert not condition.check(manager)
+    assert condition.check(manager)
+
+
+def test_element_state_changed():
+    manager = FakeManager(values=["Like", "Like", "Unlike"])
+    condition = armed(AttributeChanged(LOCATOR, "aria-label"), manager)
+    assert condition.previous == "Like"
+    assert condition.wait(manager, 200)
+
+
+def test_any_of_holds_when_one_condition_holds():
+    manager = FakeManager(urls=["a"], counts=[1, 1, 1, 2])
+    condition = armed(UrlChanged() | CountChanged(LOCATOR), manager)
+    assert len(condition.conditions) == 2
+    assert condition.wait(manager, 200)
+
+    manager = FakeManager(urls=["a"], counts=[1])
+    condition = armed(UrlChanged() | CountChanged(LOCATOR), manager)
+    assert not condition.wait(manager, 20)
+
+
+def test_dom_settled_check_does_not_block():
+    manager = FakeManager(quiet=[0, 100, 400])
+    condition = armed(DomSettled(300), manager)
+    started = time.monotonic()
+    assert manager.resets == 1
+    assert not condition.check(manager)
+    assert condition.check(manager)
+    assert time.monotonic() - started < 0.05
+
+    manager = FakeManager(urls=["a"], quiet=[0, 50, 50, 500])
+    condition = armed(DomSettled(300) | UrlChanged(), manager)
+    assert condition.wait(manager, 200)
+
+
+class Never(Postcondition):
+    def check(self, manager):
+        return False
+
+
+class Navigating(Postcondition):
+    """Script fails while the page navigates, then the condition holds"""
+
+    def __init__(self):
+        self.checks = 0
+
+    def check(self, manager):
+        self.checks += 1
+        if self.checks == 1:
+            raise ScriptError("Execution context was destroyed")
+        return True
+
+
+def test_script_errors_while_waiting_count_as_not_yet():
+    manager = FakeManager()
+    condition = Navigating()
+    assert condition.wait(manager, 200)
+    assert condition.checks == 2
+
+    manager = FakeManager(urls=["a"], counts=[1, 2])
+    condition = armed(Navigating() | CountChanged(LOCATOR), manager)
+    assert condition.check(manager)
+
+
+class FakePage:
+    url = "about:blank"
+
+    def locator(self, selector):
+        pass
+
+    def on(self, event, callback):
+        pass
+
+
+def test_perform_with_zero_timeout_checks_once():
+    page = LoginPage(FakePage(), DriverType.PLAYWRIGHT, timeout=10000)
+    started = time.monotonic()
+    assert not page.perform(lambda: None, Never(), timeout=0)
+    assert time.monotonic() - started < 1
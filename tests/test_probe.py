@@ -0,0 +1,85 @@
+from framework import dom
+from framework.locator import DriverType, Locator, LocatorType
+from pages.feed import FeedPage
+from pages.feed_actions import FeedPageActions
+from pages.login import LoginPage
+from tests.helper import run_fake_dom
+
+ELEMENTS = [
+    {"css": ["form"], "children": [{"css": ["input"], "id": "user"}]},
+    {"css": [".hidden"], "width": 0, "height": 0},
+    {"css": ["button"], "disabled": True},
+]
+
+
+def probe_js(specs, state, timeout=0):
+    return run_fake_dom(dom.PROBE_JS, ELEMENTS, [specs, state, timeout])["value"]
+
+
+def test_probe_js_states():
+    specs = [["css", "form"], ["id", "user"], ["css", ".hidden"], ["css", "nav"]]
+    assert probe_js(specs, "present") == [True, True, True, False]
+    assert probe_js(specs, "visible") == [True, True, False, False]
+    assert probe_js(specs, "hidden") == [False, False, True, True]
+    assert probe_js([["css", "button"]], "enabled") == [False]
+    assert probe_js([["css", "button"], ["css", "form"]], "clickable") == [
+        False,
+        True,
+    ]
+
+
+def test_probe_js_waits_until_timeout_when_not_all_match():
+    assert probe_js([["css", "form"], ["css", "nav"]], "present", 50) == [
+        True,
+        False,
+    ]
+
+
+class FakePage:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def locator(self, selector):
+        pass
+
+    def on(self, event, callback):
+        pass
+
+    def evaluate(self, script, arg):
+        self.calls.append((script, arg))
+        return self.results
+
+
+def test_base_page_probe_maps_results_to_names():
+    page = FakePage([True, False])
+    login_page = LoginPage(page, DriverType.PLAYWRIGHT)
+    extra = Locator(LocatorType.CSS, "nav")
+
+    results = login_page.probe(["USERNAME_INPUT", extra], "present", timeout=5)
+
+    assert results == {"USERNAME_INPUT": True, "nav": False}
+    script, (specs, state, timeout) = page.calls[0]
+    assert script == dom.PROBE_JS
+    username = dom.locator_spec(login_page._locators.USERNAME_INPUT)
+    assert specs == [username, ["css", "nav"]]
+    assert (state, timeout) == ("present", 5)
+
+
+def test_is_page_displayed_checks_presence():
+    page = FakePage([True, True, True, True])
+    assert LoginPage(page, DriverType.PLAYWRIGHT).is_page_displayed()
+    assert page.calls[0][1][1] == "present"
+
+    page = FakePage([True, False, True, True])
+    assert not LoginPage(page, DriverType.PLAYWRIGHT).is_page_displayed()
+
+
+def test_feed_is_page_displayed_checks_presence():
+    page = FakePage([True, True])
+    feed = FeedPageActions(FeedPage(page, DriverType.PLAYWRIGHT))
+    assert feed.is_page_displayed()
+    assert page.calls[0][1][1] == "present"
+
+    feed = FeedPageActions(FeedPage(FakePage(None), DriverType.PLAYWRIGHT))
+    assert feed.is_page_displayed() is False
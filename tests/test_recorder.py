@@ -0,0 +1,59 @@
+import io
+
+from PIL import Image
+
+from framework.logger import add_step_listener, log_action, remove_step_listener
+from framework.recorder import FrameRecorder
+
+
+def make_png(color: str) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (1280, 720), color).save(output, format="PNG")
+    return output.getvalue()
+
+
+class FakeActions:
+    @log_action("Outer step")
+    def outer(self):
+        return self.inner()
+
+    @log_action("Inner step")
+    def inner(self):
+        return True
+
+    @log_action("Broken step")
+    def broken(self):
+        raise ValueError("boom")
+
+
+def test_frames_after_top_level_steps_only():
+    recorder = FrameRecorder(lambda: make_png("white"), max_frames=2)
+    actions = FakeActions()
+    add_step_listener(recorder.on_step)
+    try:
+        actions.outer()
+        actions.outer()
+        try:
+            actions.broken()
+        except ValueError:
+            pass
+    finally:
+        remove_step_listener(recorder.on_step)
+
+    labels = [label for label, _, _ in recorder.frames]
+    assert labels == ["FakeActions.Outer step", "FakeActions.Broken step (failed)"]
+
+
+def test_dump_writes_downscaled_frames_and_strip(tmp_path):
+    recorder = FrameRecorder(lambda: make_png("red"), max_width=320)
+    recorder.record("first")
+    recorder.record("second")
+
+    written = recorder.dump(tmp_path)
+
+    assert [path.name for path in written] == [
+        "000_first.jpg",
+        "001_second.jpg",
+        "strip.gif",
+    ]
+    assert Image.open(written[0]).size == (320, 180)
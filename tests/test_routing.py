@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from framework.routing import RoutingStats, get_profile
+
+
+def test_profiles_abort_stub_or_pass():
+    functional = get_profile("functional")
+    assert functional.action_for("https://cdn.test/a.woff2", "font") == "abort"
+    assert functional.action_for("https://www.google-analytics.com/g", "xhr") == "abort"
+    assert functional.action_for("https://cdn.test/photo.jpg", "image") == "stub"
+    assert functional.action_for("https://site.test/", "document") is None
+
+    assert get_profile("visual").action_for("https://cdn.test/a.jpg", "image") is None
+    assert get_profile("full").passthrough
+
+
+def test_stats_count_known_bytes(tmp_path):
+    stats = RoutingStats(tmp_path / "sizes.json")
+    stats.on_response(
+        SimpleNamespace(url="https://cdn.test/a.jpg", headers={"content-length": "2048"})
+    )
+    stats.save()
+
+    restored = RoutingStats(tmp_path / "sizes.json")
+    restored.load()
+    restored.record_skipped("https://cdn.test/a.jpg", "stub")
+    restored.record_skipped("https://cdn.test/font.woff2", "abort")
+
+    assert (restored.blocked, restored.stubbed) == (1, 1)
+    assert (restored.bytes_saved, restored.unknown_size) == (2048, 1)
+
+
+def test_stats_save_only_after_learning_sizes(tmp_path):
+    path = tmp_path / "sizes.json"
+    stats = RoutingStats(path)
+    stats.record_skipped("https://cdn.test/a.jpg", "stub")
+    stats.save()
+    assert not path.exists()
+    assert "unknown size" in stats.summary()
+
+    stats.on_response(SimpleNamespace(url="https://cdn.test/a.jpg", headers={}))
+    stats.save()
+    assert not path.exists()
@@ -0,0 +1,115 @@
+import io
+
+import pytest
+from PIL import Image
+
+from framework import screenshot
+from framework.screenshot import (
+    HIGHLIGHT_JS,
+    RESTORE_JS,
+    PlaywrightScreenshotManager,
+    ScreenshotWriter,
+    encode_screenshot,
+)
+from tests.helper import run_fake_dom
+
+
+def png_bytes() -> bytes:
+    output = io.BytesIO()
+    Image.new("RGBA", (4, 4), (255, 0, 0, 255)).save(output, format="PNG")
+    return output.getvalue()
+
+
+ELEMENTS = [
+    {"css": ["li"]},
+    {"css": ["li"], "attrs": {"style": "border-left: 1px solid blue; color: red;"}},
+    {"css": ["li"], "attrs": {"style": ""}},
+]
+
+# Highlight, note the styles while highlighted, then restore
+HIGHLIGHT_THEN_RESTORE_JS = f"""(elements) => {{
+    ({HIGHLIGHT_JS})(elements);
+    ({HIGHLIGHT_JS})(elements.slice(1));
+    const highlighted = elements.map((el) => el.getAttribute("style"));
+    return [highlighted, ({RESTORE_JS})()];
+}}"""
+
+
+def test_restore_puts_back_the_style_attribute():
+    result = run_fake_dom(HIGHLIGHT_THEN_RESTORE_JS, ELEMENTS, elements_arg="li")
+
+    highlighted, restored = result["value"]
+    assert all("3px solid red" in style for style in highlighted)
+    assert restored == 5
+    assert result["attrs"] == [
+        {},
+        {"style": "border-left: 1px solid blue; color: red;"},
+        {"style": ""},
+    ]
+
+
+def test_encode_screenshot_by_extension():
+    png = png_bytes()
+    assert encode_screenshot(png, "shot.png") == (png, "shot.png")
+
+    jpeg, name = encode_screenshot(png, "shot.jpg", quality=50)
+    assert name == "shot.jpg" and Image.open(io.BytesIO(jpeg)).format == "JPEG"
+    # Already JPEG, e.g. captured by Playwright with type="jpeg"
+    assert encode_screenshot(jpeg, "shot.jpeg") == (jpeg, "shot.jpeg")
+
+
+def test_encode_screenshot_without_pillow_warns(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(screenshot, "Image", None)
+    monkeypatch.setattr(screenshot, "log_waning", warnings.append)
+
+    assert encode_screenshot(b"png", "out/shot.jpg") == (b"png", "out/shot.png")
+    assert warnings == ["Pillow not installed, saving out/shot.jpg as out/shot.png"]
+
+
+def test_writer_writes_and_flush_reraises_errors(tmp_path):
+    writer = ScreenshotWriter()
+    try:
+        writer.submit(png_bytes(), str(tmp_path / "ok.png"))
+        (tmp_path / "file").write_text("")
+        writer.submit(png_bytes(), str(tmp_path / "file" / "bad.png"))
+        with pytest.raises(OSError):
+            writer.flush()
+        assert (tmp_path / "ok.png").read_bytes() == png_bytes()
+        writer.flush()
+    finally:
+        writer.close()
+
+
+class FakeLocator:
+    def __init__(self):
+        self.first = self
+
+    def evaluate_all(self, script):
+        pass
+
+
+class FakePage:
+    def __init__(self):
+        self.calls = []
+
+    def evaluate(self, script):
+        pass
+
+    def screenshot(self, **options):
+        self.calls.append(options)
+        return b"\xff\xd8jpeg" if options["type"] == "jpeg" else png_bytes()
+
+
+def test_playwright_captures_jpeg_natively_and_writes_synchronously(tmp_path):
+    page = FakePage()
+    options = screenshot.ScreenshotOptions(quality=60)
+    manager = PlaywrightScreenshotManager(page, options)
+    assert not manager.options.background
+
+    manager.highlight_and_screenshot_many(FakeLocator(), str(tmp_path / "a.jpg"))
+    manager.highlight_and_screenshot_many([], str(tmp_path / "b.png"))
+
+    assert page.calls == [{"type": "jpeg", "quality": 60}, {"type": "png"}]
+    assert (tmp_path / "a.jpg").read_bytes() == b"\xff\xd8jpeg"
+    assert (tmp_path / "b.png").exists()
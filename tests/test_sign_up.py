@@ -55,7 +55,7 @@ def test_signup_with_valid_credentials(
     login_page.login(username, password)
 
     # Wait for redirect
-    assert not login_page._page.login_form.is_visible(), "Login form still displayed"
+    assert not login_page._page.login_form.is_visible_now(), "Login form still displayed"
 
 
 def test_signup_with_existing_username(
@@ -0,0 +1,48 @@
+from framework.timeouts import TimeoutHistory
+
+
+def test_default_until_enough_samples():
+    history = TimeoutHistory(min_samples=5)
+    for _ in range(4):
+        history.record("presence://input", 80)
+    assert history.timeout_for("presence://input", 10000) == 10000
+
+
+def test_timeout_from_percentile_with_floor_and_cap():
+    history = TimeoutHistory(min_samples=5, safety_factor=3.0, floor=250)
+    for duration in (80, 90, 100, 110, 120):
+        history.record("fast", duration)
+    for duration in (3000, 3100, 3200, 3300, 5000):
+        history.record("slow", duration)
+
+    assert history.timeout_for("fast", 10000) == 360
+    assert history.timeout_for("slow", 10000) == 10000
+    history.cap = 20000
+    assert history.timeout_for("slow", 10000) == 15000
+
+
+def test_override_and_persistence(tmp_path):
+    path = tmp_path / "history.json"
+    history = TimeoutHistory(path, min_samples=1, floor=0)
+    history.record("key", 100)
+    history.save()
+
+    restored = TimeoutHistory(path, min_samples=1, floor=0)
+    restored.load()
+    assert restored.timeout_for("key", 10000) == 300
+
+    restored.set_override("key", 42)
+    assert restored.timeout_for("key", 10000) == 42
+
+
+def test_report_holds_only_new_samples(tmp_path):
+    path = tmp_path / "history.json"
+    path.write_text('{"key": [100]}')
+    history = TimeoutHistory(path)
+    history.load()
+    history.save_report(tmp_path / "report.json")
+    assert not (tmp_path / "report.json").exists()
+
+    history.record("key", 150)
+    history.save_report(tmp_path / "report.json")
+    assert (tmp_path / "report.json").read_text() == '{"key": [150]}'
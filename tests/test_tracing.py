@@ -0,0 +1,55 @@
+from framework.logger import log_action
+from framework.tracing import Tracer, tracer
+
+
+class Page:
+    @log_action("Checking")
+    def check(self):
+        return True
+
+
+class Actions:
+    def __init__(self):
+        self._page = Page()
+
+    @log_action("Doing")
+    def do(self):
+        self._page.check()
+        self._page.check()
+        raise ValueError("boom")
+
+
+def test_spans_are_nested_and_exported(tmp_path):
+    tracer.reset()
+    tracer.enabled = True
+    try:
+        Actions().do()
+    except ValueError:
+        pass
+    finally:
+        tracer.enabled = False
+
+    spans = {span.span_id: span for span in tracer.spans}
+    root = next(span for span in spans.values() if span.parent is None)
+    assert root.name == "Actions.Doing"
+    assert root.error == "ValueError"
+    children = [span for span in spans.values() if span.parent is root]
+    assert [span.name for span in children] == ["Page.Checking", "Page.Checking"]
+
+    stacks = tracer.collapsed_stacks()
+    assert set(stacks) == {"Actions.Doing", "Actions.Doing;Page.Checking"}
+
+    events = tracer.chrome_trace()["traceEvents"]
+    assert {event["ph"] for event in events} == {"X"}
+    assert all(event["dur"] >= 0 for event in events)
+
+    tracer.export_collapsed(tmp_path / "trace.folded")
+    line = (tmp_path / "trace.folded").read_text().splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_disabled_tracer_records_nothing():
+    local = Tracer()
+    assert not local.enabled
+    assert local.collapsed_stacks() == {}
+    assert local.chrome_trace()["traceEvents"] == []
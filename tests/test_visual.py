@@ -0,0 +1,72 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from framework.visual import VisualBaseline, ignore_mask, pixel_diff
+
+
+def png(pixels: np.ndarray) -> bytes:
+    output = io.BytesIO()
+    Image.fromarray(pixels).save(output, format="PNG")
+    return output.getvalue()
+
+
+def page(height: int = 200, width: int = 300) -> np.ndarray:
+    pixels = np.full((height, width, 3), 255, dtype=np.uint8)
+    pixels[20:60, 20:280] = (30, 30, 200)
+    return pixels
+
+
+def test_pixel_diff_respects_threshold_and_mask():
+    expected = page()
+    actual = expected.copy()
+    actual[0:10, 0:10] = (245, 245, 245)  # below threshold
+    actual[100:110, 100:110] = 0
+    mask = ignore_mask(actual.shape, [(100, 100, 5, 10)])
+
+    changed = pixel_diff(actual, expected, mask, pixel_threshold=16)
+
+    assert np.count_nonzero(changed) == 50
+
+
+def test_baseline_recorded_then_matched_on_fast_path(tmp_path):
+    visual = VisualBaseline(tmp_path, record_missing=True)
+
+    assert visual.compare("login_page", png(page())).recorded
+    result = visual.compare("login_page", png(page()))
+
+    assert result.matched and result.fast_path
+
+
+def test_missing_baseline_fails_unless_recording(tmp_path):
+    result = VisualBaseline(tmp_path, record_missing=False).compare("a", png(page()))
+
+    assert not result.matched and result.missing
+    assert not (tmp_path / "a.png").exists()
+
+
+def test_change_within_one_hash_cell_is_not_missed(tmp_path):
+    visual = VisualBaseline(tmp_path, tolerance=0)
+    visual.record("feed_page", png(page()))
+    changed = page()
+    changed[150, 150] = (224, 224, 224)
+
+    result = visual.compare("feed_page", png(changed))
+    assert result.hash_distance == 0
+    assert not result.matched and result.diff_pixels == 1
+
+
+def test_mismatch_writes_diff_unless_region_ignored(tmp_path):
+    visual = VisualBaseline(tmp_path)
+    visual.record("feed_page", png(page()))
+    changed = page()
+    changed[120:180, 40:140] = (0, 160, 0)
+
+    result = visual.compare("feed_page", png(changed))
+    assert not result.matched
+    assert result.diff_pixels == 6000
+    assert result.diff_path.exists()
+
+    ignored = visual.compare("feed_page", png(changed), ignore=[(40, 120, 100, 60)])
+    assert ignored.matched and ignored.diff_pixels == 0
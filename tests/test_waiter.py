@@ -0,0 +1,69 @@
+import pytest
+
+from framework import waiter
+from framework.locator import DriverType
+from framework.waiter import SeleniumObserverWaitManager, create_wait_manager
+
+UNLOADED = "javascript error: document unloaded while waiting for result"
+FIREFOX_UNLOADED = "Document was unloaded"
+
+
+class FakeDriver:
+    """Selenium driver stand-in answering execute_async_script from a script"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute_async_script(self, script, arg):
+        self.calls.append(arg)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_observer_returns_element_and_passes_locator_and_state():
+    driver = FakeDriver({"value": "element"})
+    manager = SeleniumObserverWaitManager(driver, timeout=500)
+
+    assert manager.wait_for_visibility(("css selector", "form")) == "element"
+    css, selector, state, timeout = driver.calls[0]
+    assert (css, selector, state) == ("css", "form", "visible")
+    assert 0 < timeout <= 500
+
+
+def test_observer_rearms_after_navigation():
+    driver = FakeDriver(
+        Exception(UNLOADED), Exception(FIREFOX_UNLOADED), {"value": "element"}
+    )
+    manager = SeleniumObserverWaitManager(driver, timeout=500)
+
+    assert manager.wait_for_presence(("id", "user")) == "element"
+    assert len(driver.calls) == 3
+    assert all(call[3] <= 500 for call in driver.calls)
+
+
+def test_observer_gives_up_on_other_errors_and_timeouts():
+    driver = FakeDriver(Exception("javascript error: boom"))
+    manager = SeleniumObserverWaitManager(driver, timeout=500)
+    assert manager.wait_for_clickable(("xpath", "//button")) is None
+    assert len(driver.calls) == 1
+
+    driver = FakeDriver({"value": None})
+    manager = SeleniumObserverWaitManager(driver, timeout=500)
+    assert manager.wait_for_presence(("id", "user")) is None
+
+    driver = FakeDriver({"error": "ReferenceError"})
+    manager = SeleniumObserverWaitManager(driver, timeout=500)
+    assert manager.wait_for_presence(("id", "user")) is None
+
+
+def test_unknown_selenium_engine_is_rejected(monkeypatch):
+    monkeypatch.setattr(waiter, "SELENIUM_WAIT_ENGINE", "observe")
+    with pytest.raises(ValueError, match="observer"):
+        create_wait_manager(FakeDriver(), DriverType.SELENIUM)
+
+    monkeypatch.setattr(waiter, "SELENIUM_WAIT_ENGINE", "observer")
+    manager = create_wait_manager(FakeDriver(), DriverType.SELENIUM)
+    assert isinstance(manager, SeleniumObserverWaitManager)